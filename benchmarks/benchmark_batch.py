@@ -0,0 +1,47 @@
+"""Benchmark serial and process pool batch processing of many EDLs.
+
+Usage: python benchmarks/benchmark_batch.py [--files 200] [--events 500]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor.batch import format_batch_report
+from py_edl_editor.batch import process_batch
+
+OPERATIONS = [
+    ("remove_gaps", []),
+    ("handles", ["8"]),
+    ("prepend_reels", ["SHOW_"]),
+]
+
+
+def main():
+    """Run the benchmark and print the batch reports."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_paths = []
+        for index in range(args.files):
+            edl_path = os.path.join(temp_dir, "reel_{0:04d}.edl".format(index))
+            write_edl(edl_path, args.events, args.events)
+            edl_paths.append(edl_path)
+        output_paths = ["{0}.out".format(edl_path) for edl_path in edl_paths]
+        for workers in [1, args.workers]:
+            report = process_batch(
+                edl_paths, "24", OPERATIONS, output_paths, workers
+            )
+            print("workers: {0}".format(workers))
+            for line in format_batch_report(report):
+                print("  {0}".format(line))
+
+
+if __name__ == "__main__":
+    main()
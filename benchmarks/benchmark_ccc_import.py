@@ -0,0 +1,102 @@
+"""Benchmark importing a large CCC: cdl_convert.parse_ccc vs. iter_ccc.
+
+Usage: python benchmarks/benchmark_ccc_import.py [--corrections 50000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+# Import third-party modules
+import cdl_convert  # type: ignore
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor.cdl_tools import add_ccc_to_edl
+from py_edl_editor.cdl_tools import build_reel_index
+from py_edl_editor.edl_parser import parse_edl
+
+CC_TEMPLATE = """    <ColorCorrection id="{0}">
+        <SOPNode>
+            <Slope>1.1 1.0 0.9</Slope>
+            <Offset>0.01 0.0 -0.01</Offset>
+            <Power>1.0 1.0 1.0</Power>
+        </SOPNode>
+        <SATNode>
+            <Saturation>0.9</Saturation>
+        </SATNode>
+    </ColorCorrection>
+"""
+
+
+def write_ccc(ccc_path, reels, corrections):
+    """Write a CCC with a correction for every reel and unmatched ones."""
+    with open(ccc_path, "w") as ccc_file:
+        ccc_file.write(
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            '<ColorCorrectionCollection xmlns="urn:ASC:CDL:v1.01">\n'
+        )
+        for index in range(corrections):
+            if index < len(reels):
+                cc_id = reels[index]
+            else:
+                cc_id = "UNUSED_{0:06d}".format(index)
+            ccc_file.write(CC_TEMPLATE.format(cc_id))
+        ccc_file.write("</ColorCorrectionCollection>\n")
+
+
+def parse_ccc_import(edl, ccc_path, reel_index):
+    """Import the CCC through cdl_convert.parse_ccc like before."""
+    cdl_convert.correction.ColorCorrection.members = {}
+    ccc = cdl_convert.parse_ccc(ccc_path)
+    for cdl in ccc.color_corrections:
+        for event in reel_index.get(cdl.id, []):
+            event.cdl = cdl
+
+
+def measure(function, *args):
+    """Return the runtime and the peak traced memory of the call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--corrections", type=int, default=50000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        ccc_path = os.path.join(temp_dir, "benchmark.ccc")
+        write_edl(edl_path, args.events, args.events)
+        edl = parse_edl(edl_path, "24")
+        reel_index = build_reel_index(edl)
+        write_ccc(ccc_path, sorted(reel_index), args.corrections)
+        for name, function in [
+            ("parse_ccc", parse_ccc_import),
+            ("iter_ccc", add_ccc_to_edl),
+        ]:
+            seconds, peak = measure(function, edl, ccc_path, reel_index)
+            print(
+                "{0:<10} {1:6.3f}s  peak {2:6.1f} MiB".format(
+                    name, seconds, peak / 1024.0 / 1024.0
+                )
+            )
+        print(
+            "CCC {0:.1f} MiB".format(
+                os.path.getsize(ccc_path) / 1024.0 / 1024.0
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
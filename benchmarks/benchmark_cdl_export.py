@@ -0,0 +1,73 @@
+"""Benchmark exporting .cdl files: one by one vs. export_cdls.
+
+Every reel is used by two events with the same correction.
+
+Usage: python benchmarks/benchmark_cdl_export.py [--reels 2000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+
+# Import third-party modules
+import cdl_convert  # type: ignore
+
+# Import local modules
+from benchmark_ccc_import import write_ccc
+from benchmark_parse_edl import write_edl
+from py_edl_editor.cdl_tools import add_ccc_to_edl
+from py_edl_editor.cdl_tools import export_cdls
+from py_edl_editor.edl_parser import parse_edl
+
+
+def export_one_by_one(edl, dest_folder):
+    """Write a file per event CDL like before."""
+    for event in edl.events:
+        cdl = event.cdl
+        if cdl.has_sop and cdl.has_sat:
+            cdl.determine_dest("cdl", dest_folder)
+            cdl_convert.write_cdl(cdl)
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--reels", type=int, default=2000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        ccc_path = os.path.join(temp_dir, "benchmark.ccc")
+        write_edl(edl_path, args.reels * 2, args.reels)
+        edl = parse_edl(edl_path, "24")
+        reels = sorted(set(event.reel for event in edl.events))
+        write_ccc(ccc_path, reels, len(reels))
+        add_ccc_to_edl(edl, ccc_path)
+        for name, function in [
+            ("one by one", export_one_by_one),
+            (
+                "1 worker",
+                lambda edl, dest: export_cdls(
+                    edl, ".cdl", dest, "edl", workers=1
+                ),
+            ),
+            (
+                "thread pool",
+                lambda edl, dest: export_cdls(edl, ".cdl", dest, "edl"),
+            ),
+        ]:
+            dest_folder = tempfile.mkdtemp(dir=temp_dir)
+            start = time.perf_counter()
+            function(edl, dest_folder)
+            print(
+                "{0:<12} {1:6.3f}s  {2} files".format(
+                    name,
+                    time.perf_counter() - start,
+                    len(os.listdir(dest_folder)),
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Measure the startup time of the headless process command.
+
+Runs `edl_editor process --dry-run` on a one event EDL in fresh
+interpreters and compares the median wall time against a budget. The time
+of importing the GUI module is printed for reference. Exits with code 1 if
+the budget is exceeded or PySide2 gets imported by the process command.
+
+Usage: python benchmarks/benchmark_cli_startup.py [--budget 0.3]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+
+QT_CHECK = (
+    "import sys; from py_edl_editor.__main__ import main; "
+    "main(sys.argv[1:]); sys.exit('PySide2' in sys.modules)"
+)
+
+
+def median_runtime(command, repeat):
+    """Return the median wall time of running the command.
+
+    Args:
+        command (list): Command to run.
+        repeat (int): Number of runs.
+
+    Returns:
+        float: Median wall time in seconds.
+
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "startup.edl")
+        write_edl(edl_path, 1, 1)
+        process_args = ["process", "--dry-run", edl_path]
+        cli_time = median_runtime(
+            [sys.executable, "-m", "py_edl_editor"] + process_args,
+            args.repeat,
+        )
+        gui_import_time = median_runtime(
+            [sys.executable, "-c", "import py_edl_editor.gui"], args.repeat
+        )
+        loads_qt = subprocess.run(
+            [sys.executable, "-c", QT_CHECK] + process_args,
+            check=False,
+            stdout=subprocess.DEVNULL,
+        ).returncode
+    print("process command   {0:6.3f}s".format(cli_time))
+    print("GUI module import {0:6.3f}s".format(gui_import_time))
+    print("budget            {0:6.3f}s".format(args.budget))
+    if loads_qt:
+        print("process command imports PySide2")
+    if loads_qt or cli_time > args.budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
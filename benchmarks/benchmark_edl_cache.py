@@ -0,0 +1,65 @@
+"""Benchmark reopening an EDL through the parsed EDL cache.
+
+Usage: python benchmarks/benchmark_edl_cache.py [--events 20000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor.edl_cache import EdlCache
+from py_edl_editor.edl_parser import parse_edl
+
+
+def timed(function, *args):
+    """Return the result and the runtime of the function call."""
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_edl(edl_path, args.events, args.events)
+        cache_dir = os.path.join(temp_dir, "cache")
+        for name, compact in [("edl.List", False), ("Timeline", True)]:
+            expected, parse_time = timed(parse_edl, edl_path, "24", compact)
+            edl_cache = EdlCache(cache_dir=cache_dir)
+            edl_cache.get(edl_path, "24", compact)
+            memory_edl, memory_time = timed(
+                edl_cache.get, edl_path, "24", compact
+            )
+            disk_edl, disk_time = timed(
+                EdlCache(cache_dir=cache_dir).get, edl_path, "24", compact
+            )
+            assert memory_edl.to_string() == expected.to_string()
+            assert disk_edl.to_string() == expected.to_string()
+            print(
+                "{0:<10} parse {1:6.3f}s  memory hit {2:6.3f}s  "
+                "disk hit {3:6.3f}s".format(
+                    name, parse_time, memory_time, disk_time
+                )
+            )
+        cache_size = sum(
+            os.path.getsize(os.path.join(cache_dir, name))
+            for name in os.listdir(cache_dir)
+        )
+        print(
+            "EDL {0:.1f} MiB, cache files {1:.1f} MiB".format(
+                os.path.getsize(edl_path) / 1024.0 / 1024.0,
+                cache_size / 1024.0 / 1024.0,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
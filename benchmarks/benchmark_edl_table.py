@@ -0,0 +1,130 @@
+"""Benchmark EdlTable.data while scrolling through a large EDL.
+
+Simulates a view scrolling over the whole table: for every scroll step the
+display and font roles of all visible cells are queried, as a QTableView
+does when it repaints. The cached model is compared against the previous
+implementation that rebuilt every value and font on each query.
+
+Usage: python benchmarks/benchmark_edl_table.py [--events 20000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+
+# Import third-party modules
+from PySide2 import QtCore  # type: ignore
+from PySide2 import QtGui  # type: ignore
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_table import EdlTable
+
+VISIBLE_ROWS = 30
+SCROLL_STEP = 3
+ROLES = [QtCore.Qt.DisplayRole, QtCore.Qt.FontRole]
+
+
+# pylint: disable=too-many-return-statements
+class LegacyEdlTable(EdlTable):
+    """EdlTable computing every value and font on each data call."""
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        """Return data stored under the given role at the given index."""
+        if role == QtCore.Qt.DisplayRole:
+            return self._legacy_display_data(index)
+        if role == QtCore.Qt.FontRole and index.column() in [4, 5]:
+            return QtGui.QFont("Courier", 10)
+        if role == QtCore.Qt.FontRole and index.column() in [6, 7, 8, 9]:
+            return QtGui.QFont("Courier", 12)
+        return None
+
+    def _legacy_display_data(self, index):
+        """Return the display value of a single cell."""
+        col = index.column()
+        edl_event = self.events[index.row()]
+        if col == 0:
+            return edl_event.num
+        if col == 1:
+            return edl_event.reel
+        if col == 2:
+            return edl_event.clip_name
+        if col == 3:
+            return edl_event.source_file
+        if col == 4:
+            return self._cdl_string(edl_event.cdl)
+        if col == 5:
+            return self._locator_string(edl_event)
+        if col == 6:
+            return "{0}\n{1}".format(
+                self._timecode_string(edl_event.src_start_tc),
+                self._timecode_string(edl_event.src_end_tc),
+            )
+        if col == 7:
+            return "{0}\n{1}".format(
+                self._timecode_string(edl_event.rec_start_tc),
+                self._timecode_string(edl_event.rec_end_tc),
+            )
+        if col == 8:
+            return (edl_event.src_end_tc - edl_event.src_start_tc).frames
+        if col == 9:
+            return (edl_event.rec_end_tc - edl_event.rec_start_tc).frames
+        return None
+
+
+def scroll(table, passes):
+    """Query all visible cells for every scroll position of the table.
+
+    Args:
+        table (EdlTable): Table model to query.
+        passes (int): Number of times to scroll through the whole table.
+
+    Returns:
+        tuple: Seconds spent in data() and number of data() calls.
+
+    """
+    columns = table.columnCount()
+    indexes = []
+    for top_row in range(0, table.rowCount() - VISIBLE_ROWS, SCROLL_STEP):
+        for row in range(top_row, top_row + VISIBLE_ROWS):
+            indexes.extend(table.index(row, col) for col in range(columns))
+    start = time.perf_counter()
+    for _ in range(passes):
+        for index in indexes:
+            for role in ROLES:
+                table.data(index, role)
+    return time.perf_counter() - start, len(indexes) * len(ROLES) * passes
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--passes", type=int, default=2)
+    args = parser.parse_args()
+    # QFont needs a running QGuiApplication.
+    app = QtGui.QGuiApplication([])
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_edl(edl_path, args.events, args.events)
+        edl = parse_edl(edl_path, "24")
+    timings = []
+    for table_class in [LegacyEdlTable, EdlTable]:
+        table = table_class()
+        table.set_events(edl.events)
+        seconds, calls = scroll(table, args.passes)
+        timings.append(seconds)
+        print(
+            "{0:<15} {1:8.3f}s {2:8.2f}us per data() call".format(
+                table_class.__name__, seconds, seconds / calls * 1e6
+            )
+        )
+    print("speedup: {0:.1f}x".format(timings[0] / timings[1]))
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""Benchmark the single-pass EDL parser against edl.Parser.
+
+Usage: python benchmarks/benchmark_parse_edl.py [--events 20000] [--repeat 3]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import timeit
+
+# Import third-party modules
+from cdl_convert import correction  # type: ignore
+from edl import Parser  # type: ignore
+
+# Import local modules
+from py_edl_editor.edl_parser import add_avid_locator
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_parser import sat_value
+from py_edl_editor.edl_parser import sop_values
+
+EVENT_LINE = (
+    "{num:03d}    {reel:<32} V     C        "
+    "{src_in} {src_out} {rec_in} {rec_out}\n"
+)
+
+
+def write_edl(edl_path, events, reels):
+    """Write a synthetic conform EDL with dense comment blocks.
+
+    Args:
+        edl_path (str): Path of the EDL to write.
+        events (int): Number of events.
+        reels (int): Number of distinct reels used by the events.
+
+    """
+    with open(edl_path, "w") as edl_file:
+        edl_file.write("TITLE: Benchmark EDL\n\n")
+        for index in range(events):
+            rec_in = 86400 + index * 60
+            edl_file.write(
+                EVENT_LINE.format(
+                    num=index % 1000,
+                    reel="A{0:05d}_210101_R1AB".format(index % reels),
+                    src_in=_smpte(90000 + index),
+                    src_out=_smpte(90048 + index),
+                    rec_in=_smpte(rec_in),
+                    rec_out=_smpte(rec_in + 48),
+                )
+            )
+            edl_file.write("* FROM CLIP NAME: shot_{0:05d}\n".format(index))
+            edl_file.write("* SOURCE FILE: shot_{0:05d}.mov\n".format(index))
+            edl_file.write(
+                "* ASC_SOP (1.0912 1.0 0.9815)(-0.0123 0.0 0.0054)"
+                "(1.0 1.0 1.0)\n"
+            )
+            edl_file.write("* ASC_SAT 0.95\n")
+            edl_file.write(
+                "* LOC: {0} RED     note\n\n".format(_smpte(rec_in))
+            )
+
+
+def legacy_parse_edl(edl_path, fps):
+    """Parse the EDL with edl.Parser followed by a second regex pass.
+
+    Args:
+        edl_path (str): Path of the EDL to parse.
+        fps (str): Frame Rate for EDL calculations.
+
+    Returns:
+        edl.List: Parsed EDL.
+
+    """
+    correction.ColorCorrection.members = {}
+    with open(edl_path) as edl_file:
+        edl = Parser(fps).parse(edl_file)
+    for event in edl.events:
+        event.cdl = correction.ColorCorrection(event.reel)
+        event.has_locator = False
+        for comment in event.comments:
+            if "ASC_SOP" in comment:
+                for key, values in sop_values(comment).items():
+                    setattr(event.cdl, key, values)
+            if "ASC_SAT" in comment:
+                event.cdl.sat = sat_value(comment)
+            if "LOC: " in comment:
+                add_avid_locator(event, comment)
+    return edl
+
+
+def _smpte(frames, fps=24):
+    """Return the SMPTE string of a frame number."""
+    seconds, frame = divmod(frames, fps)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return "{0:02d}:{1:02d}:{2:02d}:{3:02d}".format(
+        hours, minutes, seconds, frame
+    )
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument(
+        "--reels",
+        type=int,
+        default=0,
+        help="Distinct reels (default: one per event). Repeated reels make "
+        "both paths spend most time in the cdl_convert id registry.",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_edl(edl_path, args.events, args.reels or args.events)
+        legacy = legacy_parse_edl(edl_path, "24").to_string()
+        assert parse_edl(edl_path, "24").to_string() == legacy
+        results = {}
+        for name, func in [
+            ("edl.Parser + regex pass", legacy_parse_edl),
+            ("single-pass parse_edl", parse_edl),
+        ]:
+            results[name] = min(
+                timeit.repeat(
+                    lambda func=func: func(edl_path, "24"),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print("{0:<26} {1:8.3f}s".format(name, results[name]))
+    legacy_time, new_time = results.values()
+    print(
+        "speedup: {0:.1f}x ({1} events)".format(
+            legacy_time / new_time, args.events
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Benchmark a framerate change: re-parsing the EDL vs. in-memory re-rate.
+
+Usage: python benchmarks/benchmark_rerate.py [--events 20000] [--fps 25]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.tc_tools import set_edl_framerate
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--fps", default="25")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_edl(edl_path, args.events, args.events)
+        for name, compact in [("edl.List", False), ("Timeline", True)]:
+            edl = parse_edl(edl_path, "24", compact)
+            start = time.perf_counter()
+            expected = parse_edl(edl_path, args.fps, compact)
+            parse_time = time.perf_counter() - start
+            start = time.perf_counter()
+            set_edl_framerate(edl, args.fps)
+            rerate_time = time.perf_counter() - start
+            assert edl.to_string() == expected.to_string()
+            print(
+                "{0:<10} re-parse {1:7.3f}s  re-rate {2:7.3f}s  "
+                "{3:5.1f}x".format(
+                    name, parse_time, rerate_time, parse_time / rerate_time
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
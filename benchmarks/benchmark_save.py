@@ -0,0 +1,68 @@
+"""Benchmark saving an EDL: one joined string vs. the streaming writer.
+
+Usage: python benchmarks/benchmark_save.py [--events 20000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+# Import local modules
+from benchmark_parse_edl import write_edl as write_benchmark_edl
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_writer import write_edl
+from py_edl_editor.reel_tools import fix_event_clip_name_comment
+
+
+def save_to_string(edl, dest_file_path):
+    """Save the EDL like the GUI did before the streaming writer."""
+    for event in edl.events:
+        fix_event_clip_name_comment(event)
+    with open(dest_file_path, "w") as edl_file:
+        edl_file.write("{0}\n".format(edl.to_string()))
+
+
+def measure(function, *args):
+    """Return the runtime and the peak traced memory of the call."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(*args)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_benchmark_edl(edl_path, args.events, args.events)
+        for name, compact in [("edl.List", False), ("Timeline", True)]:
+            edl = parse_edl(edl_path, "24", compact)
+            old_path = os.path.join(temp_dir, "old.edl")
+            new_path = os.path.join(temp_dir, "new.edl")
+            old_time, old_peak = measure(save_to_string, edl, old_path)
+            new_time, new_peak = measure(write_edl, edl, new_path, [])
+            with open(old_path) as old_file, open(new_path) as new_file:
+                assert old_file.read() == new_file.read()
+            print(
+                "{0:<10} to_string {1:6.3f}s {2:6.1f} MiB  "
+                "streaming {3:6.3f}s {4:6.1f} MiB".format(
+                    name,
+                    old_time,
+                    old_peak / 1024.0 / 1024.0,
+                    new_time,
+                    new_peak / 1024.0 / 1024.0,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Benchmark typing a search into the EDL table filter.
+
+Types a query one character at a time, as the search bar does, and times
+every keystroke. A QSortFilterProxyModel filtering on the display data of
+the text columns is compared against the indexed EdlFilterModel, whose
+indexes are built first, as the GUI does while it is idle after loading.
+
+Usage: python benchmarks/benchmark_search.py [--events 50000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+
+# Import third-party modules
+from PySide2 import QtCore  # type: ignore
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_table import EdlFilterModel
+from py_edl_editor.edl_table import EdlTable
+
+QUERY = "shot_01234"
+TEXT_COLUMNS = [1, 2, 3, 5]
+BUILD_STEP_ROWS = 2000
+
+
+class DisplayFilterModel(QtCore.QSortFilterProxyModel):
+    """Proxy filtering on the display strings of the text columns."""
+
+    def __init__(self):
+        """Initialize the DisplayFilterModel instance."""
+        super().__init__()
+        self.query = ""
+
+    # pylint: disable=invalid-name
+    def filterAcceptsRow(self, source_row, source_parent):
+        """Return True if a text column contains the query."""
+        model = self.sourceModel()
+        for column in TEXT_COLUMNS:
+            text = model.index(source_row, column, source_parent).data()
+            if self.query in str(text or "").lower():
+                return True
+        return False
+
+    def set_filter(self, query):
+        """Filter the rows by the query."""
+        self.query = query.lower()
+        self.invalidateFilter()
+
+
+def type_query(proxy):
+    """Return the slowest and total keystroke times of typing the query."""
+    times = []
+    for length in range(1, len(QUERY) + 1):
+        start = time.perf_counter()
+        proxy.set_filter(QUERY[:length])
+        proxy.rowCount()
+        times.append(time.perf_counter() - start)
+    return max(times), sum(times), proxy.rowCount()
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=50000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_edl(edl_path, args.events, args.events // 10)
+        edl = parse_edl(edl_path, "24", compact=True)
+    for name, proxy in [
+        ("display filter", DisplayFilterModel()),
+        ("indexed filter", EdlFilterModel()),
+    ]:
+        table = EdlTable()
+        table.set_events(edl.events)
+        proxy.setSourceModel(table)
+        if isinstance(proxy, EdlFilterModel):
+            start = time.perf_counter()
+            while not table.search_index.build_step(BUILD_STEP_ROWS):
+                pass
+            print(
+                "index build in steps of {0} rows {1:.1f}ms".format(
+                    BUILD_STEP_ROWS, (time.perf_counter() - start) * 1000
+                )
+            )
+        slowest, total, rows = type_query(proxy)
+        print(
+            "{0:<15} slowest key {1:7.1f}ms  total {2:7.1f}ms  "
+            "{3} rows".format(name, slowest * 1000, total * 1000, rows)
+        )
+
+
+if __name__ == "__main__":
+    main()
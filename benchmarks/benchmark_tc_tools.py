@@ -0,0 +1,51 @@
+"""Benchmark the timecode tools on edl.List and on the compact Timeline.
+
+Usage: python benchmarks/benchmark_tc_tools.py [--events 20000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.tc_tools import add_handles_to_edl
+from py_edl_editor.tc_tools import remove_edl_gaps
+from py_edl_editor.tc_tools import set_edl_start_tc
+
+OPERATIONS = [
+    ("remove_edl_gaps", remove_edl_gaps),
+    ("set_edl_start_tc", lambda edl: set_edl_start_tc(edl, "00:59:00:00")),
+    ("add_handles_to_edl", lambda edl: add_handles_to_edl(edl, 8)),
+]
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_edl(edl_path, args.events, args.events)
+        edl = parse_edl(edl_path, "24")
+        timeline = parse_edl(edl_path, "24", compact=True)
+    for name, operation in OPERATIONS:
+        timings = []
+        for target in [edl, timeline]:
+            start = time.perf_counter()
+            operation(target)
+            timings.append(time.perf_counter() - start)
+        print(
+            "{0:<20} edl.List {1:8.4f}s  Timeline {2:8.4f}s  {3:6.0f}x".format(
+                name, timings[0], timings[1], timings[0] / timings[1]
+            )
+        )
+    assert edl.to_string() == timeline.to_string()
+
+
+if __name__ == "__main__":
+    main()
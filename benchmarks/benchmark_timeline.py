@@ -0,0 +1,58 @@
+"""Compare memory and parse time of edl.List and the compact Timeline.
+
+Usage: python benchmarks/benchmark_timeline.py [--events 20000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor.edl_parser import parse_edl
+
+
+def measure(edl_path, compact):
+    """Return parse time and traced memory of the parsed EDL.
+
+    Args:
+        edl_path (str): Path of the EDL to parse.
+        compact (bool): Parse into a Timeline instead of an edl.List.
+
+    Returns:
+        tuple: Seconds and bytes allocated by the parsed EDL.
+
+    """
+    start = time.perf_counter()
+    parse_edl(edl_path, "24", compact)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    edl = parse_edl(edl_path, "24", compact)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del edl
+    return seconds, size
+
+
+def main():
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_edl(edl_path, args.events, args.events)
+        for name, compact in [("edl.List", False), ("Timeline", True)]:
+            seconds, size = measure(edl_path, compact)
+            print(
+                "{0:<10} {1:8.3f}s {2:8.1f} MiB".format(
+                    name, seconds, size / 1024.0 / 1024.0
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark undoing a batch edit: re-parsing the EDL vs. journal undo.
+
+Usage: python benchmarks/benchmark_undo.py [--events 20000]
+"""
+
+# Import built-in modules
+import argparse
+import os
+import tempfile
+import time
+
+# Import local modules
+from benchmark_parse_edl import write_edl
+from py_edl_editor import reel_tools
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.journal import Journal
+from py_edl_editor.journal import REEL_ATTRIBUTES
+from py_edl_editor.journal import TC_ATTRIBUTES
+from py_edl_editor.tc_tools import add_handles_to_edl
+
+
+def main():
+    """Run the benchmark and print the timings."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=20000)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        edl_path = os.path.join(temp_dir, "benchmark.edl")
+        write_edl(edl_path, args.events, args.events)
+        for name, compact in [("edl.List", False), ("Timeline", True)]:
+            edl = parse_edl(edl_path, "24", compact)
+            expected = edl.to_string()
+            journal = Journal()
+            with journal.record(edl, "Prepend Reels", REEL_ATTRIBUTES):
+                reel_tools.prepend_reels(edl, "A_")
+            with journal.record(edl, "Add Handles", TC_ATTRIBUTES):
+                add_handles_to_edl(edl, 10)
+            start = time.perf_counter()
+            parse_edl(edl_path, "24", compact)
+            parse_time = time.perf_counter() - start
+            start = time.perf_counter()
+            while journal.can_undo:
+                journal.undo(edl)
+            undo_time = time.perf_counter() - start
+            assert edl.to_string() == expected
+            print(
+                "{0:<10} re-parse {1:7.3f}s  undo {2:7.3f}s  "
+                "{3:5.1f}x".format(
+                    name, parse_time, undo_time, parse_time / undo_time
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
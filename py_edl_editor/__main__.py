@@ -1,21 +1,38 @@
-"""Shows the EDL Viewer GUI."""
+"""Shows the EDL Viewer GUI or runs the headless process command."""
 
 # Import built-in modules
 import os
 import platform
+import sys
 
 # Import local modules
-from py_edl_editor.gui import PyEdlEditorGui
+from py_edl_editor import cli
 
 
-def main():
-    """Run py_edl_editor."""
+def main(argv=None):
+    """Run py_edl_editor.
+
+    Args:
+        argv (list): Command line arguments, defaults to sys.argv[1:].
+
+    Returns:
+        int: Exit code of the process command, None for the GUI.
+
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == cli.COMMAND:
+        return cli.main(argv[1:])
     # Add ENV for Big Sur Issue
     # https://stackoverflow.com/questions/64818879/is-there-any-solution-regarding-to-pyqt-library-doesnt-work-in-mac-os-big-sur/64856281
     if platform.system() == "Darwin":
         os.environ["QT_MAC_WANTS_LAYER"] = "1"
+    # The GUI is imported here, so the process command never loads PySide2.
+    # pylint: disable=import-outside-toplevel
+    from py_edl_editor.gui import PyEdlEditorGui
+
     PyEdlEditorGui()
+    return None
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,173 @@
+"""Batch processing of many EDLs in a process pool.
+
+Every EDL is parsed, processed and written by one worker process. Errors
+are caught per file, so a broken EDL never stops the rest of the batch.
+"""
+
+# Import built-in modules
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import os
+import time
+
+# Import local modules
+from py_edl_editor.pipeline import process_edl
+
+BatchResult = namedtuple(
+    "BatchResult",
+    ["edl_path", "output_path", "events", "size", "seconds", "error"],
+)
+BatchResult.__doc__ = """Result of processing one EDL of a batch.
+
+Attributes:
+    edl_path (str): Path of the input EDL.
+    output_path (str): Path the EDL was written to or None.
+    events (int): Number of processed events.
+    size (int): Size of the input EDL in bytes.
+    seconds (float): Time spent on the EDL by the worker.
+    error (str): Error message or None if the EDL was processed.
+
+"""
+
+BatchReport = namedtuple(
+    "BatchReport", ["results", "files", "failed", "events", "size", "seconds"]
+)
+BatchReport.__doc__ = """Aggregated result of a batch.
+
+Attributes:
+    results (list): BatchResult per EDL in input order.
+    files (int): Number of processed EDLs.
+    failed (int): Number of EDLs that could not be processed.
+    events (int): Number of processed events of all EDLs.
+    size (int): Size of all processed EDLs in bytes.
+    seconds (float): Wall time of the whole batch.
+
+"""
+
+
+def expand_edl_paths(patterns):
+    """Return the EDL paths matching the given paths or glob patterns.
+
+    Patterns without a match are kept as they are, so missing files show up
+    as failed batch results.
+
+    Args:
+        patterns (list): EDL paths or glob patterns.
+
+    Returns:
+        list: Unique EDL paths in pattern order, sorted per pattern.
+
+    """
+    edl_paths = []
+    seen = set()
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else []
+        for edl_path in matches or [pattern]:
+            if edl_path not in seen:
+                seen.add(edl_path)
+                edl_paths.append(edl_path)
+    return edl_paths
+
+
+# pylint: disable=too-many-arguments
+def process_batch(
+    edl_paths, fps, operations, output_paths=None, workers=None, dry_run=False
+):
+    """Process the EDLs in a process pool.
+
+    Args:
+        edl_paths (list): Paths of the EDLs to process.
+        fps (str): Frame Rate for EDL calculations.
+        operations (list): Tuples of operation name and argument list, see
+            py_edl_editor.pipeline.OPERATIONS.
+        output_paths (list): Output path per EDL. Nothing is written if not
+            given or for None entries.
+        workers (int): Maximum number of worker processes. Defaults to the
+            number of CPUs; 1 processes serially without a pool.
+        dry_run (bool): Only report the files the exports would write.
+
+    Returns:
+        BatchReport: Per file results and aggregated statistics.
+
+    """
+    if output_paths is None:
+        output_paths = [None] * len(edl_paths)
+    jobs = [
+        (edl_path, fps, operations, output_path, dry_run)
+        for edl_path, output_path in zip(edl_paths, output_paths)
+    ]
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) < 2:
+        results = list(map(_process_job, jobs))
+    else:
+        workers = workers or os.cpu_count() or 1
+        # Bigger chunks save inter-process round trips on many small EDLs.
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(
+                executor.map(_process_job, jobs, chunksize=chunksize)
+            )
+    processed = [result for result in results if result.error is None]
+    return BatchReport(
+        results=results,
+        files=len(processed),
+        failed=len(results) - len(processed),
+        events=sum(result.events for result in processed),
+        size=sum(result.size for result in processed),
+        seconds=time.perf_counter() - start,
+    )
+
+
+def format_batch_report(report):
+    """Return the lines describing the throughput of the given batch.
+
+    Args:
+        report (BatchReport): Batch report.
+
+    Returns:
+        list: Human readable report lines.
+
+    """
+    seconds = max(report.seconds, 1e-9)
+    return [
+        "Processed {0} EDLs ({1} failed) with {2} events in {3:.2f}s.".format(
+            report.files, report.failed, report.events, report.seconds
+        ),
+        "Throughput: {0:.1f} EDLs/s, {1:.0f} events/s, {2:.2f} MiB/s.".format(
+            report.files / seconds,
+            report.events / seconds,
+            report.size / 1024.0 / 1024.0 / seconds,
+        ),
+    ]
+
+
+def _process_job(job):
+    """Process one EDL and catch any error.
+
+    Args:
+        job (tuple): EDL path, fps, operations, output path and dry run
+            flag.
+
+    Returns:
+        BatchResult: Result of the EDL.
+
+    """
+    edl_path, fps, operations, output_path, dry_run = job
+    start = time.perf_counter()
+    try:
+        edl = process_edl(edl_path, fps, operations, output_path, dry_run)
+        size = os.path.getsize(edl_path)
+    # A broken EDL must not stop the batch, so every error is reported.
+    except Exception as error:  # pylint: disable=broad-except
+        return BatchResult(
+            edl_path, None, 0, 0, time.perf_counter() - start, str(error)
+        )
+    return BatchResult(
+        edl_path,
+        output_path,
+        len(edl.events),
+        size,
+        time.perf_counter() - start,
+        None,
+    )
@@ -0,0 +1,106 @@
+"""Interned CDL store.
+
+Events of the same reel with the same SOP and SAT values share one
+ColorCorrection instance, so an EDL with repeated grades keeps one CDL per
+grade instead of one per event. Shared instances must not be changed in
+place; an event gets a new grade by assigning another CDL.
+"""
+
+# Import built-in modules
+from decimal import Decimal
+
+# Import third-party modules
+from cdl_convert import correction  # type: ignore
+
+
+def cdl_key(reel, slope=None, offset=None, power=None, sat=None):
+    """Return the content key of a grade.
+
+    Values are compared as decimals, so "1" and "1.0" are the same grade.
+
+    Args:
+        reel (str): Reel name and id of the CDL.
+        slope (tuple): RGB slope values or None if not set.
+        offset (tuple): RGB offset values or None if not set.
+        power (tuple): RGB power values or None if not set.
+        sat (str): Saturation or None if not set.
+
+    Returns:
+        tuple: Hashable key of the grade.
+
+    """
+    return (
+        reel,
+        _decimals(slope),
+        _decimals(offset),
+        _decimals(power),
+        None if sat is None else Decimal(sat),
+    )
+
+
+def _decimals(values):
+    """Return the values as a tuple of decimals, None stays None."""
+    if values is None:
+        return None
+    return tuple(Decimal(value) for value in values)
+
+
+class CdlStore:
+    """ColorCorrection instances interned by reel and grade."""
+
+    def __init__(self):
+        """Initialize the CdlStore instance."""
+        self._cdls = {}
+
+    def __len__(self):
+        """int: Number of stored CDLs."""
+        return len(self._cdls)
+
+    def get(self, reel, slope=None, offset=None, power=None, sat=None):
+        """Return the CDL of the grade, creating it on first use.
+
+        Args:
+            reel (str): Reel name, used as id of a new CDL.
+            slope (tuple): RGB slope values or None if not set.
+            offset (tuple): RGB offset values or None if not set.
+            power (tuple): RGB power values or None if not set.
+            sat (str): Saturation or None if not set.
+
+        Returns:
+            cdl_convert.ColorCorrection: Shared correction instance.
+
+        """
+        key = cdl_key(reel, slope, offset, power, sat)
+        cdl = self._cdls.get(key)
+        if cdl is None:
+            cdl = correction.ColorCorrection(reel)
+            if slope is not None:
+                cdl.slope = slope
+                cdl.offset = offset
+                cdl.power = power
+            if sat is not None:
+                cdl.sat = sat
+            self._cdls[key] = cdl
+        return cdl
+
+    def intern(self, cdl, reel=None):
+        """Return the stored CDL with the same grade, storing cdl if new.
+
+        Args:
+            cdl (cdl_convert.ColorCorrection): Correction instance.
+            reel (str): Reel the grade belongs to, defaults to the CDL id.
+
+        Returns:
+            cdl_convert.ColorCorrection: Shared correction instance.
+
+        """
+        if cdl.has_sop:
+            sop = (cdl.slope, cdl.offset, cdl.power)
+        else:
+            sop = (None, None, None)
+        key = cdl_key(
+            cdl.id if reel is None else reel,
+            *sop,
+            sat=cdl.sat if cdl.has_sat else None
+        )
+        return self._cdls.setdefault(key, cdl)
@@ -1,89 +1,498 @@
 "CDL tools."
 
+# Import built-in modules
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+import os
+import re
+import time
+from xml.etree import ElementTree
+
 # Import third-party modules
 import cdl_convert  # type: ignore
 
+# Import local modules
+from py_edl_editor.cdl_store import CdlStore
+from py_edl_editor.edl_comments import SAT_SLOT
+from py_edl_editor.edl_comments import SOP_SLOT
+from py_edl_editor.edl_comments import cdl_comments
+from py_edl_editor.edl_comments import set_comment
+
+CdlImportReport = namedtuple(
+    "CdlImportReport",
+    ["matched_events", "unmatched_cdl_ids", "unmatched_reels"],
+)
+CdlImportReport.__doc__ = """Result of a CDL import.
+
+Attributes:
+    matched_events (int): Number of events that received a CDL.
+    unmatched_cdl_ids (list): Ids of imported CDLs without a matching reel.
+    unmatched_reels (list): Sorted reels that did not receive a CDL.
+
+"""
+
+CdlExportReport = namedtuple(
+    "CdlExportReport",
+    ["files", "duplicates", "conflicting_ids", "size", "seconds", "dry_run"],
+)
+CdlExportReport.__doc__ = """Result of a CDL export.
+
+Attributes:
+    files (int): Number of written (or, on a dry run, planned) files.
+    duplicates (int): Corrections skipped as identical to an exported one.
+    conflicting_ids (list): Sorted ids with differing corrections, of which
+        only the last one is written to the id's .cc or .cdl file.
+    size (int): Size of the file contents in bytes.
+    seconds (float): Runtime of the export.
+    dry_run (bool): True if no files were written.
+
+"""
+
+CDL_TYPES = [".ccc", ".cc", ".cdl"]
+
+
+def import_cdl_file(edl, cdl_path, reel_index=None, workers=None):
+    """Add the CDLs of the given CDL file to the EDL.
+
+    A .ccc file is imported on its own. For a .cc or .cdl file, all files
+    with the same extension in its folder are imported.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        cdl_path (string): Path to a .ccc, .cc or .cdl file.
+        reel_index (dict): Optional index returned by build_reel_index.
+        workers (int): Maximum number of parallel file parsers.
+
+    Returns:
+        CdlImportReport: Matched events and unmatched CDL ids and reels.
+
+    Raises:
+        ValueError: If the file type is not supported.
+
+    """
+    cdl_type = os.path.splitext(cdl_path)[1]
+    if cdl_type == ".ccc":
+        return add_ccc_to_edl(edl, cdl_path, reel_index)
+    if cdl_type in [".cdl", ".cc"]:
+        cdl_folder = os.path.dirname(cdl_path)
+        cdl_files = [
+            os.path.join(cdl_folder, file)
+            for file in os.listdir(cdl_folder or ".")
+            if file.endswith(cdl_type)
+        ]
+        return add_cdls_to_edl(edl, cdl_type, cdl_files, reel_index, workers)
+    raise ValueError("Wrong file type. Supported types: .cdl, .cc, .ccc")
+
+
+def export_cdls(
+    edl, cdl_type, dest_folder, basename, workers=None, dry_run=False
+):
+    """Write the CDLs of all EDL events with SOP and SAT values.
+
+    Identical corrections of a reel are written once. The file contents
+    are built in the calling thread, as cdl_convert objects are not thread
+    safe, and written by a thread pool.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        cdl_type (string): Type of CDL (.ccc, .cc, .cdl).
+        dest_folder (string): Folder the CDL files are written to.
+        basename (string): File name without extension of a .ccc file.
+        workers (int): Maximum number of parallel file writers.
+        dry_run (bool): Only report the files that would be written.
+
+    Returns:
+        CdlExportReport: Exported files, skipped and conflicting CDLs.
+
+    """
+    start = time.perf_counter()
+    cdls = []
+    exported = set()
+    cdl_store = CdlStore()
+    duplicates = 0
+    for event in edl.events:
+        cdl = event.cdl
+        if not (cdl.has_sop and cdl.has_sat):
+            continue
+        # Events of a parsed EDL already share the CDL of a grade, imported
+        # or edited CDLs are compared by their values.
+        if (
+            cdl_store.intern(cdl, event.reel) is cdl
+            and id(cdl) not in exported
+        ):
+            exported.add(id(cdl))
+            cdls.append(cdl)
+        else:
+            duplicates += 1
+    conflicting_ids = []
+    if cdl_type == ".ccc":
+        ccc = cdl_convert.collection.ColorCollection()
+        filename = "{0}.ccc".format(basename)
+        ccc.append_children(cdls)
+        contents = {os.path.join(dest_folder, filename): ccc.xml_root}
+    else:
+        contents = {}
+        for cdl in cdls:
+            cdl.determine_dest(cdl_type[1:], dest_folder)
+            if cdl.file_out in contents:
+                conflicting_ids.append(cdl.id)
+            # Like writing the files one by one, the last one wins.
+            contents[cdl.file_out] = _cdl_file_content(cdl, cdl_type)
+    if not dry_run:
+        _write_files(contents, workers)
+    return CdlExportReport(
+        len(contents),
+        duplicates,
+        sorted(set(conflicting_ids)),
+        sum(len(content) for content in contents.values()),
+        time.perf_counter() - start,
+        dry_run,
+    )
+
+
+def format_cdl_export_report(report):
+    """Return the lines describing the given CDL export report.
+
+    Args:
+        report (CdlExportReport): Export report.
+
+    Returns:
+        list: Human readable report lines.
+
+    """
+    seconds = max(report.seconds, 1e-6)
+    lines = [
+        "{0} {1} CDL files ({2:.1f} KiB) in {3:.2f}s, "
+        "{4:.0f} files/s, {5:.2f} MiB/s.".format(
+            "Would write" if report.dry_run else "Wrote",
+            report.files,
+            report.size / 1024.0,
+            report.seconds,
+            report.files / seconds,
+            report.size / 1024.0 / 1024.0 / seconds,
+        )
+    ]
+    if report.duplicates:
+        lines.append(
+            "Skipped {0} identical corrections.".format(report.duplicates)
+        )
+    if report.conflicting_ids:
+        lines.append(
+            "Reels with differing corrections, last one written: {0}".format(
+                ", ".join(report.conflicting_ids)
+            )
+        )
+    return lines
+
+
+def _cdl_file_content(cdl, cdl_type):
+    """Return the .cc or .cdl file content of the correction.
+
+    Same output as cdl_convert.write.write_cc and write_cdl.
+
+    Args:
+        cdl (cdl_convert.ColorCorrection): Correction to export.
+        cdl_type (string): Type of CDL (.cc, .cdl).
+
+    Returns:
+        bytes: XML file content.
+
+    """
+    if cdl_type == ".cc":
+        return cdl.xml_root
+    container = cdl_convert.collection.ColorCollection()
+    parent = cdl.parent
+    container.append_child(cdl)
+    # Restore the parentage, the container is only used for writing.
+    cdl.parent = parent
+    container.set_to_cdl()
+    return container.xml_root
+
+
+def _write_files(contents, workers=None):
+    """Write the file contents, in parallel if there are several files.
+
+    Args:
+        contents (dict): File path mapped to its bytes.
+        workers (int): Maximum number of parallel file writers.
+
+    """
+    if workers == 1 or len(contents) < 2:
+        for path, content in contents.items():
+            _write_file(path, content)
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Consume the results, so write errors are raised.
+        list(executor.map(_write_file, contents.keys(), contents.values()))
+
+
+def _write_file(path, content):
+    """Write the bytes to the file.
+
+    Args:
+        path (string): Path of the file.
+        content (bytes): File content.
+
+    """
+    with open(path, "wb") as output_file:
+        output_file.write(content)
+
 
-def add_ccc_to_edl(edl, ccc_file_path):
+def format_cdl_import_report(report):
+    """Return the lines describing the given CDL import report.
+
+    Args:
+        report (CdlImportReport): Import report.
+
+    Returns:
+        list: Human readable report lines.
+
+    """
+    lines = ["CDLs applied to {0} events.".format(report.matched_events)]
+    if report.unmatched_cdl_ids:
+        lines.append(
+            "CDLs without matching reel: {0}".format(
+                ", ".join(report.unmatched_cdl_ids)
+            )
+        )
+    if report.unmatched_reels:
+        lines.append(
+            "Reels without CDL: {0}".format(", ".join(report.unmatched_reels))
+        )
+    return lines
+
+
+def add_ccc_to_edl(edl, ccc_file_path, reel_index=None):
     """Add cdl values of the .ccc file to the EDL.
 
     Args:
         edl (Edl): Edit Decision List.
         ccc_file_path (string): Absolute pth to the .ccc file.
+        reel_index (dict): Optional index returned by build_reel_index.
+
+    Returns:
+        CdlImportReport: Matched events and unmatched CDL ids and reels.
 
     """
     # Clear members, so the ids are empty and no unique ids are created.
     cdl_convert.correction.ColorCorrection.members = {}
-    ccc = cdl_convert.parse_ccc(ccc_file_path)
-    _import_cdls(edl, ccc.color_corrections)
+    return _import_cdls(edl, iter_ccc(ccc_file_path), reel_index)
 
 
-def add_cdls_to_edl(edl, cdl_type, cdl_file_paths):
+def iter_ccc(ccc_file_path):
+    """Yield the ColorCorrections of a .ccc file while reading it.
+
+    Unlike cdl_convert.parse_ccc, the XML tree is never built as a whole:
+    every ColorCorrection element is parsed once it was read completely and
+    then removed, so memory use does not grow with the file size.
+
+    Args:
+        ccc_file_path (string): Path to the .ccc file.
+
+    Yields:
+        cdl_convert.ColorCorrection: Corrections in file order.
+
+    Raises:
+        ValueError: If the file is no ColorCorrectionCollection or has no
+            ColorCorrection.
+
+    """
+    root = None
+    depth = 0
+    found = False
+    for event, element in ElementTree.iterparse(
+        ccc_file_path, events=("start", "end")
+    ):
+        if event == "start":
+            depth += 1
+            if root is None:
+                root = element
+                if _local_tag(root) != "ColorCorrectionCollection":
+                    raise ValueError(
+                        "CCC parsed but no ColorCorrectionCollection found"
+                    )
+            continue
+        depth -= 1
+        if depth != 1 or _local_tag(element) != "ColorCorrection":
+            continue
+        # Same as cdl_convert: the namespace only clutters the element tags.
+        for node in element.iter():
+            node.tag = _local_tag(node)
+        found = True
+        yield cdl_convert.parse_cc(element)
+        root.clear()
+    if not found:
+        raise ValueError(
+            "ColorCorrectionCollections require at least one "
+            "ColorCorrection node, but no ColorCorrection nodes were found."
+        )
+
+
+def _local_tag(element):
+    """Return the tag of the XML element without its namespace.
+
+    Args:
+        element (xml.etree.ElementTree.Element): XML element.
+
+    Returns:
+        str: Tag name.
+
+    """
+    return element.tag.rpartition("}")[2]
+
+
+def add_cdls_to_edl(
+    edl, cdl_type, cdl_file_paths, reel_index=None, workers=None
+):
     """Add cdl values of the .cc or .cdl files to the EDL.
 
     Args:
         edl (Edl): Edit Decision List.
         cdl_type (string): Type of CDL (.cc, .cdl).
         cdl_file_paths (list): List of paths to the .cdl/.cc files.
+        reel_index (dict): Optional index returned by build_reel_index.
+        workers (int): Maximum number of parallel file parsers.
+
+    Returns:
+        CdlImportReport: Matched events and unmatched CDL ids and reels.
+
+    """
+    cdls = load_cdls(cdl_type, cdl_file_paths, workers)
+    return _import_cdls(edl, cdls, reel_index)
+
+
+def load_cdls(cdl_type, cdl_file_paths, workers=None, use_processes=False):
+    """Parse .cc or .cdl files concurrently.
+
+    Reading and XML parsing of the files runs in a thread pool (or process
+    pool). The ColorCorrection instances are created afterwards in the
+    calling thread and in the order of cdl_file_paths. This keeps the ids
+    deterministic, because cdl_convert registers every new ColorCorrection
+    in the class level ColorCorrection.members dictionary.
+
+    Args:
+        cdl_type (string): Type of CDL (.cc, .cdl).
+        cdl_file_paths (list): List of paths to the .cdl/.cc files.
+        workers (int): Maximum number of workers. Defaults to the executor's
+            default; 1 parses serially without a pool.
+        use_processes (bool): Parse in a process pool instead of threads.
+
+    Returns:
+        list: ColorCorrection instances in file order.
 
     """
-    cdls = []
     cdl_convert.correction.ColorCorrection.members = {}
-    for path in cdl_file_paths:
-        if cdl_type == ".cdl":
-            decisions = cdl_convert.parse_cdl(path).color_decisions
-            for decision in decisions:
-                cdls.append(decision.cc)
-        if cdl_type == ".cc":
-            cdls.append(cdl_convert.parse_cc(path))
-    _import_cdls(edl, cdls)
+    cdls = []
+    if workers == 1:
+        roots = map(_read_xml_root, cdl_file_paths)
+        for path, root in zip(cdl_file_paths, roots):
+            cdls.extend(_cdls_from_xml_root(cdl_type, path, root))
+        return cdls
+    executor_class = (
+        ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    )
+    with executor_class(max_workers=workers) as executor:
+        roots = executor.map(_read_xml_root, cdl_file_paths)
+        for path, root in zip(cdl_file_paths, roots):
+            cdls.extend(_cdls_from_xml_root(cdl_type, path, root))
+    return cdls
 
 
-def _import_cdls(edl, cdls):
-    """Add cdl values of the collection to the EDL.
+def _read_xml_root(path):
+    """Return the root element of the XML file without its namespace.
 
     Args:
-        edl (Edl): Edit Decision List.
-        ccc_file_path (string): Absolute pth to the .ccc file.
+        path (string): Path to the .cdl/.cc file.
+
+    Returns:
+        xml.etree.ElementTree.Element: Root element.
 
     """
-    for cdl in cdls:
-        for event in edl.events:
-            if event.reel == cdl.id:
-                event.cdl = cdl
-                _add_edl_cdl_comments(event)
+    with open(path, "r") as xml_file:
+        xml_string = xml_file.read()
+    # Same as cdl_convert: the namespace only clutters the element tags.
+    xml_string = re.sub(' xmlns="[^"]+"', "", xml_string, count=1)
+    return ElementTree.fromstring(xml_string)
+
 
+def _cdls_from_xml_root(cdl_type, path, root):
+    """Return the ColorCorrection instances of a parsed .cc or .cdl file.
 
-def _add_edl_cdl_comments(event):
-    """Add CDL comments to the edl event.
+    Args:
+        cdl_type (string): Type of CDL (.cc, .cdl).
+        path (string): Path of the parsed file.
+        root (xml.etree.ElementTree.Element): Root element of the file.
+
+    Returns:
+        list: ColorCorrection instances.
+
+    """
+    if cdl_type == ".cc":
+        cdl = cdl_convert.parse_cc(root)
+        cdl.file_in = path
+        return [cdl]
+    if cdl_type == ".cdl":
+        if root.tag != "ColorDecisionList":
+            raise ValueError("CDL parsed but no ColorDecisionList found")
+        decision_list = cdl_convert.ColorCollection()
+        decision_list.set_to_cdl()
+        decision_list.file_in = path
+        decision_list.parse_xml_color_decisions(root)
+        return [decision.cc for decision in decision_list.color_decisions]
+    return []
+
+
+def build_reel_index(edl):
+    """Return a mapping of every reel to its EDL events.
+
+    The index can be passed to several imports into the same EDL, as long
+    as the reels are not edited in between.
 
     Args:
-        event (Edl.event): EDL Event where CDL comments will be added.
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        dict: Reel name mapped to the list of its events in EDL order.
 
     """
-    _remove_edl_cdl_comments(event)
-    slope = " ".join([str(slope) for slope in event.cdl.slope])
-    offset = " ".join([str(offset) for offset in event.cdl.offset])
-    power = " ".join([str(power) for power in event.cdl.power])
-    sop = "* ASC_SOP ({0})({1})({2})".format(slope, offset, power)
-    sat = "* ASC_SAT {0}".format(event.cdl.sat)
-    event.comments.append(sop)
-    event.comments.append(sat)
+    reel_index = {}
+    for event in edl.events:
+        reel_index.setdefault(event.reel, []).append(event)
+    return reel_index
 
 
-def _remove_edl_cdl_comments(event):
-    """Remove all CDL comments from the edl event.
+def _import_cdls(edl, cdls, reel_index=None):
+    """Add cdl values of the collection to the EDL.
 
     Args:
-        event (Edl.event): EDL Event containing the comments to remove.
+        edl (Edl): Edit Decision List.
+        cdls (list): ColorCorrection instances to import.
+        reel_index (dict): Optional index returned by build_reel_index.
+
+    Returns:
+        CdlImportReport: Matched events and unmatched CDL ids and reels.
 
     """
-    cdl_comments = []
-    for comment in event.comments:
-        if "ASC_SOP" in comment:
-            cdl_comments.append(comment)
-        elif "ASC_SAT" in comment:
-            cdl_comments.append(comment)
-    if cdl_comments:
-        for comment in cdl_comments:
-            event.comments.remove(comment)
+    if reel_index is None:
+        reel_index = build_reel_index(edl)
+    matched_events = 0
+    matched_reels = set()
+    unmatched_cdl_ids = []
+    for cdl in cdls:
+        events = reel_index.get(cdl.id)
+        if not events:
+            unmatched_cdl_ids.append(cdl.id)
+            # Only keep the corrections used by the EDL registered.
+            cdl_convert.correction.ColorCorrection.members.pop(cdl.id, None)
+            continue
+        matched_reels.add(cdl.id)
+        sop_comment, sat_comment = cdl_comments(cdl)
+        for event in events:
+            event.cdl = cdl
+            # Existing CDL comments are replaced in place.
+            set_comment(event, SOP_SLOT, sop_comment)
+            set_comment(event, SAT_SLOT, sat_comment)
+        matched_events += len(events)
+    unmatched_reels = sorted(set(reel_index) - matched_reels)
+    return CdlImportReport(matched_events, unmatched_cdl_ids, unmatched_reels)
@@ -0,0 +1,217 @@
+"""Command line interface processing EDLs without the GUI.
+
+Usage: edl_editor process [options] [operations] edl [edl ...]
+
+The operations are applied to every EDL in the order they are given on the
+command line. The EDLs are processed in a pool of worker processes, e.g.:
+
+    edl_editor process --fps 24 --remove-gaps --start-tc 01:00:00:00
+        --handles 8 --output-dir out/ *.edl
+
+This module must not import PySide2, so it starts fast on machines without
+a display.
+"""
+
+# Import built-in modules
+import argparse
+import os
+
+# Import local modules
+from py_edl_editor.batch import expand_edl_paths
+from py_edl_editor.batch import format_batch_report
+from py_edl_editor.batch import process_batch
+from py_edl_editor.tc_tools import FRAMERATES
+
+COMMAND = "process"
+
+# Command line flag, operation name, argument names and help text.
+OPERATION_FLAGS = [
+    (
+        "--timeline-report",
+        "timeline_report",
+        [],
+        "Print gaps, overlaps and out of order events.",
+    ),
+    ("--remove-gaps", "remove_gaps", [], "Remove gaps between events."),
+    ("--start-tc", "start_tc", ["TC"], "Set the record start timecode."),
+    ("--handles", "handles", ["FRAMES"], "Add head and tail handles."),
+    (
+        "--switch-reel-clip-name",
+        "switch_reel_clip_name",
+        [],
+        "Switch reel and clip name.",
+    ),
+    (
+        "--switch-reel-locator",
+        "switch_reel_locator",
+        [],
+        "Switch reel and locator name.",
+    ),
+    (
+        "--copy-source-file-to-reel",
+        "copy_source_file_to_reel",
+        [],
+        "Copy the source file name to the reel.",
+    ),
+    (
+        "--remove-reel-ext",
+        "remove_reel_ext",
+        [],
+        "Remove the extension from all reels.",
+    ),
+    ("--prepend-reels", "prepend_reels", ["TEXT"], "Prepend to all reels."),
+    ("--append-reels", "append_reels", ["TEXT"], "Append to all reels."),
+    (
+        "--replace-reels",
+        "replace_reels",
+        ["OLD", "NEW"],
+        "Replace a string in all reels.",
+    ),
+    (
+        "--rename-reels",
+        "rename_reels",
+        ["MAPPING_FILE"],
+        "Rename reels by a CSV file of old and new names or re: rules.",
+    ),
+    (
+        "--import-cdls",
+        "import_cdls",
+        ["CDL_FILE"],
+        "Import a .ccc file or all .cc/.cdl files next to the given file.",
+    ),
+    (
+        "--export-cdls",
+        "export_cdls",
+        ["TYPE", "FOLDER"],
+        "Export CDLs as .ccc, .cc or .cdl files.",
+    ),
+    (
+        "--export-reels",
+        "export_reels",
+        ["FOLDER"],
+        "Export the reel names to a textfile.",
+    ),
+    (
+        "--export-pull-list",
+        "export_pull_list",
+        ["TYPE", "HANDLES", "FOLDER"],
+        "Export the merged source ranges per reel as .csv or .json file.",
+    ),
+]
+
+
+# pylint: disable=too-few-public-methods
+class AppendOperation(argparse.Action):
+    """Argparse action collecting operations in command line order."""
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        """Append the operation name and its arguments to the namespace."""
+        operations = list(getattr(namespace, self.dest) or [])
+        operations.append((self.const, list(values)))
+        setattr(namespace, self.dest, operations)
+
+
+def build_parser():
+    """Return the argument parser of the process command.
+
+    Returns:
+        argparse.ArgumentParser: Argument parser.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog="edl_editor {0}".format(COMMAND),
+        description="Apply a pipeline of operations to EDL files.",
+    )
+    parser.add_argument(
+        "edl_paths",
+        nargs="+",
+        metavar="edl",
+        help="EDL paths or glob patterns like 'reels/*.edl'.",
+    )
+    parser.add_argument("--fps", default="24", choices=FRAMERATES)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Number of worker processes, defaults to the number of CPUs.",
+    )
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument(
+        "--output-dir", help="Write the processed EDLs to this folder."
+    )
+    output.add_argument(
+        "--in-place", action="store_true", help="Overwrite the input EDLs."
+    )
+    output.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Do not write any EDL or exported file.",
+    )
+    parser.add_argument(
+        "--suffix",
+        default="",
+        help="Suffix added to the file names in the output folder.",
+    )
+    operations = parser.add_argument_group("operations")
+    for flag, name, metavars, help_text in OPERATION_FLAGS:
+        operations.add_argument(
+            flag,
+            dest="operations",
+            action=AppendOperation,
+            const=name,
+            nargs=len(metavars),
+            metavar=tuple(metavars) if metavars else None,
+            help=help_text,
+        )
+    parser.set_defaults(operations=[])
+    return parser
+
+
+def output_path(edl_path, args):
+    """Return the path the processed EDL is written to.
+
+    Args:
+        edl_path (str): Path of the input EDL.
+        args (argparse.Namespace): Parsed command line arguments.
+
+    Returns:
+        str: Output path or None for a dry run.
+
+    """
+    if args.dry_run:
+        return None
+    if args.in_place:
+        return edl_path
+    basename, ext = os.path.splitext(os.path.basename(edl_path))
+    return os.path.join(
+        args.output_dir, "{0}{1}{2}".format(basename, args.suffix, ext)
+    )
+
+
+def main(argv=None):
+    """Run the process command.
+
+    Args:
+        argv (list): Command line arguments without the command name.
+
+    Returns:
+        int: Exit code, 1 if any EDL could not be processed.
+
+    """
+    args = build_parser().parse_args(argv)
+    if args.output_dir and not os.path.isdir(args.output_dir):
+        os.makedirs(args.output_dir)
+    edl_paths = expand_edl_paths(args.edl_paths)
+    report = process_batch(
+        edl_paths,
+        args.fps,
+        args.operations,
+        [output_path(edl_path, args) for edl_path in edl_paths],
+        args.workers,
+        args.dry_run,
+    )
+    for result in report.results:
+        if result.error is not None:
+            print("{0}: {1}".format(result.edl_path, result.error))
+    for line in format_batch_report(report):
+        print(line)
+    return 1 if report.failed else 0
@@ -0,0 +1,487 @@
+"""Cache of parsed EDLs.
+
+Parsed EDLs are stored as compact pickled primitives: the frames of all
+events in four integer arrays plus one tuple of strings per event. The
+CDLs are pickled as they are, which is much faster to load than creating
+and validating them again; their Decimal values are stored once per
+distinct value. The pickle is zlib compressed, as the event comments repeat
+a lot of text. Every cache hit builds new event, Timecode and CDL
+instances, so edits of a returned EDL never change the cached state.
+
+The cache folder may be writable by others, so unpickling only creates
+instances of the EDL, timecode and CDL classes; entries referring to any
+other class or function are parsed again.
+"""
+
+# Import built-in modules
+from array import array
+from collections import OrderedDict
+from decimal import Decimal
+import gc
+import hashlib
+import io
+import os
+import pickle
+import tempfile
+import zlib
+
+# Import third-party modules
+from cdl_convert import correction  # type: ignore
+from edl import Event, List, Timewarp  # type: ignore
+from timecode import Timecode  # type: ignore
+
+# Import local modules
+from py_edl_editor.edl_parser import TC_KEYS
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_parser import transition_for_code
+from py_edl_editor.timeline import TC_COLUMNS
+from py_edl_editor.timeline import Timeline
+
+# Increase when the serialized layout changes, so old disk entries are
+# parsed again.
+FORMAT_VERSION = 1
+FIELD_KEYS = ["num", "reel", "track", "tr_code", "aux"]
+# Modules whose classes may be created by unpickling a cache entry.
+SAFE_MODULES = [
+    "array",
+    "cdl_convert",
+    "decimal",
+    "edl",
+    "py_edl_editor.timeline",
+    "timecode",
+]
+# Functions that may be called by unpickling a cache entry.
+SAFE_FUNCTIONS = [("array", "_array_reconstructor")]
+
+
+class EdlCache:
+    """LRU cache of parsed EDLs keyed by path, size, mtime and fps.
+
+    Entries are kept in memory and, if a cache folder is given, on disk as
+    well, so they survive a restart. A changed file gets a new key, so
+    stale entries are never returned.
+
+    """
+
+    def __init__(self, max_entries=8, cache_dir=None):
+        """Initialize the EdlCache instance.
+
+        Args:
+            max_entries (int): Number of EDLs kept in memory.
+            cache_dir (str): Optional folder for the on-disk cache.
+
+        """
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """Return the number of EDLs kept in memory."""
+        return len(self._entries)
+
+    def get(self, edl_path, fps, compact=False, parse=parse_edl):
+        """Return the parsed EDL, parsing the file only on a cache miss.
+
+        Args:
+            edl_path (str): Absoulte path to EDL.
+            fps (str): Frame Rate for EDL calculations.
+            compact (bool): Return a Timeline instead of an edl.List.
+            parse (callable): Called like parse_edl on a cache miss. It
+                may return an EdlSnapshot of all parsed events instead of
+                the EDL. An exception raised by it leaves the cache
+                unchanged.
+
+        Returns:
+            Edl: New EDL instance or None if the file does not exist.
+
+        """
+        key = self._key(edl_path, fps, compact)
+        if key is None:
+            return None
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            return load_edl(data, fps, compact)
+        data = self._read_disk_entry(key)
+        if data is not None:
+            try:
+                edl = load_edl(data, fps, compact)
+            except (pickle.UnpicklingError, zlib.error):
+                # Tampered or broken entries are parsed again.
+                edl = None
+            if edl is not None:
+                self._store(key, data)
+                return edl
+        edl = parse(edl_path, fps, compact)
+        if isinstance(edl, EdlSnapshot):
+            data, edl = edl.dump(), edl.edl
+        else:
+            data = dump_edl(edl)
+        self._store(key, data)
+        self._write_disk_entry(key, data)
+        return edl
+
+    def clear(self):
+        """Remove all EDLs kept in memory."""
+        self._entries.clear()
+
+    def _store(self, key, data):
+        """Keep the serialized EDL in memory and evict the oldest entries.
+
+        Args:
+            key (tuple): Cache key.
+            data (bytes): Serialized EDL.
+
+        """
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @classmethod
+    def _key(cls, edl_path, fps, compact):
+        """Return the cache key of the EDL file or None if it is missing.
+
+        Args:
+            edl_path (str): Path to EDL.
+            fps (str): Frame Rate for EDL calculations.
+            compact (bool): Key for a Timeline instead of an edl.List.
+
+        Returns:
+            tuple: Path, size, mtime, fps and model of the EDL.
+
+        """
+        try:
+            stat = os.stat(edl_path)
+        except OSError:
+            return None
+        return (
+            os.path.abspath(edl_path),
+            stat.st_size,
+            stat.st_mtime_ns,
+            str(fps),
+            bool(compact),
+        )
+
+    def _disk_path(self, key):
+        """Return the cache file path for the key.
+
+        All versions of one EDL share a file, so the cache folder holds at
+        most one entry per EDL, fps and model.
+
+        Args:
+            key (tuple): Cache key.
+
+        Returns:
+            str: Path of the cache file.
+
+        """
+        path, _, _, fps, compact = key
+        name = hashlib.sha1(repr((path, fps, compact)).encode("utf-8"))
+        return os.path.join(
+            self.cache_dir, "{0}.edlcache".format(name.hexdigest())
+        )
+
+    def _read_disk_entry(self, key):
+        """Return the serialized EDL stored on disk for the key.
+
+        Args:
+            key (tuple): Cache key.
+
+        Returns:
+            bytes: Serialized EDL or None if there is no valid entry.
+
+        """
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._disk_path(key), "rb") as cache_file:
+                version, disk_key, data = _EdlUnpickler(cache_file).load()
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            # Missing, truncated or incompatible entries are parsed again.
+            return None
+        if version != FORMAT_VERSION or disk_key != key:
+            return None
+        return data
+
+    def _write_disk_entry(self, key, data):
+        """Store the serialized EDL on disk, replacing older versions.
+
+        Args:
+            key (tuple): Cache key.
+            data (bytes): Serialized EDL.
+
+        """
+        if not self.cache_dir:
+            return
+        if not os.path.isdir(self.cache_dir):
+            os.makedirs(self.cache_dir)
+        file_descriptor, temp_path = tempfile.mkstemp(dir=self.cache_dir)
+        with os.fdopen(file_descriptor, "wb") as cache_file:
+            pickle.dump(
+                (FORMAT_VERSION, key, data),
+                cache_file,
+                pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(temp_path, self._disk_path(key))
+
+
+class _EdlPickler(pickle.Pickler):
+    """Pickler writing every distinct Decimal value only once."""
+
+    def __init__(self, file):
+        """Initialize the _EdlPickler instance.
+
+        Args:
+            file (io.BytesIO): Binary file the pickle is written to.
+
+        """
+        super(_EdlPickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self._decimal_ids = {}
+
+    def persistent_id(self, obj):  # pylint: disable=method-hidden
+        """Return the shared id of Decimal values, None for other objects."""
+        if type(obj) is Decimal:  # pylint: disable=unidiomatic-typecheck
+            value = str(obj)
+            # Equal ids are the same object, so the pickle memo stores
+            # them once.
+            return self._decimal_ids.setdefault(value, value)
+        return None
+
+
+class _EdlUnpickler(pickle.Unpickler):
+    """Unpickler creating one Decimal instance per distinct value.
+
+    Only classes of the SAFE_MODULES and the SAFE_FUNCTIONS are found.
+
+    """
+
+    def __init__(self, file):
+        """Initialize the _EdlUnpickler instance.
+
+        Args:
+            file (io.BytesIO): Binary file the pickle is read from.
+
+        """
+        super(_EdlUnpickler, self).__init__(file)
+        self._decimals = {}
+
+    def persistent_load(self, pid):  # pylint: disable=method-hidden
+        """Return the Decimal value of the given persistent id."""
+        try:
+            return self._decimals[pid]
+        except KeyError:
+            decimal = self._decimals[pid] = Decimal(pid)
+            return decimal
+
+    def find_class(self, module, name):
+        """Return the class or function, refusing all others.
+
+        Args:
+            module (str): Module name.
+            name (str): Qualified name in the module.
+
+        Returns:
+            object: Class or function.
+
+        Raises:
+            pickle.UnpicklingError: If it may not be unpickled.
+
+        """
+        if any(
+            module == safe_module or module.startswith(safe_module + ".")
+            for safe_module in SAFE_MODULES
+        ):
+            found = super(_EdlUnpickler, self).find_class(module, name)
+            if isinstance(found, type) or (module, name) in SAFE_FUNCTIONS:
+                return found
+        raise pickle.UnpicklingError(
+            "Refused to unpickle {0}.{1}".format(module, name)
+        )
+
+
+class EdlSnapshot:
+    """Serialized state of EDL events, taken chunk by chunk.
+
+    A loader streaming events to the GUI adds every chunk before emitting
+    it, so the cache stores the state of the file even if the streamed
+    events are edited before parsing has finished. CDLs are kept as they
+    are, as edits replace the CDL of an event instead of changing it.
+
+    """
+
+    def __init__(self, edl):
+        """Initialize the EdlSnapshot instance.
+
+        Args:
+            edl (Edl): EDL instance (edl.List or Timeline) the events
+                belong to.
+
+        """
+        self.edl = edl
+        self.columns = [array("q") for _ in TC_KEYS]
+        self.records = []
+        self.cdls = []
+
+    def add_events(self, events):
+        """Add the state of the next events of the EDL.
+
+        Args:
+            events (list): EDL Events following the added events.
+
+        """
+        if isinstance(self.edl, Timeline):
+            start = len(self.records)
+            end = start + len(events)
+            for column, name in zip(self.columns, TC_COLUMNS):
+                column.extend(getattr(self.edl, name)[start:end])
+        else:
+            for column, key in zip(self.columns, TC_KEYS):
+                column.extend(getattr(event, key).frames for event in events)
+        for event in events:
+            self.records.append(_event_record(event))
+            self.cdls.append(event.cdl)
+
+    def dump(self):
+        """Return the added events as compact bytes.
+
+        Returns:
+            bytes: Serialized EDL.
+
+        """
+        data = io.BytesIO()
+        _EdlPickler(data).dump(
+            (self.edl.title, self.columns, self.records, self.cdls)
+        )
+        # The fastest level already shrinks the pickle to a fraction.
+        return zlib.compress(data.getvalue(), 1)
+
+
+def _event_record(event):
+    """Return the fields of the event that are not timecodes or the CDL.
+
+    Args:
+        event (edl.Event): EDL Event.
+
+    Returns:
+        tuple: Immutable values of the event.
+
+    """
+    timewarp = None
+    if event.timewarp:
+        timewarp = (
+            event.timewarp.reel,
+            event.timewarp.warp_fps,
+            str(event.timewarp.timecode),
+            event.timewarp.reverse,
+        )
+    locator = None
+    if event.has_locator:
+        locator = (event.loc_tc, event.loc_color, event.loc_name)
+    return (
+        tuple(getattr(event, key) for key in FIELD_KEYS),
+        tuple(event.comments),
+        event.clip_name,
+        event.source_file,
+        getattr(event.transition, "effect", None),
+        timewarp,
+        locator,
+    )
+
+
+def dump_edl(edl):
+    """Return the parsed state of the EDL as compact bytes.
+
+    Args:
+        edl (Edl): EDL instance (edl.List or Timeline) as returned by
+            parse_edl.
+
+    Returns:
+        bytes: Serialized EDL.
+
+    """
+    snapshot = EdlSnapshot(edl)
+    snapshot.add_events(edl.events)
+    return snapshot.dump()
+
+
+def load_edl(data, fps, compact=False):
+    """Return a new EDL instance built from the serialized EDL.
+
+    Args:
+        data (bytes): Serialized EDL as returned by dump_edl.
+        fps (str): Frame Rate for EDL calculations.
+        compact (bool): Return a Timeline instead of an edl.List.
+
+    Returns:
+        Edl: EDL instance (edl.List or Timeline).
+
+    """
+    # Building many small objects triggers the cyclic garbage collector
+    # over and over, although none of them can be garbage yet.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return _load_edl(data, fps, compact)
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+# pylint: disable=too-many-locals
+def _load_edl(data, fps, compact):
+    """Return a new EDL instance built from the serialized EDL.
+
+    Args:
+        data (bytes): Serialized EDL as returned by dump_edl.
+        fps (str): Frame Rate for EDL calculations.
+        compact (bool): Return a Timeline instead of an edl.List.
+
+    Returns:
+        Edl: EDL instance (edl.List or Timeline).
+
+    """
+    pickled = io.BytesIO(zlib.decompress(data))
+    title, columns, records, cdls = _EdlUnpickler(pickled).load()
+    edl = Timeline(fps) if compact else List(fps)
+    edl.title = title
+    # Register the CDLs, as parse_edl leaves them in the members registry.
+    correction.ColorCorrection.members = {cdl.id: cdl for cdl in cdls}
+    previous_event = None
+    for record, frames, cdl in zip(records, zip(*columns), cdls):
+        (
+            values,
+            comments,
+            clip_name,
+            source_file,
+            effect,
+            timewarp,
+            locator,
+        ) = record
+        fields = dict(zip(FIELD_KEYS, values))
+        if compact:
+            event = edl.add_event(fields, *frames)
+        else:
+            for key, value in zip(TC_KEYS, frames):
+                fields[key] = Timecode(fps, frames=value)
+            event = Event(fields)
+            edl.events.append(event)
+        event.comments = list(comments)
+        event.clip_name = clip_name
+        event.source_file = source_file
+        event.transition = transition_for_code(fields["tr_code"])
+        if effect is not None:
+            event.transition.effect = effect
+        if fields["tr_code"] == "C" and previous_event:
+            previous_event.next_event = event
+        if timewarp:
+            event.timewarp = Timewarp(
+                timewarp[0], timewarp[1], timewarp[2], fps
+            )
+            event.timewarp.reverse = timewarp[3]
+        event.cdl = cdl
+        event.has_locator = locator is not None
+        if locator:
+            event.loc_tc, event.loc_color, event.loc_name = locator
+        previous_event = event
+    return edl
@@ -0,0 +1,245 @@
+"""Typed index of the comments of EDL events.
+
+Every comment is classified once into a slot (clip name, source file,
+ASC_SOP, ASC_SAT, locator or unknown) when it is parsed. The positions of
+the comments in event.comments are indexed per slot, so a comment is found
+and replaced in constant time and the comments of one slot can be queried
+across the whole EDL without scanning text. Edits that change the clip
+name or locator name without updating its comment mark the slot as dirty;
+update_dirty_comments regenerates only those.
+"""
+
+# Import built-in modules
+import re
+
+CLIP_NAME_SLOT = "clip_name"
+SOURCE_FILE_SLOT = "source_file"
+LOCATOR_SLOT = "locator"
+SOP_SLOT = "sop"
+SAT_SLOT = "sat"
+UNKNOWN_SLOT = "unknown"
+CLIP_NAME_COMMENT_PATTERN = re.compile(r"\*\s*FROM\s+CLIP\s+NAME:")
+LOCATOR_COMMENT_PATTERN = re.compile(r"\*\s*LOC:")
+# Event attributes the clip name and locator comments are generated from.
+SLOT_ATTRIBUTES = {"clip_name": CLIP_NAME_SLOT, "loc_name": LOCATOR_SLOT}
+
+
+def comment_slots(event):
+    """Return the positions of the generated comments of the event.
+
+    The index is built once and kept on the event. It is rebuilt if the
+    comments list was replaced or comments were added or removed without
+    going through this module.
+
+    Args:
+        event (Edl.event): EDL Event.
+
+    Returns:
+        dict: Slot mapped to the list of its comment indexes.
+
+    """
+    return _comment_index(event)[2]
+
+
+def _comment_index(event):
+    """Return the valid comment index of the event, building it if needed.
+
+    Args:
+        event (Edl.event): EDL Event.
+
+    Returns:
+        list: The indexed comments list, its length and the slot index.
+
+    """
+    cached = getattr(event, "comment_slots", None)
+    comments = event.comments
+    if (
+        cached is not None
+        and cached[0] is comments
+        and cached[1] == len(comments)
+    ):
+        return cached
+    slots = {}
+    for index, comment in enumerate(comments):
+        slots.setdefault(comment_slot(comment), []).append(index)
+    event.comment_slots = [comments, len(comments), slots]
+    return event.comment_slots
+
+
+def comment_slot(comment):
+    """Return the slot of the comment.
+
+    A comment belongs to one slot only, so a line holding both ASC_SOP and
+    ASC_SAT values is a SOP comment.
+
+    Args:
+        comment (str): EDL Event comment like "* FROM CLIP NAME: A001".
+
+    Returns:
+        str: Slot of the comment, UNKNOWN_SLOT for other comments.
+
+    """
+    if "ASC_SOP" in comment:
+        return SOP_SLOT
+    if "ASC_SAT" in comment:
+        return SAT_SLOT
+    if "FROM" in comment and CLIP_NAME_COMMENT_PATTERN.match(comment):
+        return CLIP_NAME_SLOT
+    if "SOURCE FILE:" in comment:
+        return SOURCE_FILE_SLOT
+    if "LOC:" in comment and LOCATOR_COMMENT_PATTERN.match(comment):
+        return LOCATOR_SLOT
+    return UNKNOWN_SLOT
+
+
+def add_comment(event, comment):
+    """Append the comment to the event and index it.
+
+    Args:
+        event (Edl.event): EDL Event.
+        comment (str): New comment.
+
+    Returns:
+        str: Slot of the comment.
+
+    """
+    index = _comment_index(event)
+    event.comments.append(comment)
+    slot = comment_slot(comment)
+    index[2].setdefault(slot, []).append(index[1])
+    index[1] += 1
+    return slot
+
+
+def slot_comments(event, slot):
+    """Return the comments of the slot.
+
+    Args:
+        event (Edl.event): EDL Event.
+        slot (str): Comment slot.
+
+    Returns:
+        list: Comments of the slot in event order.
+
+    """
+    comments = event.comments
+    return [comments[index] for index in comment_slots(event).get(slot, ())]
+
+
+def find_comments(edl, slot):
+    """Yield the comments of the slot across the whole EDL.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        slot (str): Comment slot.
+
+    Yields:
+        tuple: EDL Event and one of its comments of the slot.
+
+    """
+    for event in edl.events:
+        for comment in slot_comments(event, slot):
+            yield event, comment
+
+
+def set_comment(event, slot, comment, add=True):
+    """Replace every comment of the slot, keeping their positions.
+
+    Args:
+        event (Edl.event): EDL Event.
+        slot (str): Comment slot.
+        comment (str): New comment.
+        add (bool): Append the comment if the event has none of the slot.
+
+    """
+    indexes = comment_slots(event).get(slot)
+    if indexes:
+        for index in indexes:
+            event.comments[index] = comment
+        return
+    if add:
+        add_comment(event, comment)
+
+
+def cdl_comments(cdl):
+    """Return the ASC_SOP and ASC_SAT comments of the CDL.
+
+    Args:
+        cdl (cdl_convert.ColorCorrection): Correction instance.
+
+    Returns:
+        tuple: SOP and SAT comment.
+
+    """
+    slope = " ".join([str(slope) for slope in cdl.slope])
+    offset = " ".join([str(offset) for offset in cdl.offset])
+    power = " ".join([str(power) for power in cdl.power])
+    return (
+        "* ASC_SOP ({0})({1})({2})".format(slope, offset, power),
+        "* ASC_SAT {0}".format(cdl.sat),
+    )
+
+
+def update_comment(event, slot):
+    """Regenerate the existing clip name or locator comments.
+
+    Clears the dirty flag of the slot. Events without such a comment stay
+    unchanged.
+
+    Args:
+        event (Edl.event): EDL Event.
+        slot (str): CLIP_NAME_SLOT or LOCATOR_SLOT.
+
+    """
+    if slot == CLIP_NAME_SLOT:
+        comment = "* FROM CLIP NAME: {0}".format(event.clip_name)
+    else:
+        comment = "* LOC: {0} {1} {2}".format(
+            event.loc_tc, event.loc_color, event.loc_name
+        )
+    set_comment(event, slot, comment, add=False)
+    dirty_slots = getattr(event, "dirty_slots", None)
+    if dirty_slots:
+        dirty_slots.discard(slot)
+
+
+def mark_dirty(event, attribute):
+    """Flag the comment generated from the edited attribute as outdated.
+
+    Args:
+        event (Edl.event): EDL Event.
+        attribute (str): Name of the edited event attribute.
+
+    """
+    slot = SLOT_ATTRIBUTES.get(attribute)
+    if slot is None:
+        return
+    dirty_slots = getattr(event, "dirty_slots", None)
+    if dirty_slots is None:
+        event.dirty_slots = {slot}
+    else:
+        dirty_slots.add(slot)
+
+
+def is_dirty(event):
+    """Return True if generated comments of the event are outdated.
+
+    Args:
+        event (Edl.event): EDL Event.
+
+    Returns:
+        bool: True if update_dirty_comments needs to run.
+
+    """
+    return bool(getattr(event, "dirty_slots", None))
+
+
+def update_dirty_comments(event):
+    """Regenerate the outdated comments of the event.
+
+    Args:
+        event (Edl.event): EDL Event.
+
+    """
+    for slot in list(getattr(event, "dirty_slots", None) or ()):
+        update_comment(event, slot)
@@ -0,0 +1,470 @@
+"""Search and sort indexes over the columns of an EDL.
+
+Every indexed field keeps the lowercase text of all events, so searching
+and sorting never build display strings. Selective substring searches are
+answered from a trigram index: only the keys holding all trigrams of the
+query are checked. Broad searches, which match most keys anyway, check the
+keys of all rows. The sorted keys are kept in a list that is updated with
+bisect when values change. The indexes can be built in small steps while
+the GUI is idle, a search or sort completes them, and afterwards only the
+rows whose values actually changed are indexed again.
+"""
+
+# Import built-in modules
+from bisect import bisect_left
+from bisect import insort
+from itertools import chain
+
+REEL_FIELD = "reel"
+CLIP_NAME_FIELD = "clip_name"
+SOURCE_FILE_FIELD = "source_file"
+LOCATOR_FIELD = "loc_name"
+CDL_FIELD = "cdl"
+# All text fields of an event joined, to search them at once. Its long and
+# mostly unique keys are only scanned, trigrams would cost more than that.
+ALL_TEXT_FIELD = "all_text"
+TEXT_FIELDS = [REEL_FIELD, CLIP_NAME_FIELD, SOURCE_FILE_FIELD, LOCATOR_FIELD]
+TRIGRAM_LENGTH = 3
+# Above this share of changed rows, the indexes of a field are built again
+# instead of updated row by row.
+REBUILD_RATIO = 0.1
+# Above this share of candidate keys, a search checks the keys of all rows
+# instead of collecting the rows of the candidates.
+SCAN_RATIO = 0.25
+
+
+def field_key(event, field):
+    """Return the search and sort key of the event field.
+
+    Args:
+        event (Edl.event): EDL Event.
+        field (str): One of TEXT_FIELDS, ALL_TEXT_FIELD or CDL_FIELD.
+
+    Returns:
+        str: Lowercase text, empty if the event has no value. The text
+            fields are separated by line breaks for ALL_TEXT_FIELD. For
+            CDL_FIELD "1" if the event has SOP and SAT values, else "0".
+
+    """
+    if field == CDL_FIELD:
+        return "1" if event.cdl.has_sop and event.cdl.has_sat else "0"
+    if field == ALL_TEXT_FIELD:
+        return "\n".join(
+            field_key(event, text_field) for text_field in TEXT_FIELDS
+        )
+    if field == LOCATOR_FIELD and not event.has_locator:
+        return ""
+    return str(getattr(event, field, None) or "").lower()
+
+
+def trigrams(text):
+    """Return the set of trigrams of the text.
+
+    Args:
+        text (str): Lowercase text.
+
+    Returns:
+        set: All substrings of TRIGRAM_LENGTH characters.
+
+    """
+    starts = range(len(text) - TRIGRAM_LENGTH + 1)
+    ends = range(TRIGRAM_LENGTH, len(text) + 1)
+    return {text[start:end] for start, end in zip(starts, ends)}
+
+
+class FieldIndex:
+    """Keys, trigrams and sorted keys of one field of all events.
+
+    The trigrams and sorted keys are built over the distinct keys, so a reel
+    shared by many events is indexed once. Rows are indexed in row order and
+    the build can be split into steps; searching completes it.
+
+    """
+
+    def __init__(self, field, keys, indexed=True):
+        """Initialize the FieldIndex instance.
+
+        Args:
+            field (str): Indexed event field.
+            keys (list): field_key of every event, in row order.
+            indexed (bool): Build trigrams and sorted keys. Otherwise every
+                search checks the keys of all rows.
+
+        """
+        self.field = field
+        self.indexed = indexed
+        self._reset(keys)
+
+    @property
+    def is_built(self):
+        """bool: True if all rows are indexed."""
+        return not self.indexed or self._indexed_rows == len(self.keys)
+
+    def build(self, max_rows=None):
+        """Index the rows that are not indexed yet.
+
+        Args:
+            max_rows (int): Maximum number of rows to index, all if None.
+
+        Returns:
+            bool: True if all rows are indexed.
+
+        """
+        if not self.indexed:
+            return True
+        first_row = self._indexed_rows
+        last_row = len(self.keys)
+        if max_rows is not None:
+            last_row = min(last_row, first_row + max_rows)
+        for row in range(first_row, last_row):
+            self._add(row, self.keys[row])
+        self._indexed_rows = last_row
+        return self.is_built
+
+    def append(self, keys):
+        """Add the keys of appended rows, they are indexed on the next build.
+
+        Args:
+            keys (list): Keys of the new rows, in row order.
+
+        """
+        self.keys.extend(keys)
+
+    def set_keys(self, keys):
+        """Replace the keys of all rows, updating only the changed ones.
+
+        Args:
+            keys (list): field_key of every event, in row order.
+
+        """
+        changed = [
+            row
+            for row, (old_key, key) in enumerate(zip(self.keys, keys))
+            if old_key != key
+        ]
+        if len(changed) > len(keys) * REBUILD_RATIO:
+            self._reset(keys)
+            return
+        for row in changed:
+            self.update(row, keys[row])
+
+    def update(self, row, key):
+        """Replace the key of a row.
+
+        Args:
+            row (int): Changed row.
+            key (str): New key of the row.
+
+        """
+        old_key = self.keys[row]
+        if key == old_key:
+            return
+        self.keys[row] = key
+        if self.indexed and row < self._indexed_rows:
+            self._remove(row, old_key)
+            self._add(row, key)
+
+    def search(self, query):
+        """Return the rows whose key contains the query.
+
+        Args:
+            query (str): Lowercase search text.
+
+        Returns:
+            list: Matching rows in row order.
+
+        """
+        if len(query) < TRIGRAM_LENGTH or not self.indexed:
+            return self._scan(query)
+        self.build()
+        candidates = sorted(
+            (
+                self._trigram_keys.get(trigram, ())
+                for trigram in trigrams(query)
+            ),
+            key=len,
+        )
+        if len(candidates[0]) > len(self._key_rows) * SCAN_RATIO:
+            # Most keys are candidates, collecting their rows is slower.
+            return self._scan(query)
+        keys = set(candidates[0]).intersection(*candidates[1:])
+        if len(query) > TRIGRAM_LENGTH:
+            # Trigrams can match in another order, check the candidates.
+            keys = [key for key in keys if query in key]
+        return sorted(
+            chain.from_iterable(map(self._key_rows.__getitem__, keys))
+        )
+
+    def sorted_rows(self):
+        """Return all rows sorted by their key, ties in row order.
+
+        Returns:
+            list: Rows in ascending key order.
+
+        """
+        self.build()
+        if self._sorted_keys is None:
+            self._sorted_keys = sorted(self._key_rows)
+        rows = []
+        for key in self._sorted_keys:
+            rows.extend(sorted(self._key_rows[key]))
+        return rows
+
+    def _scan(self, query):
+        """Return the rows whose key contains the query, checking all keys."""
+        return [row for row, key in enumerate(self.keys) if query in key]
+
+    def _reset(self, keys):
+        """Replace the keys and drop the indexes built so far."""
+        self.keys = keys
+        # Number of rows, from the first one, that are indexed.
+        self._indexed_rows = 0
+        self._key_rows = {}
+        self._trigram_keys = {}
+        self._sorted_keys = None
+
+    def _add(self, row, key):
+        """Index the key of the row."""
+        rows = self._key_rows.get(key)
+        if rows is not None:
+            rows.add(row)
+            return
+        self._key_rows[key] = {row}
+        trigram_keys = self._trigram_keys
+        for trigram in trigrams(key):
+            keys = trigram_keys.get(trigram)
+            if keys is None:
+                trigram_keys[trigram] = {key}
+            else:
+                keys.add(key)
+        if self._sorted_keys is not None:
+            insort(self._sorted_keys, key)
+
+    def _remove(self, row, key):
+        """Remove the row from the index of the key."""
+        rows = self._key_rows[key]
+        rows.discard(row)
+        if rows:
+            return
+        del self._key_rows[key]
+        for trigram in trigrams(key):
+            self._trigram_keys[trigram].discard(key)
+        if self._sorted_keys is not None:
+            del self._sorted_keys[bisect_left(self._sorted_keys, key)]
+
+
+class EdlIndex:
+    """Search and sort indexes of the events shown in the EDL table."""
+
+    def __init__(self):
+        """Initialize the EdlIndex instance."""
+        self.events = []
+        self._fields = {}
+        # Keys of fields whose index is created in build steps.
+        self._partial_keys = {}
+
+    def set_events(self, events):
+        """Replace the indexed events.
+
+        Args:
+            events (list): EDL Events, one per row.
+
+        """
+        self.events = list(events)
+        self._fields = {}
+        self._partial_keys = {}
+
+    def append_events(self, events):
+        """Index appended events.
+
+        Args:
+            events (list): EDL Events of the new rows.
+
+        """
+        self.events.extend(events)
+        for field, field_index in self._fields.items():
+            field_index.append([field_key(event, field) for event in events])
+
+    def update_rows(self, rows, fields=None):
+        """Index the changed values of the given rows again.
+
+        Args:
+            rows (iterable): Changed rows.
+            fields (list): Changed fields, defaults to all fields.
+
+        """
+        rows = list(rows)
+        for field_index in self._changed_fields(fields):
+            field = field_index.field
+            for row in rows:
+                field_index.update(row, field_key(self.events[row], field))
+        for field, keys in self._partial_keys.items():
+            if fields is None or field in fields:
+                for row in rows:
+                    if row < len(keys):
+                        keys[row] = field_key(self.events[row], field)
+
+    def update_all(self, fields=None):
+        """Index the changed values of all rows again.
+
+        Only rows whose key changed touch the trigrams and sorted keys, so
+        batch operations that change few values stay cheap.
+
+        Args:
+            fields (list): Changed fields, defaults to all fields.
+
+        """
+        for field_index in self._changed_fields(fields):
+            field = field_index.field
+            field_index.set_keys(
+                [field_key(event, field) for event in self.events]
+            )
+        # Partly collected keys are collected again by the next build steps.
+        for field in list(self._partial_keys):
+            if fields is None or field in fields:
+                del self._partial_keys[field]
+
+    def build_step(self, max_rows):
+        """Build a part of the indexes of all fields.
+
+        Lets the GUI build the indexes while it is idle, so the first search
+        does not have to.
+
+        Args:
+            max_rows (int): Maximum number of rows to index in this step.
+
+        Returns:
+            bool: True if all indexes are built.
+
+        """
+        for field in TEXT_FIELDS + [CDL_FIELD, ALL_TEXT_FIELD]:
+            field_index = self._fields.get(field)
+            if field_index is None:
+                if field == ALL_TEXT_FIELD:
+                    # Joined from the keys of the text fields at once.
+                    self.field(field)
+                    return False
+                keys = self._partial_keys.setdefault(field, [])
+                first_row = len(keys)
+                last_row = first_row + max_rows
+                events = self.events[first_row:last_row]
+                keys.extend(field_key(event, field) for event in events)
+                if len(keys) == len(self.events):
+                    self.field(field)
+                return False
+            if not field_index.is_built:
+                field_index.build(max_rows)
+                return False
+        return True
+
+    def field(self, field):
+        """Return the index of the field, creating it on first use.
+
+        Args:
+            field (str): One of TEXT_FIELDS, ALL_TEXT_FIELD or CDL_FIELD.
+
+        Returns:
+            FieldIndex: Index of the field.
+
+        """
+        field_index = self._fields.get(field)
+        if field_index is not None:
+            return field_index
+        keys = self._partial_keys.pop(field, [])
+        if field == ALL_TEXT_FIELD and all(
+            text_field in self._fields for text_field in TEXT_FIELDS
+        ):
+            keys = list(
+                map(
+                    "\n".join,
+                    zip(*(self._fields[name].keys for name in TEXT_FIELDS)),
+                )
+            )
+        first_row = len(keys)
+        keys.extend(
+            field_key(event, field) for event in self.events[first_row:]
+        )
+        field_index = FieldIndex(field, keys, field != ALL_TEXT_FIELD)
+        self._fields[field] = field_index
+        return field_index
+
+    def filter_rows(self, query="", fields=None, has_cdl=None):
+        """Return the rows matching the search.
+
+        Args:
+            query (str): Text to search for, case insensitive. An empty query
+                matches all rows.
+            fields (list): Searched fields, defaults to TEXT_FIELDS. A row
+                matches if any of the fields contains the query.
+            has_cdl (bool): Only rows with (True) or without (False) CDL
+                values. None matches all rows.
+
+        Returns:
+            list: Matching rows in row order or None if all rows match.
+
+        """
+        rows = None
+        query = query.lower()
+        if query:
+            if fields is None or len(fields) > 1:
+                # Searching the joined fields replaces merging the results.
+                rows = [
+                    row
+                    for row in self.field(ALL_TEXT_FIELD).search(query)
+                    if fields is None
+                    or any(
+                        query in self.field(field).keys[row]
+                        for field in fields
+                    )
+                ]
+            else:
+                rows = self.field(fields[0]).search(query)
+        if has_cdl is not None:
+            cdl_keys = self.field(CDL_FIELD).keys
+            cdl_key = "1" if has_cdl else "0"
+            if rows is None:
+                rows = range(len(cdl_keys))
+            rows = [row for row in rows if cdl_keys[row] == cdl_key]
+        return rows
+
+    def sorted_rows(self, field, rows=None, descending=False):
+        """Return the rows sorted by the field.
+
+        Args:
+            field (str): One of TEXT_FIELDS or CDL_FIELD.
+            rows (list): Rows to sort, defaults to all rows.
+            descending (bool): Sort in descending order.
+
+        Returns:
+            list: Sorted rows, rows with equal keys stay in row order.
+
+        """
+        ordered = self.field(field).sorted_rows()
+        if rows is not None:
+            shown = set(rows)
+            ordered = [row for row in ordered if row in shown]
+        if descending:
+            # Sorting is stable in reverse too, equal keys keep row order.
+            keys = self.field(field).keys
+            ordered = sorted(ordered, key=keys.__getitem__, reverse=True)
+        return ordered
+
+    def _changed_fields(self, fields):
+        """Return the created field indexes affected by the changed fields.
+
+        Args:
+            fields (list): Changed fields, None for all fields.
+
+        Returns:
+            list: FieldIndex instances to update.
+
+        """
+        if fields is not None and any(
+            field in TEXT_FIELDS for field in fields
+        ):
+            fields = list(fields) + [ALL_TEXT_FIELD]
+        return [
+            field_index
+            for field, field_index in self._fields.items()
+            if fields is None or field in fields
+        ]
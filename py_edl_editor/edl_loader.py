@@ -0,0 +1,120 @@
+"""Background loading of EDLs for the GUI."""
+
+# Import built-in modules
+import os
+
+# Import third-party modules
+from PySide2 import QtCore  # type: ignore
+from edl import List  # type: ignore
+
+# Import local modules
+from py_edl_editor.edl_cache import EdlSnapshot
+from py_edl_editor.edl_parser import iter_edl_events
+from py_edl_editor.edl_parser import iter_file_lines
+from py_edl_editor.timeline import Timeline
+
+# Events per streamed chunk. Small enough that the first rows show up
+# right away, large enough to keep the per-chunk table updates cheap.
+LOAD_CHUNK_SIZE = 500
+
+
+class LoadCancelled(Exception):
+    """Raised inside the loader thread when loading was cancelled."""
+
+
+# pylint: disable=too-few-public-methods
+class EdlLoader(QtCore.QThread):
+    """Thread parsing an EDL and streaming its events in chunks.
+
+    All signals pass the loader itself first, so receivers can ignore
+    signals of a loader that was replaced or cancelled in the meantime.
+
+    """
+
+    # Loader and list of parsed EDL Events in EDL order.
+    events_parsed = QtCore.Signal(object, list)
+    # Loader and loaded percentage of the EDL file.
+    progress = QtCore.Signal(object, int)
+    # Loader and the EDL, or None if loading failed or was cancelled.
+    loaded = QtCore.Signal(object, object)
+
+    # pylint: disable=super-with-arguments
+    def __init__(self, edl_path, fps, edl_cache, compact=False):
+        """Initialize the EdlLoader instance.
+
+        Args:
+            edl_path (str): Absoulte path to EDL.
+            fps (str): Frame Rate for EDL calculations.
+            edl_cache (py_edl_editor.edl_cache.EdlCache): Cache of parsed
+                EDLs used and filled by the loader.
+            compact (bool): Load a Timeline instead of an edl.List.
+
+        """
+        super(EdlLoader, self).__init__()
+        self.edl_path = edl_path
+        self.fps = fps
+        self.edl_cache = edl_cache
+        self.compact = compact
+        self._cancelled = False
+        self._streamed_edl = None
+
+    def cancel(self):
+        """Stop loading after the current chunk."""
+        self._cancelled = True
+
+    def run(self):
+        """Load the EDL, called in the loader thread by start."""
+        edl = None
+        try:
+            edl = self.edl_cache.get(
+                self.edl_path, self.fps, self.compact, self._parse
+            )
+        except LoadCancelled:
+            pass
+        except (IOError, ValueError) as error:
+            print("Cant load EDL File: {0}".format(error))
+        else:
+            if edl is not None and edl is not self._streamed_edl:
+                # Cache hits are complete right away.
+                self.events_parsed.emit(self, list(edl.events))
+        if self._cancelled:
+            edl = None
+        self.progress.emit(self, 100)
+        self.loaded.emit(self, edl)
+
+    def _parse(self, edl_path, fps, compact):
+        """Parse the EDL file, emitting the events chunk by chunk.
+
+        Every chunk is added to the snapshot before it is emitted, as the
+        emitted events may be edited while the file is still parsed.
+
+        Args:
+            edl_path (str): Absoulte path to EDL.
+            fps (str): Frame Rate for EDL calculations.
+            compact (bool): Return a Timeline instead of an edl.List.
+
+        Returns:
+            EdlSnapshot: Snapshot of the parsed EDL (edl.List or
+                Timeline).
+
+        """
+        edl = Timeline(fps) if compact else List(fps)
+        self._streamed_edl = edl
+        snapshot = EdlSnapshot(edl)
+        file_size = max(os.path.getsize(edl_path), 1)
+        read_size = [0]
+
+        def counted(lines):
+            """Yield the lines, counting the read characters."""
+            for line in lines:
+                read_size[0] += len(line)
+                yield line
+
+        lines = counted(iter_file_lines(edl_path))
+        for events in iter_edl_events(edl, lines, LOAD_CHUNK_SIZE):
+            if self._cancelled:
+                raise LoadCancelled()
+            snapshot.add_events(events)
+            self.events_parsed.emit(self, events)
+            self.progress.emit(self, 100 * read_size[0] // file_size)
+        return snapshot
@@ -1,83 +1,350 @@
 """EDL parser."""
 
 # Import built-in modules
+import locale
+import mmap
 import os
 import re
 
 # Import third-party modules
-from edl import Parser  # type: ignore
+from edl import Cut, Dissolve, Event, Key, List, Timewarp, Wipe  # type: ignore
 from cdl_convert import correction  # type: ignore
+from timecode import Timecode  # type: ignore
 
+# Import local modules
+from py_edl_editor.cdl_store import CdlStore
+from py_edl_editor.edl_comments import CLIP_NAME_SLOT
+from py_edl_editor.edl_comments import LOCATOR_SLOT
+from py_edl_editor.edl_comments import SAT_SLOT
+from py_edl_editor.edl_comments import SOP_SLOT
+from py_edl_editor.edl_comments import SOURCE_FILE_SLOT
+from py_edl_editor.edl_comments import add_comment
+from py_edl_editor.timeline import Timeline
 
-def parse_edl(edl_path, fps):
+# Patterns are compiled once at import time and shared by all parse calls.
+# The event and comment patterns mirror the matchers of the edl library, so
+# the single-pass parser produces the same events as edl.Parser.
+_TC = r"\d{1,2}:\d{1,2}:\d{1,2}[:;]\d{1,3}"
+EVENT_PATTERN = re.compile(
+    r"(\d+)\s+(\S+)\s+(\S+)\s+(\S+)\s+(\S*)\s+"
+    r"({0})\s+({0})\s+({0})\s+({0})".format(_TC)
+)
+TITLE_PATTERN = re.compile(r"TITLE: (.+)")
+COMMENT_PATTERN = re.compile(r"\*\s*(.+)")
+CLIP_NAME_PATTERN = re.compile(
+    r"\*(?:\s*FROM CLIP NAME:|\s+FROM\s+CLIP\s+NAME:)\s+(.+)"
+)
+SOURCE_FILE_PATTERN = re.compile(r"\*\s*SOURCE FILE:\s+(.+)")
+EFFECT_PATTERN = re.compile(r"EFFECTS NAME IS\s+(.+)")
+TIMEWARP_PATTERN = re.compile(
+    r"M2\s+(\w+)\s+(\-*\d+\.\d+)\s+(\d+:\d+:\d+[\:\;]\d+)"
+)
+LINE_BREAK_PATTERN = re.compile(r"\r\n?")
+TC_KEYS = ["src_start_tc", "src_end_tc", "rec_start_tc", "rec_end_tc"]
+WIPE_PATTERN = re.compile(r"W\d+")
+# https://regex101.com/r/3F8NQd/1
+SOP_PATTERN = re.compile(
+    r"[*]\s?ASC_SOP\s?[(]\s?"
+    r"(?P<slope_red>[-]?\d+([.]\d+)?)\s+"
+    r"(?P<slope_green>[-]?\d+([.]\d+)?)\s+"
+    r"(?P<slope_blue>[-]?\d+([.]\d+)?)\s?[)]\s?[(]\s?"
+    r"(?P<offset_red>[-]?\d+([.]\d+)?)\s+"
+    r"(?P<offset_green>[-]?\d+([.]\d+)?)\s+"
+    r"(?P<offset_blue>[-]?\d+([.]\d+)?)\s?[)]\s?[(]\s?"
+    r"(?P<power_red>[-]?\d+([.]\d+)?)\s+"
+    r"(?P<power_green>[-]?\d+([.]\d+)?)\s+"
+    r"(?P<power_blue>[-]?\d+([.]\d+)?)\s?[)]\s?"
+)
+SAT_PATTERN = re.compile(
+    r"[*]\s?ASC_SAT\s?\s?(?P<saturation>[-]?\d+([.]\d+)?)"
+)
+# https://regex101.com/r/b8QOPl/1
+LOC_PATTERN = re.compile(
+    r"[*]\s?LOC:\s+?"
+    r"(?P<timecode>\d{2}[:]\d{2}[:]\d{2}[:]\d{2})\s+"
+    r"(?P<color>[\S+]*)\s+"
+    r"(?P<name>.*)"
+)
+
+
+def parse_edl(edl_path, fps, compact=False):
     """Parse EDL and return list  with EDL Events.
 
+    The file is streamed line by line from a memory map and every line is
+    tokenized exactly once: event lines, clip name, source file, ASC_SOP,
+    ASC_SAT and LOC comments are all handled in the same pass.
+
     Args:
         edl_path (str): Absoulte path to EDL.
         fps (float): Frame Rate for EDL calculations.
+        compact (bool): Return a Timeline storing timecodes as integer frame
+            columns instead of an edl.List with Timecode instances.
 
     Returns:
-        Edl: EDL instance.
+        Edl: EDL instance (edl.List or Timeline).
 
     """
     edl = None
-    parser = Parser(fps)
-    # Clear members, so the ids are empty and no unique ids are created.
-    correction.ColorCorrection.members = {}
     if os.path.isfile(edl_path):
-        with open(edl_path) as edl_file:
-            edl = parser.parse(edl_file)
-            for event in edl.events:
-                event.cdl = correction.ColorCorrection(event.reel)
-                event.has_locator = False
-                if event.comments:
-                    for comment in event.comments:
-                        if "ASC_SOP" in comment:
-                            add_sop(event.cdl, comment)
-                        if "ASC_SAT" in comment:
-                            add_sat(event.cdl, comment)
-                        if "LOC: " in comment:
-                            add_avid_locator(event, comment)
+        edl = parse_edl_lines(iter_file_lines(edl_path), fps, compact)
     return edl
 
 
-def add_sop(cdl, comment):
-    """Add SOP values to the cdl instance.
+def iter_file_lines(file_path):
+    """Yield the text lines of the file through a read-only memory map.
+
+    The file is never read into memory as a whole, the OS pages it in as
+    the lines are consumed. Lines are decoded like open() does and, as in
+    text mode, CRLF and CR line breaks are read as a single newline.
+
+    Args:
+        file_path (str): Path of the text file.
+
+    Yields:
+        str: The lines of the file.
+
+    """
+    encoding = locale.getpreferredencoding(False)
+    with open(file_path, "rb") as text_file:
+        if not os.fstat(text_file.fileno()).st_size:
+            # Empty files can not be mapped.
+            return
+        with mmap.mmap(
+            text_file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as mapped_file:
+            for raw_line in iter(mapped_file.readline, b""):
+                line = raw_line.decode(encoding)
+                if "\r" not in line:
+                    yield line
+                    continue
+                parts = LINE_BREAK_PATTERN.sub("\n", line).split("\n")
+                for part in parts[:-1]:
+                    yield "{0}\n".format(part)
+                if parts[-1]:
+                    yield parts[-1]
+
+
+def parse_edl_lines(lines, fps, compact=False):
+    """Parse the given EDL lines in a single pass.
+
+    Args:
+        lines (iterable): Iterable of EDL text lines, e.g. an open file.
+        fps (float): Frame Rate for EDL calculations.
+        compact (bool): Return a Timeline instead of an edl.List.
+
+    Returns:
+        Edl: EDL instance (edl.List or Timeline).
+
+    """
+    edl = Timeline(fps) if compact else List(fps)
+    for _ in iter_edl_events(edl, lines, chunk_size=None):
+        pass
+    return edl
+
+
+def iter_edl_events(edl, lines, chunk_size=1000):
+    """Parse the given EDL lines into the EDL, yielding completed events.
+
+    An event is complete once the next event line or the end of the lines
+    is reached, as its comments follow the event line.
+
+    Args:
+        edl (Edl): Empty EDL instance (edl.List or Timeline) to parse into.
+        lines (iterable): Iterable of EDL text lines, e.g. an open file.
+        chunk_size (int): Number of completed events per yielded list. If
+            None, all events are yielded at the end.
+
+    Yields:
+        list: Completed EDL Events in EDL order.
+
+    """
+    event = None
+    yielded = 0
+    # Clear members, so the ids are empty and no unique ids are created.
+    correction.ColorCorrection.members = {}
+    # The CDL of an event is created once its grade comments are read.
+    cdl_store = CdlStore()
+    grade = {}
+    for line in lines:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        first_char = stripped[0]
+        if first_char.isdigit():
+            new_event = _parse_event_line(edl, stripped, event)
+            if new_event:
+                if event:
+                    event.cdl = cdl_store.get(event.reel, **grade)
+                    grade = {}
+                event = new_event
+                completed = len(edl.events) - 1
+                if chunk_size and completed - yielded >= chunk_size:
+                    yield edl.events[yielded:completed]
+                    yielded = completed
+                continue
+        if first_char == "*":
+            if event:
+                _parse_comment_line(event, line, grade)
+        elif stripped.startswith("TITLE:"):
+            match = TITLE_PATTERN.search(stripped)
+            if match:
+                edl.title = match.group(1).strip()
+        elif stripped.startswith("M2") and event:
+            _parse_timewarp_line(event, stripped, edl.fps)
+        if event and "EFFECTS NAME IS" in line:
+            match = EFFECT_PATTERN.search(line)
+            if match and event.transition:
+                event.transition.effect = match.group(1).strip()
+    if event:
+        event.cdl = cdl_store.get(event.reel, **grade)
+    if len(edl.events) > yielded:
+        yield edl.events[yielded:]
+
+
+def _parse_event_line(edl, line, previous_event):
+    """Append a new event for the given event line to the EDL.
+
+    Args:
+        edl (Edl): EDL instance (edl.List or Timeline) to append to.
+        line (str): Stripped EDL line starting with a digit.
+        previous_event (Edl.event): Last parsed event or None.
+
+    Returns:
+        Edl.event: New event instance or None if the line is no event line.
+
+    """
+    match = EVENT_PATTERN.search(line)
+    if not match:
+        return None
+    num, reel, track, tr_code, aux = match.groups()[:5]
+    fields = {
+        "num": num,
+        "reel": reel,
+        "track": track,
+        "tr_code": tr_code,
+        "aux": aux,
+    }
+    timecodes = match.groups()[5:]
+    if isinstance(edl, Timeline):
+        event = edl.add_event(fields, *map(edl.frames, timecodes))
+    else:
+        for key, smpte in zip(TC_KEYS, timecodes):
+            fields[key] = Timecode(edl.fps, smpte)
+        event = Event(fields)
+        edl.events.append(event)
+    event.transition = transition_for_code(tr_code)
+    if tr_code == "C" and previous_event:
+        previous_event.next_event = event
+    event.cdl = None
+    event.has_locator = False
+    return event
+
+
+def transition_for_code(tr_code):
+    """Return the transition instance for the given transition code.
+
+    Args:
+        tr_code (str): Transition code of the event line.
+
+    Returns:
+        edl.Effect: Transition instance or None for unknown codes.
+
+    """
+    if tr_code == "C":
+        return Cut()
+    if tr_code == "D":
+        return Dissolve()
+    if WIPE_PATTERN.match(tr_code):
+        return Wipe()
+    if tr_code == "K":
+        return Key()
+    return None
+
+
+def _parse_comment_line(event, line, grade):
+    """Add the comment line to the event and evaluate known comment types.
+
+    The comment is classified once and indexed by its slot.
+
+    Args:
+        event (Edl.event): Event the comment belongs to.
+        line (str): Unstripped EDL comment line.
+        grade (dict): SOP and SAT values of the event, updated in place.
+
+    """
+    match = COMMENT_PATTERN.search(line)
+    if not match:
+        return
+    comment = "* {0}".format(match.group(1))
+    slot = add_comment(event, comment)
+    if slot == CLIP_NAME_SLOT:
+        clip_name = CLIP_NAME_PATTERN.search(line)
+        if clip_name:
+            event.clip_name = clip_name.group(1).strip()
+    elif slot == SOURCE_FILE_SLOT:
+        source_file = SOURCE_FILE_PATTERN.search(line)
+        if source_file:
+            event.source_file = source_file.group(1).strip()
+    elif slot == SOP_SLOT:
+        grade.update(sop_values(comment))
+        if "ASC_SAT" in comment:
+            grade["sat"] = sat_value(comment)
+    elif slot == SAT_SLOT:
+        grade["sat"] = sat_value(comment)
+    elif slot == LOCATOR_SLOT and "LOC: " in comment:
+        add_avid_locator(event, comment)
+
+
+def _parse_timewarp_line(event, line, fps):
+    """Add the timewarp of a M2 line to the event.
+
+    Args:
+        event (Edl.event): Event the timewarp belongs to.
+        line (str): Stripped M2 line.
+        fps (float): Frame Rate for EDL calculations.
+
+    """
+    match = TIMEWARP_PATTERN.search(line)
+    if match:
+        reel, warp_fps, timecode = match.groups()
+        event.timewarp = Timewarp(reel, warp_fps, timecode, fps)
+        if float(warp_fps) < 0:
+            event.timewarp.reverse = True
+
+
+def sop_values(comment):
+    """Return the SOP values of the comment.
 
     Args:
-        cdl (cdl_convert.Correction): Correction instance.
         comment (str): EDL Event comment containing the SOP values.
 
+    Returns:
+        dict: RGB tuples of the slope, offset and power strings.
+
     """
-    # https://regex101.com/r/3F8NQd/1
-    sop_filter = (
-        r"[*]\s?ASC_SOP\s?[(]\s?"
-        r"(?P<slope_red>[-]?\d+([.]\d+)?)\s+"
-        r"(?P<slope_green>[-]?\d+([.]\d+)?)\s+"
-        r"(?P<slope_blue>[-]?\d+([.]\d+)?)\s?[)]\s?[(]\s?"
-        r"(?P<offset_red>[-]?\d+([.]\d+)?)\s+"
-        r"(?P<offset_green>[-]?\d+([.]\d+)?)\s+"
-        r"(?P<offset_blue>[-]?\d+([.]\d+)?)\s?[)]\s?[(]\s?"
-        r"(?P<power_red>[-]?\d+([.]\d+)?)\s+"
-        r"(?P<power_green>[-]?\d+([.]\d+)?)\s+"
-        r"(?P<power_blue>[-]?\d+([.]\d+)?)\s?[)]\s?"
-    )
-    sop = re.search(sop_filter, comment).groupdict()
-    cdl.slope = (sop["slope_red"], sop["slope_green"], sop["slope_blue"])
-    cdl.offset = (sop["offset_red"], sop["offset_green"], sop["offset_blue"])
-    cdl.power = (sop["power_red"], sop["power_green"], sop["power_blue"])
-
-
-def add_sat(cdl, comment):
-    """Add SAT values to the cdl instance.
+    sop = SOP_PATTERN.search(comment).groupdict()
+    return {
+        "slope": (sop["slope_red"], sop["slope_green"], sop["slope_blue"]),
+        "offset": (
+            sop["offset_red"],
+            sop["offset_green"],
+            sop["offset_blue"],
+        ),
+        "power": (sop["power_red"], sop["power_green"], sop["power_blue"]),
+    }
+
+
+def sat_value(comment):
+    """Return the SAT value of the comment.
 
     Args:
-        cdl (cdl_convert.Correction): Correction instance.
         comment (str): EDL Event comment containing the SAT value.
 
+    Returns:
+        str: Saturation.
+
     """
-    sat_filter = r"[*]\s?ASC_SAT\s?\s?(?P<saturation>[-]?\d+([.]\d+)?)"
-    cdl.sat = re.search(sat_filter, comment).groupdict()["saturation"]
+    return SAT_PATTERN.search(comment).groupdict()["saturation"]
 
 
 def add_avid_locator(event, comment):
@@ -88,15 +355,8 @@ def add_avid_locator(event, comment):
         comment (str): EDL Event comment containing the Avid Locator values.
 
     """
-    # https://regex101.com/r/b8QOPl/1
-    loc_filter = (
-        r"[*]\s?LOC:\s+?"
-        r"(?P<timecode>\d{2}[:]\d{2}[:]\d{2}[:]\d{2})\s+"
-        r"(?P<color>[\S+]*)\s+"
-        r"(?P<name>.*)"
-    )
     try:
-        locator_dict = re.search(loc_filter, comment).groupdict()
+        locator_dict = LOC_PATTERN.search(comment).groupdict()
         event.loc_tc = locator_dict["timecode"]
         event.loc_color = locator_dict["color"]
         event.loc_name = locator_dict["name"]
@@ -5,6 +5,34 @@ from PySide2 import QtCore
 from PySide2 import QtGui
 from PySide2 import QtWidgets
 
+# Import local modules
+from py_edl_editor.edl_comments import mark_dirty
+from py_edl_editor.edl_index import CDL_FIELD
+from py_edl_editor.edl_index import CLIP_NAME_FIELD
+from py_edl_editor.edl_index import EdlIndex
+from py_edl_editor.edl_index import LOCATOR_FIELD
+from py_edl_editor.edl_index import REEL_FIELD
+from py_edl_editor.edl_index import SOURCE_FILE_FIELD
+from py_edl_editor.tc_tools import event_range_index
+
+REEL_COLUMN = 1
+CLIP_NAME_COLUMN = 2
+SOURCE_FILE_COLUMN = 3
+CDL_COLUMN = 4
+LOCATOR_COLUMN = 5
+TIMECODE_COLUMNS = [6, 7, 8, 9]
+# Indexed event field shown in the column.
+COLUMN_FIELDS = {
+    REEL_COLUMN: REEL_FIELD,
+    CLIP_NAME_COLUMN: CLIP_NAME_FIELD,
+    SOURCE_FILE_COLUMN: SOURCE_FILE_FIELD,
+    CDL_COLUMN: CDL_FIELD,
+    LOCATOR_COLUMN: LOCATOR_FIELD,
+}
+# Timecode ranges the table can be navigated by.
+REC_TC = ("rec_start_tc", "rec_end_tc")
+SRC_TC = ("src_start_tc", "src_end_tc")
+
 
 class EditableDelegate(QtWidgets.QItemDelegate):
     """Delegate class that enables the cell to be editable."""
@@ -56,20 +84,174 @@ class EdlTable(QtCore.QAbstractTableModel):
         "Rec\nDuration",
         "",
     ]
+    # Emitted with the event, attribute name, old and new value after a
+    # cell edit, so the edit can be recorded for undo.
+    event_edited = QtCore.Signal(object, str, object, object)
 
     # pylint: disable=super-with-arguments
     def __init__(self):
         """Initialize the EdlTable instance."""
         super(EdlTable, self).__init__()
         self.events = []
-        self.show_frames = False
+        self._show_frames = False
+        # Display values per row, filled on the first DisplayRole query of a
+        # row and evicted whenever the row's event may have changed.
+        self._display_cache = {}
+        # Search and sort index, kept in sync with the events.
+        self.search_index = EdlIndex()
+        # Interval indexes per timecode range, built on the first lookup and
+        # dropped whenever timecodes change.
+        self._timecode_indexes = {}
+        self._comment_font = QtGui.QFont("Courier", 10)
+        self._timecode_font = QtGui.QFont("Courier", 12)
+
+    @property
+    def show_frames(self):
+        """bool: Show timecodes as frames instead of SMPTE strings."""
+        return self._show_frames
+
+    @show_frames.setter
+    def show_frames(self, value):
+        self._show_frames = value
+        self._display_cache.clear()
 
     def clear(self):
         """Clear the table."""
+        self.set_events([])
+
+    def set_events(self, events):
+        """Replace all rows of the table with a single model reset.
+
+        Args:
+            events (list): EDL Events, one per row.
+
+        """
         self.beginResetModel()
-        self.events = []
+        self.events = list(events)
+        self._display_cache.clear()
+        self.search_index.set_events(self.events)
+        self._timecode_indexes.clear()
         self.endResetModel()
 
+    def append_events(self, events):
+        """Append rows for the given events with a single row insertion.
+
+        Args:
+            events (list): EDL Events, one per row.
+
+        """
+        if not events:
+            return
+        first_row = len(self.events)
+        self.beginInsertRows(
+            QtCore.QModelIndex(), first_row, first_row + len(events) - 1
+        )
+        self.events.extend(events)
+        self.search_index.append_events(events)
+        self._timecode_indexes.clear()
+        self.endInsertRows()
+
+    def refresh_columns(self, columns, first_row=0, last_row=None):
+        """Notify the views that values of the given columns were changed.
+
+        Emits a single dataChanged signal spanning the given rows and
+        columns, so views only repaint the affected visible cells.
+
+        Args:
+            columns (list): Indexes of the changed columns.
+            first_row (int): First changed row.
+            last_row (int): Last changed row, defaults to the last row.
+
+        """
+        if not self.events:
+            return
+        if last_row is None:
+            last_row = self.rowCount() - 1
+        fields = [
+            COLUMN_FIELDS[col] for col in columns if col in COLUMN_FIELDS
+        ]
+        if any(col in TIMECODE_COLUMNS for col in columns):
+            self._timecode_indexes.clear()
+        if first_row == 0 and last_row == self.rowCount() - 1:
+            self._display_cache.clear()
+            if fields:
+                self.search_index.update_all(fields)
+        else:
+            for row in range(first_row, last_row + 1):
+                self._display_cache.pop(row, None)
+            if fields:
+                self.search_index.update_rows(
+                    range(first_row, last_row + 1), fields
+                )
+        self.dataChanged.emit(
+            self.index(first_row, min(columns)),
+            self.index(last_row, max(columns)),
+        )
+
+    def row_at_timecode(self, frames, timecode_range=REC_TC):
+        """Return the row of the event at the given frames.
+
+        Source ranges of all reels share one index, so for SRC_TC the first
+        event whose range contains the frames is returned. Otherwise, and if
+        no source range contains the frames, it is the event with the last
+        start at or before the frames, so a frame in a gap resolves to the
+        event before the gap.
+
+        Args:
+            frames (int): Frames as used by Timecode.frames.
+            timecode_range (tuple): REC_TC or SRC_TC.
+
+        Returns:
+            int: Row of the event or None if the table is empty.
+
+        """
+        index = self._timecode_indexes.get(timecode_range)
+        if index is None:
+            index = event_range_index(self.events, *timecode_range)
+            self._timecode_indexes[timecode_range] = index
+        if timecode_range == SRC_TC:
+            row = index.row_at(frames)
+            if row is not None:
+                return row
+        return index.nearest_row(frames)
+
+    def column_font(self, column):
+        """Return the font used for the given column.
+
+        Args:
+            column (int): Column index.
+
+        Returns:
+            QtGui.QFont: Column font or None for the default font.
+
+        """
+        if column in [CDL_COLUMN, LOCATOR_COLUMN]:
+            return self._comment_font
+        if column in TIMECODE_COLUMNS:
+            return self._timecode_font
+        return None
+
+    def column_line_counts(self):
+        """Return the number of text lines of the multi-line columns.
+
+        Only checks whether any event has a CDL or a locator, so no display
+        strings are built.
+
+        Returns:
+            dict: Maximum number of lines per column index.
+
+        """
+        has_cdl = any(
+            event.cdl.has_sop and event.cdl.has_sat for event in self.events
+        )
+        has_locator = any(event.has_locator for event in self.events)
+        return {
+            CDL_COLUMN: 4 if has_cdl else 1,
+            LOCATOR_COLUMN: 3 if has_locator else 1,
+            TIMECODE_COLUMNS[0]: 2,
+            TIMECODE_COLUMNS[1]: 2,
+        }
+
     # pylint: disable=invalid-name,unused-argument
     def rowCount(self, index=QtCore.QModelIndex()):
         """Return the tables number of rows.
@@ -130,13 +312,16 @@ class EdlTable(QtCore.QAbstractTableModel):
 
         """
         if role == QtCore.Qt.DisplayRole:
-            return self._return_items_role_data(index)
+            row = index.row()
+            try:
+                row_data = self._display_cache[row]
+            except KeyError:
+                row_data = self._row_display_data(self.events[row])
+                self._display_cache[row] = row_data
+            return row_data[index.column()]
 
-        if role == QtCore.Qt.FontRole and index.column() in [4, 5]:
-            return QtGui.QFont("Courier", 10)
-
-        if role == QtCore.Qt.FontRole and index.column() in [6, 7, 8, 9]:
-            return QtGui.QFont("Courier", 12)
+        if role == QtCore.Qt.FontRole:
+            return self.column_font(index.column())
 
     # pylint: disable=invalid-name,unused-argument
     def setData(self, index, value, role):
@@ -148,10 +333,21 @@ class EdlTable(QtCore.QAbstractTableModel):
             role (int): QtCore Role.
 
         """
-        if index.column() == 1:
-            self.events[index.row()].reel = value
-        if index.column() == 2:
-            self.events[index.row()].clip_name = value
+        attribute = {REEL_COLUMN: "reel", CLIP_NAME_COLUMN: "clip_name"}.get(
+            index.column()
+        )
+        if attribute:
+            event = self.events[index.row()]
+            old_value = getattr(event, attribute)
+            setattr(event, attribute, value)
+            if old_value != value:
+                mark_dirty(event, attribute)
+                self.search_index.update_rows(
+                    [index.row()], [COLUMN_FIELDS[index.column()]]
+                )
+                self.event_edited.emit(event, attribute, old_value, value)
+        self._display_cache.pop(index.row(), None)
+        self.dataChanged.emit(index, index)
         return True
 
     # pylint: disable=no-self-use
@@ -185,6 +381,9 @@ class EdlTable(QtCore.QAbstractTableModel):
             QtCore.QModelIndex(), self.rowCount(), self.rowCount()
         )  # noqa: E501
         self.events.append(event)
+        self._display_cache.pop(len(self.events) - 1, None)
+        self.search_index.append_events([event])
+        self._timecode_indexes.clear()
         self.endInsertRows()
 
     def edl_events(self):
@@ -197,40 +396,33 @@ class EdlTable(QtCore.QAbstractTableModel):
         """
         return [event.edl_event for event in self.events]
 
-    # pylint: disable=too-many-return-statements
-    def _return_items_role_data(self, index):
-        """Return table data for items role.
+    def _row_display_data(self, edl_event):
+        """Return the display values of all columns for the given event.
 
         Args:
-            index (PySide.QtCore.QModelIndex): Qt QModel index instance.
-
-        """
-        col = index.column()
-        edl_event = self.events[index.row()]
-        if col == 0:
-            return edl_event.num
-        if col == 1:
-            return edl_event.reel
-        if col == 2:
-            return edl_event.clip_name
-        if col == 3:
-            return edl_event.source_file
-        if col == 4:
-            return self._cdl_string(edl_event.cdl)
-        if col == 5:
-            return self._locator_string(edl_event)
-        if col == 6:
-            src_start = self._timecode_string(edl_event.src_start_tc)
-            src_end = self._timecode_string(edl_event.src_end_tc)
-            return "{0}\n{1}".format(src_start, src_end)
-        if col == 7:
-            rec_start = self._timecode_string(edl_event.rec_start_tc)
-            rec_end = self._timecode_string(edl_event.rec_end_tc)
-            return "{0}\n{1}".format(rec_start, rec_end)
-        if col == 8:
-            return (edl_event.src_end_tc - edl_event.src_start_tc).frames
-        if col == 9:
-            return (edl_event.rec_end_tc - edl_event.rec_start_tc).frames
+            edl_event (Edl.event): EDL Event shown in the row.
+
+        Returns:
+            list: Display value per column.
+
+        """
+        src_start = self._timecode_string(edl_event.src_start_tc)
+        src_end = self._timecode_string(edl_event.src_end_tc)
+        rec_start = self._timecode_string(edl_event.rec_start_tc)
+        rec_end = self._timecode_string(edl_event.rec_end_tc)
+        return [
+            edl_event.num,
+            edl_event.reel,
+            edl_event.clip_name,
+            edl_event.source_file,
+            self._cdl_string(edl_event.cdl),
+            self._locator_string(edl_event),
+            "{0}\n{1}".format(src_start, src_end),
+            "{0}\n{1}".format(rec_start, rec_end),
+            (edl_event.src_end_tc - edl_event.src_start_tc).frames,
+            (edl_event.rec_end_tc - edl_event.rec_start_tc).frames,
+            None,
+        ]
 
     def _cdl_string(self, cdl):
         """Return a human readable CDL string.
@@ -281,3 +473,288 @@ class EdlTable(QtCore.QAbstractTableModel):
         if self.show_frames:
             return str(timecode.frame_number)
         return str(timecode)
+
+
+class EdlFilterModel(QtCore.QAbstractProxyModel):
+    """Proxy filtering and sorting the EDL table through its search index.
+
+    Unlike a QSortFilterProxyModel, filtering and sorting never query the
+    display data of the rows: the matching rows and their order come from
+    the EdlIndex of the source table. Without a search or sorting the proxy
+    maps rows one to one.
+
+    """
+
+    # pylint: disable=super-with-arguments
+    def __init__(self):
+        """Initialize the EdlFilterModel instance."""
+        super(EdlFilterModel, self).__init__()
+        self.query = ""
+        self.search_fields = None
+        self.has_cdl = None
+        self._sort_column = 0
+        self._sort_order = QtCore.Qt.AscendingOrder
+        # Source row per proxy row, None while all rows are shown in EDL
+        # order. The proxy row per source row is built when first needed.
+        self._rows = None
+        self._proxy_rows = None
+
+    # pylint: disable=invalid-name
+    def setSourceModel(self, source_model):
+        """Set the EdlTable to filter and sort.
+
+        Args:
+            source_model (EdlTable): Source table.
+
+        """
+        self.beginResetModel()
+        super(EdlFilterModel, self).setSourceModel(source_model)
+        source_model.modelAboutToBeReset.connect(self.beginResetModel)
+        source_model.modelReset.connect(self._on_source_reset)
+        source_model.rowsAboutToBeInserted.connect(
+            self._on_rows_about_to_be_inserted
+        )
+        source_model.rowsInserted.connect(self._on_rows_inserted)
+        source_model.dataChanged.connect(self._on_source_data_changed)
+        self._set_rows(self._filtered_rows())
+        self.endResetModel()
+
+    @property
+    def is_filtered(self):
+        """bool: True if rows are hidden or not in EDL order."""
+        return self._rows is not None
+
+    def set_filter(self, query="", search_fields=None, has_cdl=None):
+        """Show only the rows matching the search.
+
+        Args:
+            query (str): Text to search for, case insensitive.
+            search_fields (list): Searched event fields, defaults to all
+                text fields.
+            has_cdl (bool): Only rows with (True) or without (False) CDL
+                values. None shows all rows.
+
+        """
+        self.query = query
+        self.search_fields = search_fields
+        self.has_cdl = has_cdl
+        self._apply()
+
+    def sort(self, column, order=QtCore.Qt.AscendingOrder):
+        """Sort the rows by an indexed column, other columns keep EDL order.
+
+        Args:
+            column (int): Column index.
+            order (QtCore.Qt.SortOrder): Sort order.
+
+        """
+        self._sort_column = column
+        self._sort_order = order
+        self._apply()
+
+    # pylint: disable=unused-argument
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        """Return the number of shown rows.
+
+        Args:
+            parent (QtCore.QModelIndex): Parent index, invalid for tables.
+
+        Returns:
+            int: Number of shown rows.
+
+        """
+        if parent.isValid():
+            return 0
+        if self._rows is None:
+            return self.sourceModel().rowCount()
+        return len(self._rows)
+
+    # pylint: disable=unused-argument
+    def columnCount(self, parent=QtCore.QModelIndex()):
+        """Return the number of columns of the source table.
+
+        Args:
+            parent (QtCore.QModelIndex): Parent index, invalid for tables.
+
+        Returns:
+            int: Number of columns.
+
+        """
+        return self.sourceModel().columnCount()
+
+    # pylint: disable=unused-argument
+    def index(self, row, column, parent=QtCore.QModelIndex()):
+        """Return the proxy index of the given row and column.
+
+        Args:
+            row (int): Proxy row.
+            column (int): Column index.
+            parent (QtCore.QModelIndex): Parent index, invalid for tables.
+
+        Returns:
+            QtCore.QModelIndex: Proxy index, invalid if out of range.
+
+        """
+        if parent.isValid() or not (
+            0 <= row < self.rowCount() and 0 <= column < self.columnCount()
+        ):
+            return QtCore.QModelIndex()
+        return self.createIndex(row, column)
+
+    # pylint: disable=no-self-use
+    def parent(self, index):
+        """Return the parent of the index, rows of a table have none.
+
+        Args:
+            index (QtCore.QModelIndex): Proxy index.
+
+        Returns:
+            QtCore.QModelIndex: Invalid index.
+
+        """
+        return QtCore.QModelIndex()
+
+    def mapToSource(self, proxy_index):
+        """Return the source index of the proxy index.
+
+        Args:
+            proxy_index (QtCore.QModelIndex): Proxy index.
+
+        Returns:
+            QtCore.QModelIndex: Index of the source table.
+
+        """
+        if not proxy_index.isValid():
+            return QtCore.QModelIndex()
+        row = proxy_index.row()
+        if self._rows is not None:
+            row = self._rows[row]
+        return self.sourceModel().index(row, proxy_index.column())
+
+    def mapFromSource(self, source_index):
+        """Return the proxy index of the source index.
+
+        Args:
+            source_index (QtCore.QModelIndex): Index of the source table.
+
+        Returns:
+            QtCore.QModelIndex: Proxy index, invalid if the row is hidden.
+
+        """
+        if not source_index.isValid():
+            return QtCore.QModelIndex()
+        row = source_index.row()
+        if self._rows is not None:
+            if self._proxy_rows is None:
+                self._proxy_rows = {
+                    row: proxy for proxy, row in enumerate(self._rows)
+                }
+            row = self._proxy_rows.get(row)
+            if row is None:
+                return QtCore.QModelIndex()
+        return self.createIndex(row, source_index.column())
+
+    def _filtered_rows(self):
+        """Return the shown source rows in display order.
+
+        Returns:
+            list: Source rows or None if all rows are shown in EDL order.
+
+        """
+        search_index = self.sourceModel().search_index
+        rows = search_index.filter_rows(
+            self.query, self.search_fields, self.has_cdl
+        )
+        descending = self._sort_order == QtCore.Qt.DescendingOrder
+        field = COLUMN_FIELDS.get(self._sort_column)
+        if field:
+            return search_index.sorted_rows(field, rows, descending)
+        if rows is None:
+            if not descending:
+                return None
+            rows = range(len(search_index.events))
+        # Filtered rows are in EDL order already.
+        return rows[::-1] if descending else rows
+
+    def _set_rows(self, rows):
+        """Set the shown source rows.
+
+        Args:
+            rows (list): Source rows or None to show all rows in EDL order.
+
+        """
+        self._rows = rows
+        self._proxy_rows = None
+
+    def _apply(self):
+        """Filter and sort the rows again.
+
+        Keeps persistent indexes, like the current cell, on their rows if
+        only the order changed. Otherwise the proxy is reset.
+
+        """
+        rows = self._filtered_rows()
+        if rows is None and self._rows is None:
+            return
+        if rows is None:
+            row_count = self.sourceModel().rowCount()
+        else:
+            row_count = len(rows)
+        if row_count != self.rowCount():
+            self.beginResetModel()
+            self._set_rows(rows)
+            self.endResetModel()
+            return
+        self.layoutAboutToBeChanged.emit()
+        persistent_indexes = self.persistentIndexList()
+        source_indexes = [
+            self.mapToSource(index) for index in persistent_indexes
+        ]
+        self._set_rows(rows)
+        self.changePersistentIndexList(
+            persistent_indexes,
+            [self.mapFromSource(index) for index in source_indexes],
+        )
+        self.layoutChanged.emit()
+
+    def _on_source_reset(self):
+        """Filter the rows of the reset source table."""
+        self._set_rows(self._filtered_rows())
+        self.endResetModel()
+
+    # pylint: disable=unused-argument
+    def _on_rows_about_to_be_inserted(self, parent, first, last):
+        """Insert the proxy rows of appended source rows in EDL order."""
+        if self._rows is None:
+            self.beginInsertRows(QtCore.QModelIndex(), first, last)
+
+    # pylint: disable=unused-argument
+    def _on_rows_inserted(self, parent, first, last):
+        """Finish the insertion or filter the appended rows."""
+        if self._rows is None:
+            self.endInsertRows()
+        else:
+            self._apply()
+
+    # pylint: disable=unused-argument
+    def _on_source_data_changed(self, top_left, bottom_right, roles=None):
+        """Forward changed source cells, filtering again if needed.
+
+        Args:
+            top_left (QtCore.QModelIndex): First changed source index.
+            bottom_right (QtCore.QModelIndex): Last changed source index.
+            roles (list): Changed roles.
+
+        """
+        if self._rows is None:
+            self.dataChanged.emit(
+                self.mapFromSource(top_left), self.mapFromSource(bottom_right)
+            )
+            return
+        self._apply()
+        if self.rowCount():
+            # Changed rows may be anywhere in the filtered order.
+            self.dataChanged.emit(
+                self.index(0, top_left.column()),
+                self.index(self.rowCount() - 1, bottom_right.column()),
+            )
@@ -0,0 +1,83 @@
+"""Streaming EDL writer.
+
+The EDL text is written event by event to a buffered temporary file next
+to the destination, which then replaces the destination in one step. So
+memory use does not grow with the EDL size and an interrupted save never
+leaves a truncated EDL behind.
+"""
+
+# Import built-in modules
+import os
+import stat
+import tempfile
+
+# Import local modules
+from py_edl_editor.edl_comments import is_dirty
+from py_edl_editor.edl_comments import update_dirty_comments
+
+# Size of the write buffer in bytes.
+WRITE_BUFFER_SIZE = 1 << 16
+
+
+def iter_edl_text(edl):
+    """Yield the EDL text in pieces, identical to edl.to_string() + newline.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Yields:
+        str: The title lines, then the text of one event at a time.
+
+    """
+    yield "TITLE: {0}\n\n".format(edl.title)
+    for event in edl.events:
+        yield "{0}\n".format(event.to_string())
+
+
+def write_edl(edl, dest_file_path):
+    """Write the EDL with updated comments to a file.
+
+    Only the outdated comments of events marked dirty are regenerated.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        dest_file_path (str): Path of the EDL file to write.
+
+    """
+    for event in edl.events:
+        if is_dirty(event):
+            update_dirty_comments(event)
+    dest_folder = os.path.dirname(os.path.abspath(dest_file_path))
+    mode = _file_mode(dest_file_path)
+    file_descriptor, temp_path = tempfile.mkstemp(
+        dir=dest_folder, suffix=".edl.tmp"
+    )
+    try:
+        with os.fdopen(
+            file_descriptor, "w", buffering=WRITE_BUFFER_SIZE
+        ) as edl_file:
+            edl_file.writelines(iter_edl_text(edl))
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, dest_file_path)
+    finally:
+        # Only left over if writing failed.
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _file_mode(file_path):
+    """Return the permission bits a written file should get.
+
+    Args:
+        file_path (str): Path of the file to write.
+
+    Returns:
+        int: Mode of the existing file, otherwise the default file mode.
+
+    """
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except OSError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
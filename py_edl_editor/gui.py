@@ -5,13 +5,42 @@ import sys
 
 # Import third-party modules
 from PySide2 import QtCore
+from PySide2 import QtGui
 from PySide2 import QtWidgets
 
 # Import local modules
+from py_edl_editor.edl_index import CLIP_NAME_FIELD
+from py_edl_editor.edl_index import LOCATOR_FIELD
+from py_edl_editor.edl_index import REEL_FIELD
+from py_edl_editor.edl_index import SOURCE_FILE_FIELD
+from py_edl_editor.edl_table import EdlFilterModel
 from py_edl_editor.edl_table import EdlTable
 from py_edl_editor.edl_table import EditableDelegate
+from py_edl_editor.edl_table import REC_TC
+from py_edl_editor.edl_table import SRC_TC
 from py_edl_editor.gui_controller import GuiController
-from py_edl_editor.gui_controller import FRAMERATES
+from py_edl_editor.pull_list import PULL_LIST_TYPES
+from py_edl_editor.tc_tools import FRAMERATES
+from py_edl_editor.tc_tools import tc_from_string
+
+# Number of rows measured when sizing the columns of a freshly filled table.
+SIZE_SAMPLE_ROWS = 50
+# Vertical space around the text of a table row in pixels.
+ROW_PADDING = 6
+# Search field choices and the event fields they search.
+SEARCH_FIELDS = [
+    ("All", None),
+    ("Reel", [REEL_FIELD]),
+    ("Clip Name", [CLIP_NAME_FIELD]),
+    ("Source File", [SOURCE_FILE_FIELD]),
+    ("Locator", [LOCATOR_FIELD]),
+]
+# Number of rows whose search index is built per idle step.
+INDEX_BUILD_ROWS = 500
+# CDL filter choices and the has_cdl value they filter for.
+CDL_FILTERS = [("All Events", None), ("With CDL", True), ("No CDL", False)]
+# Go to TC choices and the timecode range they look up.
+GO_TO_RANGES = [("Rec TC", REC_TC), ("Src TC", SRC_TC)]
 
 
 # pylint: disable=maybe-no-member
@@ -54,6 +83,13 @@ class PyEdlEditorApp(QtWidgets.QWidget):
         text_tools_group_box = QtWidgets.QGroupBox("Text Tools")
         output_group_box = QtWidgets.QGroupBox("Output")
         timecode_tools_group_box = QtWidgets.QGroupBox("Timecode Tools")
+        # Tools editing the EDL are disabled while an EDL is loading.
+        self.edit_group_boxes = [
+            display_group_box,
+            text_tools_group_box,
+            output_group_box,
+            timecode_tools_group_box,
+        ]
 
         # Show group boxes
         self._input_group_elements()
@@ -132,6 +168,18 @@ class PyEdlEditorApp(QtWidgets.QWidget):
         self.input_layout.addRow(reset_changes_button)
         reset_changes_button.clicked.connect(self.controller.reset_changes)
 
+        # Undo and Redo
+        undo_button = QtWidgets.QPushButton("Undo", self)
+        redo_button = QtWidgets.QPushButton("Redo", self)
+        undo_button.setShortcut(QtGui.QKeySequence.Undo)
+        redo_button.setShortcut(QtGui.QKeySequence.Redo)
+        undo_redo_hbox = QtWidgets.QHBoxLayout()
+        undo_redo_hbox.addWidget(undo_button)
+        undo_redo_hbox.addWidget(redo_button)
+        self.input_layout.addRow(undo_redo_hbox)
+        undo_button.clicked.connect(self.controller.undo)
+        redo_button.clicked.connect(self.controller.redo)
+
     def _display_group_elements(self):
         """Show elements of the display group."""
 
@@ -194,15 +242,18 @@ class PyEdlEditorApp(QtWidgets.QWidget):
         prepend_reels_button = QtWidgets.QPushButton("Prepend", self)
         append_reels_button = QtWidgets.QPushButton("Append", self)
         replace_reels_button = QtWidgets.QPushButton("Replace", self)
+        rename_reels_button = QtWidgets.QPushButton("Rename...", self)
         batch_edit_reels_hbox = QtWidgets.QHBoxLayout()
         batch_edit_reels_hbox.addWidget(prepend_reels_button)
         batch_edit_reels_hbox.addWidget(append_reels_button)
         batch_edit_reels_hbox.addWidget(replace_reels_button)
+        batch_edit_reels_hbox.addWidget(rename_reels_button)
         self.tools_layout.addRow(batch_edit_reels_label)
         self.tools_layout.addRow(batch_edit_reels_hbox)
         prepend_reels_button.clicked.connect(self.controller.prepend_reels)
         append_reels_button.clicked.connect(self.controller.append_reels)
         replace_reels_button.clicked.connect(self.controller.replace_reels)
+        rename_reels_button.clicked.connect(self.controller.rename_reels)
 
     def _output_group_elements(self):
         """Show elements of the output group."""
@@ -232,6 +283,17 @@ class PyEdlEditorApp(QtWidgets.QWidget):
             self.controller.export_reels_txt
         )  # noqa: E501
 
+        # Export Pull List
+        export_pull_list_button = QtWidgets.QPushButton(
+            "Export Pull List", self
+        )
+        self.pull_list_type = QtWidgets.QComboBox(self)
+        self.pull_list_type.addItems(PULL_LIST_TYPES)
+        self.output_layout.addRow(export_pull_list_button, self.pull_list_type)
+        export_pull_list_button.clicked.connect(
+            self.controller.export_pull_list
+        )
+
     def _edl_group_elements(self):
         """Show the EDL table."""
         self.edl_view = EdlEditor()
@@ -239,16 +301,43 @@ class PyEdlEditorApp(QtWidgets.QWidget):
 
     def _timecode_tools_group_elements(self):
         """Show the timecode tools."""
+        timeline_report_button = QtWidgets.QPushButton("Timeline Report", self)
         remove_gaps_button = QtWidgets.QPushButton("Remove Gaps", self)
         set_start_tc_button = QtWidgets.QPushButton("Set Start TC", self)
         add_handles_button = QtWidgets.QPushButton("Add Handles", self)
+        self.timecode_tools_layout.addRow(timeline_report_button)
         self.timecode_tools_layout.addRow(remove_gaps_button)
         self.timecode_tools_layout.addRow(set_start_tc_button)
         self.timecode_tools_layout.addRow(add_handles_button)
+        timeline_report_button.clicked.connect(
+            self.controller.print_timeline_report
+        )
         remove_gaps_button.clicked.connect(self.controller.remove_gaps)
         set_start_tc_button.clicked.connect(self.controller.set_start_tc)
         add_handles_button.clicked.connect(self.controller.add_handles)
 
+    def set_loading(self, loading):
+        """Show the loading progress and disable the editing tools.
+
+        Args:
+            loading (bool): True while an EDL is loading.
+
+        """
+        for group_box in self.edit_group_boxes:
+            group_box.setEnabled(not loading)
+        self.edl_view.set_loading(loading)
+
+    # pylint: disable=invalid-name
+    def closeEvent(self, event):
+        """Stop a running EDL loader before the window closes.
+
+        Args:
+            event (QtGui.QCloseEvent): Close event.
+
+        """
+        self.controller.cancel_loading()
+        event.accept()
+
     def run(self, qt_app):
         """Run the QT App.
 
@@ -261,28 +350,294 @@ class PyEdlEditorApp(QtWidgets.QWidget):
 
 
 class EdlEditor(QtWidgets.QWidget):
-    """View element containing the EDL table."""
+    """View element containing the EDL table.
+
+    Column widths are measured lazily: filling the table only measures a
+    sample of rows and the visible rows. Whenever the view scrolls or the
+    visible data changes, the newly visible rows are measured and columns
+    grow to fit them. All rows share one height computed from the fonts and
+    line counts of the multi-line columns, so rows never need to be measured
+    one by one.
+
+    The search bar filters the rows through the indexes of the EDL table,
+    clicking a header sorts by the column. The indexes are built in small
+    steps while the GUI is idle, so searching does not wait for them. The
+    go to TC field selects the event at a record or source timecode, found
+    by a binary search over the event start frames.
+
+    """
 
     # pylint: disable=super-with-arguments
     def __init__(self):
         """Initialize the EdlEditor instance."""
         super(EdlEditor, self).__init__()
 
-        asset_model = QtCore.QSortFilterProxyModel()
+        asset_model = EdlFilterModel()
         asset_model.setSourceModel(EdlTable())
 
         self.table = QtWidgets.QTableView()
         self.table.horizontalHeader().setStretchLastSection(True)
+        self.table.horizontalHeader().setResizeContentsPrecision(
+            SIZE_SAMPLE_ROWS
+        )
+        self.table.verticalHeader().setSectionResizeMode(
+            QtWidgets.QHeaderView.Fixed
+        )
         self.table.setModel(asset_model)
         self.table.verticalHeader().hide()
+        self._edit_triggers = self.table.editTriggers()
         self.table.setItemDelegateForColumn(1, EditableDelegate(self.table))
         self.table.setItemDelegateForColumn(2, EditableDelegate(self.table))
+        # Event order is the initial sort order.
+        self.table.horizontalHeader().setSortIndicator(
+            0, QtCore.Qt.AscendingOrder
+        )
+        self.table.setSortingEnabled(True)
         self.edl_table = self.table.model().sourceModel()
 
+        # Visible rows are measured once the view settles after scrolling.
+        self._measured_rows = set()
+        self._refine_timer = QtCore.QTimer(self)
+        self._refine_timer.setSingleShot(True)
+        self._refine_timer.setInterval(50)
+        self._refine_timer.timeout.connect(self.refine_visible_columns)
+        self.table.verticalScrollBar().valueChanged.connect(
+            self._schedule_refine
+        )
+        asset_model.dataChanged.connect(self._on_data_changed)
+        asset_model.modelReset.connect(self._measured_rows.clear)
+        asset_model.layoutChanged.connect(self._measured_rows.clear)
+
+        # Search bar filtering the rows.
+        self.search_field = QtWidgets.QLineEdit()
+        self.search_field.setPlaceholderText("Search")
+        self.search_field.setClearButtonEnabled(True)
+        self.search_fields = QtWidgets.QComboBox()
+        self.search_fields.addItems([name for name, _ in SEARCH_FIELDS])
+        self.cdl_filter = QtWidgets.QComboBox()
+        self.cdl_filter.addItems([name for name, _ in CDL_FILTERS])
+        self.row_count_label = QtWidgets.QLabel()
+        self.search_field.textChanged.connect(self.apply_search)
+        self.search_fields.currentIndexChanged.connect(self.apply_search)
+        self.cdl_filter.currentIndexChanged.connect(self.apply_search)
+        asset_model.modelReset.connect(self._update_row_count)
+        self._index_timer = QtCore.QTimer(self)
+        self._index_timer.setInterval(0)
+        self._index_timer.timeout.connect(self._build_search_index)
+        self.edl_table.modelReset.connect(self._index_timer.start)
+        asset_model.rowsInserted.connect(self._update_row_count)
+        asset_model.layoutChanged.connect(self._update_row_count)
+
+        # Go to TC field selecting the event at a timecode.
+        self.go_to_field = QtWidgets.QLineEdit()
+        self.go_to_field.setPlaceholderText("Go to TC")
+        self.go_to_range = QtWidgets.QComboBox()
+        self.go_to_range.addItems([name for name, _ in GO_TO_RANGES])
+        self.go_to_field.returnPressed.connect(self.go_to_timecode)
+
+        search_hbox = QtWidgets.QHBoxLayout()
+        search_hbox.addWidget(self.search_field)
+        search_hbox.addWidget(self.search_fields)
+        search_hbox.addWidget(self.cdl_filter)
+        search_hbox.addWidget(self.row_count_label)
+        search_hbox.addWidget(self.go_to_field)
+        search_hbox.addWidget(self.go_to_range)
+
+        # Loading progress, only shown while an EDL is loading.
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.cancel_button = QtWidgets.QPushButton("Cancel")
+        progress_hbox = QtWidgets.QHBoxLayout()
+        progress_hbox.addWidget(self.progress_bar)
+        progress_hbox.addWidget(self.cancel_button)
+        self.set_loading(False)
+
         main_layout = QtWidgets.QVBoxLayout()
+        main_layout.addLayout(progress_hbox)
+        main_layout.addLayout(search_hbox)
         main_layout.addWidget(self.table)
         self.setLayout(main_layout)
 
+    def set_loading(self, loading):
+        """Show or hide the loading progress, read-only while loading.
+
+        Args:
+            loading (bool): True while an EDL is loading.
+
+        """
+        self.table.setEditTriggers(
+            QtWidgets.QAbstractItemView.NoEditTriggers
+            if loading
+            else self._edit_triggers
+        )
+        self.progress_bar.setValue(0)
+        self.progress_bar.setVisible(loading)
+        self.cancel_button.setVisible(loading)
+        self._update_row_count()
+        if loading:
+            self._index_timer.stop()
+        else:
+            self._index_timer.start()
+
+    # pylint: disable=unused-argument
+    def apply_search(self, *args):
+        """Filter the rows by the search bar values."""
+        self.table.model().set_filter(
+            self.search_field.text(),
+            SEARCH_FIELDS[self.search_fields.currentIndex()][1],
+            CDL_FILTERS[self.cdl_filter.currentIndex()][1],
+        )
+        self._update_row_count()
+        self._refine_timer.start()
+
+    def go_to_timecode(self):
+        """Select and scroll to the event at the go to TC field value.
+
+        The value is either a frame number or a SMPTE timecode. Events
+        hidden by the search are shown by clearing the search first.
+
+        """
+        events = self.edl_table.events
+        if not events:
+            return
+        timecode = tc_from_string(
+            events[0].rec_start_tc.framerate, self.go_to_field.text()
+        )
+        if timecode is None:
+            return
+        row = self.edl_table.row_at_timecode(
+            timecode.frames, GO_TO_RANGES[self.go_to_range.currentIndex()][1]
+        )
+        model = self.table.model()
+        proxy_index = model.mapFromSource(self.edl_table.index(row, 0))
+        if not proxy_index.isValid():
+            self.search_field.clear()
+            self.cdl_filter.setCurrentIndex(0)
+            proxy_index = model.mapFromSource(self.edl_table.index(row, 0))
+        self.table.selectRow(proxy_index.row())
+        self.table.scrollTo(
+            proxy_index, QtWidgets.QAbstractItemView.PositionAtCenter
+        )
+
+    def _build_search_index(self):
+        """Build a part of the search index, stopping once it is complete."""
+        if self.edl_table.search_index.build_step(INDEX_BUILD_ROWS):
+            self._index_timer.stop()
+
+    # pylint: disable=unused-argument
+    def _update_row_count(self, *args):
+        """Show the number of shown and of all events."""
+        shown = self.table.model().rowCount()
+        total = self.edl_table.rowCount()
+        if shown == total:
+            self.row_count_label.setText("{0} events".format(total))
+        else:
+            self.row_count_label.setText(
+                "{0} of {1} events".format(shown, total)
+            )
+
+    def append_events(self, events):
+        """Append streamed events, sizing the table on the first chunk.
+
+        Args:
+            events (list): EDL Events, one per row.
+
+        """
+        first_chunk = not self.edl_table.events
+        self.edl_table.append_events(events)
+        if first_chunk:
+            self.resize_to_contents()
+            return
+        # Later chunks may add CDLs or locators and need higher rows.
+        vertical_header = self.table.verticalHeader()
+        row_height = self.row_height()
+        if row_height != vertical_header.defaultSectionSize():
+            vertical_header.setDefaultSectionSize(row_height)
+        self._refine_timer.start()
+
+    def resize_to_contents(self):
+        """Size columns from a sample of rows and set a uniform row height."""
+        self.table.verticalHeader().setDefaultSectionSize(self.row_height())
+        self.table.resizeColumnsToContents()
+        self._measured_rows.clear()
+        self._refine_timer.start()
+
+    def row_height(self):
+        """Return the row height fitting the multi-line column layout.
+
+        Returns:
+            int: Row height in pixels.
+
+        """
+        height = QtGui.QFontMetrics(self.table.font()).height()
+        line_counts = self.edl_table.column_line_counts()
+        for column, lines in line_counts.items():
+            font = self.edl_table.column_font(column) or self.table.font()
+            line_spacing = QtGui.QFontMetrics(font).lineSpacing()
+            height = max(height, line_spacing * lines)
+        return height + ROW_PADDING
+
+    def refine_visible_columns(self):
+        """Widen columns to fit the visible rows that were not measured yet.
+
+        Columns only grow, so the layout does not jump while scrolling.
+
+        """
+        model = self.table.model()
+        row_count = model.rowCount()
+        if not row_count:
+            return
+        viewport_height = self.table.viewport().height()
+        first_row = max(self.table.rowAt(0), 0)
+        last_row = self.table.rowAt(viewport_height - 1)
+        if last_row < 0:
+            last_row = row_count - 1
+        rows = [
+            row
+            for row in range(first_row, last_row + 1)
+            if row not in self._measured_rows
+        ]
+        if not rows:
+            return
+        header = self.table.horizontalHeader()
+        grid_width = 1 if self.table.showGrid() else 0
+        # The last section is stretched and needs no measuring.
+        for column in range(model.columnCount() - 1):
+            if self.table.isColumnHidden(column):
+                continue
+            width = max(
+                self.table.sizeHintForIndex(model.index(row, column)).width()
+                for row in rows
+            )
+            width = max(width + grid_width, header.sectionSizeHint(column))
+            if width > header.sectionSize(column):
+                header.resizeSection(column, width)
+        self._measured_rows.update(rows)
+
+    # pylint: disable=unused-argument
+    def _on_data_changed(self, top_left, bottom_right, roles=None):
+        """Measure the changed rows again once they are visible.
+
+        Args:
+            top_left (QtCore.QModelIndex): First changed index.
+            bottom_right (QtCore.QModelIndex): Last changed index.
+            roles (list): Changed roles.
+
+        """
+        if top_left.row() == 0 and (
+            bottom_right.row() == self.table.model().rowCount() - 1
+        ):
+            self._measured_rows.clear()
+        else:
+            self._measured_rows.difference_update(
+                range(top_left.row(), bottom_right.row() + 1)
+            )
+        self._refine_timer.start()
+
+    # pylint: disable=unused-argument
+    def _schedule_refine(self, *args):
+        """Measure the visible rows once the view stopped scrolling."""
+        self._refine_timer.start()
+
 
 class PyEdlEditorGui:
     """Construct QApplication used for the GUI."""
@@ -6,18 +6,40 @@ import subprocess
 import sys
 
 # Import third-party modules
-from cdl_convert import collection, write  # type: ignore
 from PySide2 import QtWidgets
 
 # Import local modules
-from py_edl_editor.cdl_tools import add_ccc_to_edl
-from py_edl_editor.cdl_tools import add_cdls_to_edl
-from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor import reel_tools
+from py_edl_editor.cdl_tools import export_cdls
+from py_edl_editor.cdl_tools import format_cdl_export_report
+from py_edl_editor.cdl_tools import format_cdl_import_report
+from py_edl_editor.cdl_tools import import_cdl_file
+from py_edl_editor.edl_cache import EdlCache
+from py_edl_editor.edl_loader import EdlLoader
+from py_edl_editor.edl_writer import write_edl
+from py_edl_editor.edl_table import CLIP_NAME_COLUMN
+from py_edl_editor.edl_table import LOCATOR_COLUMN
+from py_edl_editor.edl_table import REEL_COLUMN
+from py_edl_editor.edl_table import TIMECODE_COLUMNS
+from py_edl_editor.journal import CDL_ATTRIBUTES
+from py_edl_editor.journal import CLIP_NAME_ATTRIBUTES
+from py_edl_editor.journal import Journal
+from py_edl_editor.journal import LOCATOR_ATTRIBUTES
+from py_edl_editor.journal import REEL_ATTRIBUTES
+from py_edl_editor.journal import TC_ATTRIBUTES
+from py_edl_editor.pull_list import build_pull_list
+from py_edl_editor.pull_list import format_pull_list_report
+from py_edl_editor.pull_list import write_pull_list
+from py_edl_editor.reel_rename import ReelRenames
+from py_edl_editor.reel_rename import format_reel_rename_report
+from py_edl_editor.reel_rename import rename_reels
+from py_edl_editor.tc_tools import FRAMERATES
 from py_edl_editor.tc_tools import add_handles_to_edl
+from py_edl_editor.tc_tools import format_timeline_report
 from py_edl_editor.tc_tools import remove_edl_gaps
+from py_edl_editor.tc_tools import set_edl_framerate
 from py_edl_editor.tc_tools import set_edl_start_tc
-
-FRAMERATES = ["23.98", "24", "25", "29.97", "30", "50", "59.94", "60"]
+from py_edl_editor.tc_tools import timeline_report
 
 
 # pylint: disable=too-many-public-methods
@@ -36,6 +58,9 @@ class GuiController:
         self.edl_path = ""
         self.fps = 24
         self.dest_folder = ""
+        self.edl_cache = EdlCache()
+        self.journal = Journal()
+        self.loader = None
 
     def set_up_edl_view(self):
         """Set up the the EDL view."""
@@ -61,19 +86,39 @@ class GuiController:
                 )
             self.gui.framerate.setCurrentIndex(FRAMERATES.index(self.fps))
             self.update_edl_view()
+        self.gui.edl_view.edl_table.event_edited.connect(self._record_edit)
+        self.gui.edl_view.cancel_button.clicked.connect(self.cancel_loading)
 
     def update_edl_view(self):
         """Update EDL table."""
         self.gui.setWindowTitle(
             "EDL Editor [{0}]".format(os.path.split(self.edl_path)[1])
         )
-        self._set_edl()
-        self._fill_edl_table()
+        self._load_edl()
+
+    def cancel_loading(self):
+        """Stop loading the EDL and clear the partially filled table."""
+        if self.loader is None:
+            return
+        loader, self.loader = self.loader, None
+        loader.cancel()
+        loader.wait()
+        self.gui.edl_view.edl_table.clear()
+        self.gui.set_loading(False)
 
     def update_framerate(self):
         """Update framerate based on selected GUI Dropdown value."""
         self.fps = self.gui.framerates[self.gui.framerate.currentIndex()]
-        self.update_edl_view()
+        if self.edl is None:
+            self.update_edl_view()
+        else:
+            # Keep unsaved edits instead of parsing the EDL file again.
+            # Timecodes are recorded too, so undo restores them exactly.
+            with self.journal.record(
+                self.edl, "Change framerate", ["fps"] + TC_ATTRIBUTES
+            ):
+                self.edl = set_edl_framerate(self.edl, self.fps)
+            self._refresh_edl_table(TIMECODE_COLUMNS)
 
     def open_edl(self):
         """Open EDL File choseen in a File Dialog."""
@@ -88,45 +133,55 @@ class GuiController:
         """Reset all changes and go back to last saved state."""
         self.update_edl_view()
 
+    def undo(self):
+        """Revert the last edit without parsing the EDL again."""
+        self._update_after_journal(self.journal.undo(self.edl), "Undo")
+
+    def redo(self):
+        """Apply the last reverted edit again."""
+        self._update_after_journal(self.journal.redo(self.edl), "Redo")
+
     def edit_edl_title(self):
         """Update the EDL title."""
         reply = QtWidgets.QInputDialog.getText(
             None, "Update EDL Title", "New EDL Title:"
         )
         if reply[1]:
-            self.edl.title = reply[0]
+            with self.journal.record(self.edl, "Edit EDL Title", ["title"]):
+                self.edl.title = reply[0]
         self.gui.edl_title.setText("EDL Title: {0}".format(self.edl.title))
 
     def switch_reel(self):
         """Switch EDL Reel and EDL Clip Name."""
-        for event in self.edl.events:
-            reel = event.reel
-            event.reel = event.clip_name.replace(" ", "")
-            event.clip_name = reel
-            self._fix_event_clip_name_comment(event)
-        self._fill_edl_table()
+        with self.journal.record(
+            self.edl, "Switch Reel and Clip Name", CLIP_NAME_ATTRIBUTES
+        ):
+            reel_tools.switch_reel_and_clip_name(self.edl)
+        self._refresh_edl_table([REEL_COLUMN, CLIP_NAME_COLUMN])
 
     def switch_reel_and_loc(self):
         """Switch EDL Reel and EDL Locator Name."""
-        for event in self.edl.events:
-            if event.has_locator:
-                reel = event.reel
-                event.reel = event.loc_name.replace(" ", "")
-                event.loc_name = reel
-                self._fix_event_locator_comment(event)
-        self._fill_edl_table()
+        with self.journal.record(
+            self.edl, "Switch Reel and Locator Name", LOCATOR_ATTRIBUTES
+        ):
+            reel_tools.switch_reel_and_locator(self.edl)
+        self._refresh_edl_table([REEL_COLUMN, LOCATOR_COLUMN])
 
     def copy_source_file_to_reel(self):
         """Copy Source File to Reel."""
-        for event in self.edl.events:
-            event.reel = event.source_file
-        self._fill_edl_table()
+        with self.journal.record(
+            self.edl, "Copy Source File to Reel", REEL_ATTRIBUTES
+        ):
+            reel_tools.copy_source_file_to_reel(self.edl)
+        self._refresh_edl_table([REEL_COLUMN])
 
     def remove_reel_ext(self):
         """Remove extension from all reel names."""
-        for event in self.edl.events:
-            event.reel = os.path.splitext(event.reel)[0]
-        self._fill_edl_table()
+        with self.journal.record(
+            self.edl, "Remove extension from Reels", REEL_ATTRIBUTES
+        ):
+            reel_tools.remove_reel_ext(self.edl)
+        self._refresh_edl_table([REEL_COLUMN])
 
     def prepend_reels(self):
         """Prepend all reel names with user input string."""
@@ -134,10 +189,11 @@ class GuiController:
             None, "Batch Edit Reels: Prepend String", "String to be prepended:"
         )
         if reply[1]:
-            text = reply[0]
-            for event in self.edl.events:
-                event.reel = "{0}{1}".format(text, event.reel)
-        self._fill_edl_table()
+            with self.journal.record(
+                self.edl, "Prepend Reels", REEL_ATTRIBUTES
+            ):
+                reel_tools.prepend_reels(self.edl, reply[0])
+        self._refresh_edl_table([REEL_COLUMN])
 
     def append_reels(self):
         """Append user input string to all reel names."""
@@ -145,10 +201,11 @@ class GuiController:
             None, "Batch Edit Reels: Append String", "String to be appended:"
         )
         if reply[1]:
-            text = reply[0]
-            for event in self.edl.events:
-                event.reel = "{0}{1}".format(event.reel, text)
-        self._fill_edl_table()
+            with self.journal.record(
+                self.edl, "Append Reels", REEL_ATTRIBUTES
+            ):
+                reel_tools.append_reels(self.edl, reply[0])
+        self._refresh_edl_table([REEL_COLUMN])
 
     def replace_reels(self):
         """Replace string in all reel names."""
@@ -163,28 +220,50 @@ class GuiController:
         )
         if reply[1]:
             old_value, new_value = reply[0].split(",")
-            for event in self.edl.events:
-                event.reel = event.reel.replace(old_value, new_value.strip())
-        self._fill_edl_table()
+            with self.journal.record(
+                self.edl, "Replace Reels", REEL_ATTRIBUTES
+            ):
+                reel_tools.replace_reels(
+                    self.edl, old_value, new_value.strip()
+                )
+        self._refresh_edl_table([REEL_COLUMN])
+
+    def rename_reels(self):
+        """Rename reels by a user selected mapping file."""
+        mapping_path = QtWidgets.QFileDialog.getOpenFileName(
+            caption="Rename Reels: Mapping File",
+            dir=self.edl_path,
+            filter="*.csv *.txt",
+        )[0]
+        if not mapping_path:
+            return
+        try:
+            renames = ReelRenames.from_file(mapping_path)
+        except ValueError as error:
+            print(error)
+            return
+        with self.journal.record(self.edl, "Rename Reels", REEL_ATTRIBUTES):
+            report = rename_reels(self.edl, renames)
+        for line in format_reel_rename_report(report):
+            print(line)
+        self._refresh_edl_table([REEL_COLUMN])
 
     def toggle_frames_and_tc(self):
         """Toggle between showing SMPTE TCs and Frame numbers."""
         edl_table = self.gui.edl_view.edl_table
         edl_table.show_frames = not edl_table.show_frames
-        self._fill_edl_table()
+        self._refresh_edl_table(TIMECODE_COLUMNS)
 
     def save_edl(self):
         """Save EDL (overwrite loaded EDL file)."""
-        for event in self.edl.events:
-            self._fix_event_clip_name_comment(event)
-        self._write_file(self.edl_path, [self.edl.to_string()])
+        write_edl(self.edl, self.edl_path)
 
     def save_edl_as(self):
         """Save EDL to user specified file path."""
         dest_file_path = QtWidgets.QFileDialog.getSaveFileName(
             caption="Save File As...", dir=self.edl_path
         )[0]
-        self._write_file(dest_file_path, [self.edl.to_string()])
+        write_edl(self.edl, dest_file_path)
         self.edl_path = dest_file_path
         self.update_edl_view()
 
@@ -194,60 +273,70 @@ class GuiController:
         self.dest_folder = QtWidgets.QFileDialog.getExistingDirectory(
             caption="Choose folder", dir=self.edl_path
         )
-        cdls = []
-        for event in self.edl.events:
-            if event.cdl.has_sop and event.cdl.has_sat:
-                cdls.append(event.cdl)
-        if cdl_type == ".ccc":
-            ccc = collection.ColorCollection()
-            basename = os.path.split(self.edl_path)[1].split(".")[0]
-            filename = "{0}.ccc".format(basename)
-            # pylint: disable=protected-access
-            ccc._file_out = os.path.join(self.dest_folder, filename)
-            ccc.append_children(cdls)
-            write.write_cc(ccc)
-        else:
-            for cdl in cdls:
-                cdl.determine_dest(cdl_type[1:], self.dest_folder)
-                if cdl_type == ".cdl":
-                    write.write_cdl(cdl)
-                if cdl_type == ".cc":
-                    write.write_cc(cdl)
+        basename = os.path.split(self.edl_path)[1].split(".")[0]
+        report = export_cdls(self.edl, cdl_type, self.dest_folder, basename)
+        for line in format_cdl_export_report(report):
+            print(line)
 
     def export_reels_txt(self):
         """Export all Reel Names to a textfile."""
         self.dest_folder = QtWidgets.QFileDialog.getExistingDirectory(
             caption="Choose folder", dir=self.edl_path
         )
-        # pylint: disable=consider-using-set-comprehension
-        reels = sorted(set([event.reel for event in self.edl.events]))
+        reels = reel_tools.reel_names(self.edl)
         basename = os.path.split(self.edl_path)[1].split(".")[0]
         file_path = os.path.join(self.dest_folder, "{0}.txt".format(basename))
         self._write_file(file_path, reels)
 
+    def export_pull_list(self):
+        """Export the merged source ranges per reel with user handles.
+
+        File type based on GUI dropdown.
+
+        """
+        reply = QtWidgets.QInputDialog.getText(
+            None, "Export Pull List", "Number of handles:"
+        )
+        if not reply[1]:
+            return
+        self.dest_folder = QtWidgets.QFileDialog.getExistingDirectory(
+            caption="Choose folder", dir=self.edl_path
+        )
+        basename = os.path.split(self.edl_path)[1].split(".")[0]
+        file_path = os.path.join(
+            self.dest_folder,
+            "{0}{1}".format(basename, self.gui.pull_list_type.currentText()),
+        )
+        pull_list = build_pull_list(self.edl, int(reply[0] or 0))
+        write_pull_list(pull_list, self.edl, file_path)
+        for line in format_pull_list_report(pull_list):
+            print(line)
+
     def import_cdls(self):
         """Import CDLs and add it to the EDL event comments."""
         cdl_path = QtWidgets.QFileDialog.getOpenFileName(
             caption="Import CDLs", dir=self.edl_path, filter="*.c*"
         )[0]
-        cdl_type = os.path.splitext(cdl_path)[1]
-        if cdl_type == ".ccc":
-            add_ccc_to_edl(self.edl, cdl_path)
-        elif cdl_type in [".cdl", ".cc"]:
-            cdl_files = []
-            for file in os.listdir(os.path.dirname(cdl_path)):
-                if file.endswith(cdl_type):
-                    cdl_file = os.path.join(os.path.dirname(cdl_path), file)
-                    cdl_files.append(cdl_file)
-            add_cdls_to_edl(self.edl, cdl_type, cdl_files)
+        try:
+            with self.journal.record(self.edl, "Import CDLs", CDL_ATTRIBUTES):
+                report = import_cdl_file(self.edl, cdl_path)
+        except ValueError as error:
+            print(error)
         else:
-            print("Wrong file type. Supported types: .cdl, .cc, .ccc")
+            self._print_cdl_import_report(report)
         self._fill_edl_table()
 
+    def print_timeline_report(self):
+        """Print the gaps, overlaps and out of order events of the EDL."""
+        report = timeline_report(self.edl)
+        for line in format_timeline_report(report, self.edl):
+            print(line)
+
     def remove_gaps(self):
         """Remove EDL gaps."""
-        self.edl = remove_edl_gaps(self.edl)
-        self._fill_edl_table()
+        with self.journal.record(self.edl, "Remove Gaps", TC_ATTRIBUTES):
+            self.edl = remove_edl_gaps(self.edl)
+        self._refresh_edl_table(TIMECODE_COLUMNS)
 
     def set_start_tc(self):
         """Set start TC to user input value."""
@@ -257,8 +346,9 @@ class GuiController:
             "Start TC (either in Frame Numbers or SMPTE TC):",
         )
         if reply[1]:
-            self.edl = set_edl_start_tc(self.edl, reply[0])
-            self._fill_edl_table()
+            with self.journal.record(self.edl, "Set Start TC", TC_ATTRIBUTES):
+                self.edl = set_edl_start_tc(self.edl, reply[0])
+            self._refresh_edl_table(TIMECODE_COLUMNS)
 
     def add_handles(self):
         """Add handles (user input value) to all edl events."""
@@ -266,59 +356,138 @@ class GuiController:
             None, "Add Head and Tail Handles", "Number of handles:"
         )
         if reply[1]:
-            self.edl = add_handles_to_edl(self.edl, int(reply[0]))
-            self._fill_edl_table()
+            with self.journal.record(self.edl, "Add Handles", TC_ATTRIBUTES):
+                self.edl = add_handles_to_edl(self.edl, int(reply[0]))
+            self._refresh_edl_table(TIMECODE_COLUMNS)
 
     def show_otio_timeline(self):
         """Open EDL as open timeline io view."""
         subprocess.Popen(["otioview", "{0}".format(self.edl_path)])
 
-    def _set_edl(self):
-        """Parse and set the EDL."""
-        self.edl = parse_edl(self.edl_path, self.fps)
+    def _load_edl(self):
+        """Parse the EDL in a background thread.
+
+        The events are appended to the table chunk by chunk while parsing,
+        the EDL is set once it is loaded completely.
+
+        """
+        self.cancel_loading()
+        self.edl = None
+        self.journal.clear()
+        self.gui.edl_title.setText("")
+        self.gui.edl_view.edl_table.clear()
+        self.gui.set_loading(True)
+        self.loader = EdlLoader(self.edl_path, self.fps, self.edl_cache)
+        self.loader.events_parsed.connect(self._append_events)
+        self.loader.progress.connect(self._show_progress)
+        self.loader.loaded.connect(self._set_edl)
+        self.loader.start()
+
+    def _append_events(self, loader, events):
+        """Append streamed events of the current loader to the table.
+
+        Args:
+            loader (py_edl_editor.edl_loader.EdlLoader): Emitting loader.
+            events (list): Parsed EDL Events.
+
+        """
+        if loader is self.loader:
+            self.gui.edl_view.append_events(events)
+
+    def _show_progress(self, loader, percent):
+        """Show the loading progress of the current loader.
+
+        Args:
+            loader (py_edl_editor.edl_loader.EdlLoader): Emitting loader.
+            percent (int): Loaded percentage of the EDL file.
+
+        """
+        if loader is self.loader:
+            self.gui.edl_view.progress_bar.setValue(percent)
+
+    def _set_edl(self, loader, edl):
+        """Set the EDL loaded by the current loader.
+
+        Args:
+            loader (py_edl_editor.edl_loader.EdlLoader): Emitting loader.
+            edl (Edl): Loaded EDL or None if loading failed.
+
+        """
+        if loader is not self.loader:
+            return
+        loader.wait()
+        self.loader = None
+        self.gui.set_loading(False)
+        self.edl = edl
+        if edl is None:
+            return
         self.gui.edl_title.setText("EDL Title: {0}".format(self.edl.title))
 
     def _fill_edl_table(self):
         """Fill the EDL view with edl table events."""
-        self.gui.edl_view.edl_table.clear()
-        for event in self.edl.events:
-            self.gui.edl_view.edl_table.add_edl_table_event(event)
-        self.gui.edl_view.table.resizeColumnsToContents()
-        self.gui.edl_view.table.resizeRowsToContents()
+        self.gui.edl_view.edl_table.set_events(self.edl.events)
+        self.gui.edl_view.resize_to_contents()
 
-    @classmethod
-    def _fix_event_clip_name_comment(cls, event):
-        """Update EDL Event comment string that contains the Clip Name.
+    def _refresh_edl_table(self, columns):
+        """Repaint the given columns after the events were edited in place.
+
+        Args:
+            columns (list): Indexes of the changed table columns.
+
+        """
+        self.gui.edl_view.edl_table.refresh_columns(columns)
 
-        When updating the clip_name value, the comment is not updated. But
-        since we want to export the EDL, we need to update the comment.
+    def _record_edit(self, event, attribute, old_value, new_value):
+        """Record a table cell edit for undo.
 
         Args:
-            event (Edl.event):  EDL Event instance.
+            event (edl.Event): Edited EDL Event.
+            attribute (str): Name of the edited event attribute.
+            old_value (str): Value before the edit.
+            new_value (str): Value after the edit.
 
         """
-        for index, comment in enumerate(event.comments):
-            if "* FROM CLIP NAME:" in comment:
-                event.comments[index] = "{0} {1}".format(
-                    "* FROM CLIP NAME:", event.clip_name
-                )
+        self.journal.add(
+            "Edit {0}".format(attribute),
+            [(event, attribute, old_value, new_value)],
+        )
 
-    @classmethod
-    def _fix_event_locator_comment(cls, event):
-        """Update EDL Event comment string that contains the Locator.
+    def _update_after_journal(self, entry, action):
+        """Update the view after an operation was reverted or applied again.
+
+        Args:
+            entry (py_edl_editor.journal.JournalEntry): Operation or None.
+            action (str): "Undo" or "Redo".
 
-        When updating the clip_name value, the comment is not updated. But
-        since we want to export the EDL, we need to update the comment.
+        """
+        if entry is None:
+            print("Nothing to {0}".format(action.lower()))
+            return
+        attributes = {delta[1] for delta in entry.deltas}
+        if "fps" in attributes:
+            self.fps = self.edl.fps
+            self.gui.framerate.blockSignals(True)
+            self.gui.framerate.setCurrentIndex(FRAMERATES.index(self.fps))
+            self.gui.framerate.blockSignals(False)
+        self.gui.edl_title.setText("EDL Title: {0}".format(self.edl.title))
+        if "cdl" in attributes:
+            # The CDL column changes its row height.
+            self._fill_edl_table()
+        else:
+            edl_table = self.gui.edl_view.edl_table
+            self._refresh_edl_table(range(edl_table.columnCount()))
+        print("{0}: {1}".format(action, entry.name))
+
+    @classmethod
+    def _print_cdl_import_report(cls, report):
+        """Print CDLs and reels that could not be matched on import.
 
         Args:
-            event (Edl.event):  EDL Event instance.
+            report (py_edl_editor.cdl_tools.CdlImportReport): Import report.
 
         """
-        for index, comment in enumerate(event.comments):
-            if "* LOC:" in comment:
-                event.comments[index] = "* LOC: {0} {1} {2}".format(
-                    event.loc_tc, event.loc_color, event.loc_name
-                )
+        for line in format_cdl_import_report(report):
+            print(line)
 
     @classmethod
     def _write_file(cls, dest_file_path, lines):
@@ -0,0 +1,206 @@
+"""Interval index over the record or source ranges of EDL events.
+
+The ranges are sorted once by start frame in O(n log n). Gaps, overlaps and
+out of order events are then found in one pass over the sorted ranges, and
+the events at a frame are found with a binary search.
+"""
+
+# Import built-in modules
+from bisect import bisect_left
+from bisect import bisect_right
+from itertools import accumulate
+
+
+class IntervalIndex:
+    """Half-open frame ranges [start, end) of events, sorted by start.
+
+    Ranges are kept in the order they are given, which is the event order
+    used to find out of order events. Found ranges are returned as their
+    event rows.
+
+    """
+
+    def __init__(self, starts, ends, rows=None):
+        """Initialize the IntervalIndex instance.
+
+        Args:
+            starts (list): Start frames, one per range.
+            ends (list): End frames, one per range.
+            rows (list): Event row of every range, defaults to the range
+                position, i.e. one range per event.
+
+        """
+        self.starts = list(starts)
+        self.ends = list(ends)
+        self.rows = list(range(len(self.starts)) if rows is None else rows)
+        self.order = sorted(
+            range(len(self.starts)), key=self.starts.__getitem__
+        )
+        self._sorted_starts = [self.starts[index] for index in self.order]
+        self._max_ends = list(
+            accumulate((self.ends[index] for index in self.order), max)
+        )
+
+    def __len__(self):
+        """int: Number of indexed ranges."""
+        return len(self.starts)
+
+    def rows_at(self, frame):
+        """Return the rows whose range contains the frame.
+
+        Args:
+            frame (int): Frame to look up.
+
+        Returns:
+            list: Rows in row order.
+
+        """
+        rows = []
+        position = bisect_right(self._sorted_starts, frame) - 1
+        while position >= 0 and self._max_ends[position] > frame:
+            index = self.order[position]
+            if self.ends[index] > frame:
+                rows.append(self.rows[index])
+            position -= 1
+        return sorted(rows)
+
+    def row_at(self, frame):
+        """Return the first row whose range contains the frame.
+
+        Args:
+            frame (int): Frame to look up.
+
+        Returns:
+            int: Row or None if no range contains the frame.
+
+        """
+        rows = self.rows_at(frame)
+        return rows[0] if rows else None
+
+    def nearest_row(self, frame):
+        """Return the row of the last range starting at or before the frame.
+
+        Of several ranges with the same start, the first row is returned.
+        Only binary searches are used, so this is O(log n) even if ranges
+        overlap.
+
+        Args:
+            frame (int): Frame to look up.
+
+        Returns:
+            int: Row, the row of the first range if the frame is before all
+                ranges or None if the index is empty.
+
+        """
+        if not self.order:
+            return None
+        position = max(bisect_right(self._sorted_starts, frame) - 1, 0)
+        position = bisect_left(
+            self._sorted_starts, self._sorted_starts[position]
+        )
+        return self.rows[self.order[position]]
+
+    def gaps(self):
+        """Return the frame ranges not covered by any event.
+
+        Returns:
+            list: Tuples of gap start and end frames, sorted by start.
+
+        """
+        gaps = []
+        for position in range(1, len(self.order)):
+            start = self._sorted_starts[position]
+            covered_end = self._max_ends[position - 1]
+            if start > covered_end:
+                gaps.append((covered_end, start))
+        return gaps
+
+    def overlaps(self):
+        """Return the pairs of overlapping events.
+
+        Every event is paired with the preceding event (in start order)
+        reaching furthest into it, so n overlapping events give n - 1
+        pairs.
+
+        Returns:
+            list: Tuples of the earlier row, the later row and the number
+                of overlapping frames, sorted by start of the later row.
+
+        """
+        overlaps = []
+        furthest = None
+        for index in self.order:
+            if furthest is not None:
+                frames = (
+                    min(self.ends[furthest], self.ends[index])
+                    - self.starts[index]
+                )
+                if frames > 0:
+                    overlaps.append(
+                        (self.rows[furthest], self.rows[index], frames)
+                    )
+            if furthest is None or self.ends[index] > self.ends[furthest]:
+                furthest = index
+        return overlaps
+
+    def out_of_order_rows(self):
+        """Return the rows of ranges starting before a preceding range.
+
+        Returns:
+            list: Rows in row order.
+
+        """
+        rows = []
+        latest_start = None
+        for row, start in zip(self.rows, self.starts):
+            if latest_start is not None and start < latest_start:
+                rows.append(row)
+            else:
+                latest_start = start
+        return rows
+
+    def merged_ranges(self, padding=0, minimum=None):
+        """Return the ranges merged where they overlap or touch.
+
+        A single sweep over the ranges in start order, extending the last
+        merged range while the next one starts at or before its end.
+
+        Args:
+            padding (int): Frames added before and after every range.
+            minimum (int): Lowest start frame of a padded range.
+
+        Returns:
+            list: Tuples of start frame, end frame and the rows of the
+                merged ranges, sorted by start.
+
+        """
+        merged = []
+        for index in self.order:
+            start = self.starts[index] - padding
+            if minimum is not None:
+                start = max(start, minimum)
+            end = self.ends[index] + padding
+            if merged and start <= merged[-1][1]:
+                merged[-1][1] = max(merged[-1][1], end)
+                merged[-1][2].append(self.rows[index])
+            else:
+                merged.append([start, end, [self.rows[index]]])
+        return [tuple(merged_range) for merged_range in merged]
+
+    def packed_starts(self):
+        """Return the start frames of the ranges laid out back to back.
+
+        The ranges keep their length and their start order, the first range
+        keeps its start.
+
+        Returns:
+            list: New start frames, one per range.
+
+        """
+        packed = [0] * len(self.starts)
+        if self.order:
+            start = self._sorted_starts[0]
+            for index in self.order:
+                packed[index] = start
+                start += self.ends[index] - self.starts[index]
+        return packed
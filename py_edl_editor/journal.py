@@ -0,0 +1,220 @@
+"""Undo and redo journal for EDL edits.
+
+An operation is recorded by the attributes it may change. Only the values
+that actually changed are kept as (target, attribute, old, new) deltas, so
+undo and redo touch the changed events only and never need to parse the
+EDL again.
+"""
+
+# Import built-in modules
+from collections import namedtuple
+from contextlib import contextmanager
+
+# Import third-party modules
+from timecode import Timecode  # type: ignore
+
+# Import local modules
+from py_edl_editor.edl_comments import mark_dirty
+from py_edl_editor.edl_parser import TC_KEYS
+from py_edl_editor.tc_tools import set_edl_framerate
+from py_edl_editor.timeline import TC_COLUMNS
+from py_edl_editor.timeline import Timeline
+
+# Attributes of the EDL itself, all other attributes belong to the events.
+EDL_ATTRIBUTES = ["title", "fps"]
+REEL_ATTRIBUTES = ["reel"]
+CLIP_NAME_ATTRIBUTES = ["reel", "clip_name", "comments"]
+LOCATOR_ATTRIBUTES = ["reel", "loc_name", "comments"]
+CDL_ATTRIBUTES = ["cdl", "comments"]
+TC_ATTRIBUTES = TC_KEYS
+
+JournalEntry = namedtuple("JournalEntry", ["name", "deltas"])
+JournalEntry.__doc__ = """Recorded operation.
+
+Attributes:
+    name (str): Human readable name of the operation.
+    deltas (list): Tuples of target (EDL or event), attribute name, old and
+        new value for every changed value.
+
+"""
+
+
+class Journal:
+    """Undo and redo stacks of recorded EDL operations."""
+
+    def __init__(self, max_entries=100):
+        """Initialize the Journal instance.
+
+        Args:
+            max_entries (int): Number of operations that can be undone.
+
+        """
+        self.max_entries = max_entries
+        self._undo_entries = []
+        self._redo_entries = []
+
+    @property
+    def can_undo(self):
+        """bool: True if there is an operation to undo."""
+        return bool(self._undo_entries)
+
+    @property
+    def can_redo(self):
+        """bool: True if there is an undone operation to redo."""
+        return bool(self._redo_entries)
+
+    def clear(self):
+        """Remove all recorded operations."""
+        self._undo_entries = []
+        self._redo_entries = []
+
+    @contextmanager
+    def record(self, edl, name, attributes):
+        """Record the changes of the given attributes made in the context.
+
+        Example:
+            with journal.record(edl, "Prepend reels", REEL_ATTRIBUTES):
+                prepend_reels(edl, "A_")
+
+        Args:
+            edl (Edl): Edit Decision List that is edited in the context.
+            name (str): Human readable name of the operation.
+            attributes (list): Names of the EDL and event attributes that
+                the operation may change.
+
+        """
+        before = [
+            (attribute, _values(edl, attribute)) for attribute in attributes
+        ]
+        try:
+            yield
+        finally:
+            # Failed operations may have changed some events already.
+            deltas = []
+            for attribute, old_values in before:
+                new_values = _values(edl, attribute)
+                if attribute in EDL_ATTRIBUTES:
+                    targets = [edl]
+                else:
+                    targets = edl.events
+                for target, old, new in zip(targets, old_values, new_values):
+                    if old is not new and old != new:
+                        deltas.append((target, attribute, old, new))
+            self.add(name, deltas)
+
+    def add(self, name, deltas):
+        """Add an operation that was already applied to the journal.
+
+        Args:
+            name (str): Human readable name of the operation.
+            deltas (list): Tuples of target, attribute, old and new value.
+
+        """
+        if not deltas:
+            return
+        self._undo_entries.append(JournalEntry(name, deltas))
+        del self._undo_entries[: -self.max_entries]
+        self._redo_entries = []
+
+    def undo(self, edl):
+        """Revert the last recorded operation.
+
+        Args:
+            edl (Edl): Edit Decision List the operation was recorded on.
+
+        Returns:
+            JournalEntry: The reverted operation or None.
+
+        """
+        if not self._undo_entries:
+            return None
+        entry = self._undo_entries.pop()
+        for target, attribute, old, _ in _ordered(edl, reversed(entry.deltas)):
+            _set_value(edl, target, attribute, old)
+        self._redo_entries.append(entry)
+        return entry
+
+    def redo(self, edl):
+        """Apply the last reverted operation again.
+
+        Args:
+            edl (Edl): Edit Decision List the operation was recorded on.
+
+        Returns:
+            JournalEntry: The applied operation or None.
+
+        """
+        if not self._redo_entries:
+            return None
+        entry = self._redo_entries.pop()
+        for target, attribute, _, new in _ordered(edl, entry.deltas):
+            _set_value(edl, target, attribute, new)
+        self._undo_entries.append(entry)
+        return entry
+
+
+def _ordered(edl, deltas):
+    """Return the deltas with the ones of the EDL itself first.
+
+    Recorded timecodes are frames at the recorded frame rate, so a
+    recorded fps has to be restored before the timecodes.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        deltas (iterable): Tuples of target, attribute, old and new value.
+
+    Returns:
+        list: The deltas, EDL deltas first, otherwise in the given order.
+
+    """
+    return sorted(deltas, key=lambda delta: delta[0] is not edl)
+
+
+def _values(edl, attribute):
+    """Return the current values of the attribute.
+
+    Timecodes are returned as frames and comments as tuples, so the values
+    are not changed by later in-place edits.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        attribute (str): EDL or event attribute name.
+
+    Returns:
+        list: One value for EDL attributes, otherwise one value per event.
+
+    """
+    if attribute in EDL_ATTRIBUTES:
+        return [getattr(edl, attribute)]
+    if attribute in TC_KEYS:
+        if isinstance(edl, Timeline):
+            column = TC_COLUMNS[TC_KEYS.index(attribute)]
+            return list(getattr(edl, column))
+        return [getattr(event, attribute).frames for event in edl.events]
+    if attribute == "comments":
+        return [tuple(event.comments) for event in edl.events]
+    return [getattr(event, attribute, None) for event in edl.events]
+
+
+def _set_value(edl, target, attribute, value):
+    """Set a recorded value.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        target (object): The EDL or one of its events.
+        attribute (str): EDL or event attribute name.
+        value (object): Value as returned by _values.
+
+    """
+    if attribute == "fps":
+        set_edl_framerate(edl, value)
+    elif attribute in TC_KEYS:
+        if not isinstance(edl, Timeline):
+            value = Timecode(edl.fps, frames=value)
+        setattr(target, attribute, value)
+    elif attribute == "comments":
+        target.comments = list(value)
+    else:
+        setattr(target, attribute, value)
+        # Restored names need their comments generated again.
+        mark_dirty(target, attribute)
@@ -0,0 +1,202 @@
+"""Headless EDL processing pipeline.
+
+Chains the timecode, reel and CDL tools over an EDL without importing any
+GUI module. An operation is a tuple of an OPERATIONS name and its list of
+string arguments, e.g. ("handles", ["8"]). On a dry run, the
+EXPORT_OPERATIONS only report the files they would write.
+"""
+
+# Import built-in modules
+from functools import lru_cache
+import os
+
+# Import local modules
+from py_edl_editor import reel_tools
+from py_edl_editor.cdl_tools import CDL_TYPES
+from py_edl_editor.cdl_tools import export_cdls
+from py_edl_editor.cdl_tools import format_cdl_export_report
+from py_edl_editor.cdl_tools import format_cdl_import_report
+from py_edl_editor.cdl_tools import import_cdl_file
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_writer import write_edl
+from py_edl_editor.pull_list import build_pull_list
+from py_edl_editor.pull_list import format_pull_list_report
+from py_edl_editor.pull_list import write_pull_list
+from py_edl_editor.reel_rename import ReelRenames
+from py_edl_editor.reel_rename import format_reel_rename_report
+from py_edl_editor.reel_rename import rename_reels
+from py_edl_editor.tc_tools import add_handles_to_edl
+from py_edl_editor.tc_tools import format_timeline_report
+from py_edl_editor.tc_tools import remove_edl_gaps
+from py_edl_editor.tc_tools import set_edl_start_tc
+from py_edl_editor.tc_tools import timeline_report
+
+
+def _import_cdls(edl, edl_path, cdl_path):
+    """Import CDLs and print the import report."""
+    report = import_cdl_file(edl, cdl_path)
+    for line in format_cdl_import_report(report):
+        print("{0}: {1}".format(edl_path, line))
+    return edl
+
+
+def _export_cdls(edl, edl_path, cdl_type, dest_folder, dry_run=False):
+    """Export the EDL CDLs named after the EDL file."""
+    if cdl_type not in CDL_TYPES:
+        raise ValueError(
+            "Wrong CDL type {0}. Supported types: {1}".format(
+                cdl_type, ", ".join(CDL_TYPES)
+            )
+        )
+    report = export_cdls(
+        edl, cdl_type, dest_folder, _basename(edl_path), dry_run=dry_run
+    )
+    for line in format_cdl_export_report(report):
+        print("{0}: {1}".format(edl_path, line))
+    return edl
+
+
+def _print_timeline_report(edl, edl_path):
+    """Print the gaps, overlaps and out of order events of the EDL."""
+    for line in format_timeline_report(timeline_report(edl), edl):
+        print("{0}: {1}".format(edl_path, line))
+    return edl
+
+
+# pylint: disable=too-many-arguments
+def _export_pull_list(
+    edl, edl_path, file_type, handles, dest_folder, dry_run=False
+):
+    """Write the pull list named after the EDL file and print its report."""
+    file_path = os.path.join(
+        dest_folder, "{0}{1}".format(_basename(edl_path), file_type)
+    )
+    pull_list = build_pull_list(edl, int(handles))
+    if dry_run:
+        print("{0}: Would write {1}".format(edl_path, file_path))
+    else:
+        write_pull_list(pull_list, edl, file_path)
+    for line in format_pull_list_report(pull_list):
+        print("{0}: {1}".format(edl_path, line))
+    return edl
+
+
+@lru_cache(maxsize=None)
+def _load_reel_renames(mapping_path):
+    """Return the renames of the mapping file, loaded once per process."""
+    return ReelRenames.from_file(mapping_path)
+
+
+def _rename_reels(edl, edl_path, mapping_path):
+    """Rename the reels by the mapping file and print the report."""
+    report = rename_reels(edl, _load_reel_renames(mapping_path))
+    for line in format_reel_rename_report(report):
+        print("{0}: {1}".format(edl_path, line))
+    return edl
+
+
+def _export_reels(edl, edl_path, dest_folder, dry_run=False):
+    """Write the reel names to a textfile named after the EDL file."""
+    file_path = os.path.join(
+        dest_folder, "{0}.txt".format(_basename(edl_path))
+    )
+    if dry_run:
+        print("{0}: Would write {1}".format(edl_path, file_path))
+        return edl
+    with open(file_path, "w") as text_file:
+        for reel in reel_tools.reel_names(edl):
+            text_file.write("{0}\n".format(reel))
+    return edl
+
+
+# Every operation is called with the EDL, the EDL path and its arguments.
+OPERATIONS = {
+    "timeline_report": _print_timeline_report,
+    "remove_gaps": lambda edl, edl_path: remove_edl_gaps(edl),
+    "start_tc": lambda edl, edl_path, tc: set_edl_start_tc(edl, tc),
+    "handles": lambda edl, edl_path, handles: add_handles_to_edl(
+        edl, int(handles)
+    ),
+    "switch_reel_clip_name": lambda edl, edl_path: (
+        reel_tools.switch_reel_and_clip_name(edl)
+    ),
+    "switch_reel_locator": lambda edl, edl_path: (
+        reel_tools.switch_reel_and_locator(edl)
+    ),
+    "copy_source_file_to_reel": lambda edl, edl_path: (
+        reel_tools.copy_source_file_to_reel(edl)
+    ),
+    "remove_reel_ext": lambda edl, edl_path: reel_tools.remove_reel_ext(edl),
+    "prepend_reels": lambda edl, edl_path, text: reel_tools.prepend_reels(
+        edl, text
+    ),
+    "append_reels": lambda edl, edl_path, text: reel_tools.append_reels(
+        edl, text
+    ),
+    "replace_reels": lambda edl, edl_path, old, new: (
+        reel_tools.replace_reels(edl, old, new)
+    ),
+    "rename_reels": _rename_reels,
+    "import_cdls": _import_cdls,
+    "export_cdls": _export_cdls,
+    "export_reels": _export_reels,
+    "export_pull_list": _export_pull_list,
+}
+# Operations writing files, additionally called with the dry_run flag.
+EXPORT_OPERATIONS = {"export_cdls", "export_reels", "export_pull_list"}
+
+
+def apply_operations(edl, operations, edl_path="", dry_run=False):
+    """Apply the operations to the EDL in the given order.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        operations (list): Tuples of operation name and argument list.
+        edl_path (str): Path of the EDL, used to name exported files.
+        dry_run (bool): Only report the files the exports would write.
+
+    Returns:
+        Edl: The processed Edit Decision List.
+
+    """
+    for name, args in operations:
+        if name in EXPORT_OPERATIONS:
+            edl = OPERATIONS[name](edl, edl_path, *args, dry_run=dry_run)
+        else:
+            edl = OPERATIONS[name](edl, edl_path, *args)
+    return edl
+
+
+def process_edl(edl_path, fps, operations, output_path=None, dry_run=False):
+    """Parse an EDL, apply the operations and write the result.
+
+    The EDL is parsed into a compact Timeline, so the timecode operations
+    run on whole frame columns.
+
+    Args:
+        edl_path (str): Path of the EDL to process.
+        fps (str): Frame Rate for EDL calculations.
+        operations (list): Tuples of operation name and argument list.
+        output_path (str): Path the processed EDL is written to. Nothing is
+            written if not given.
+        dry_run (bool): Only report the files the exports would write.
+
+    Returns:
+        Edl: The processed Edit Decision List.
+
+    Raises:
+        IOError: If the EDL file does not exist.
+
+    """
+    edl = parse_edl(edl_path, fps, compact=True)
+    if edl is None:
+        raise IOError("Cant find EDL File: {0}".format(edl_path))
+    edl = apply_operations(edl, operations, edl_path, dry_run)
+    if output_path:
+        write_edl(edl, output_path)
+    return edl
+
+
+def _basename(edl_path):
+    """Return the EDL file name up to the first dot."""
+    return os.path.split(edl_path)[1].split(".")[0]
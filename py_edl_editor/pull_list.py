@@ -0,0 +1,168 @@
+"""Pull lists of the source media used by an EDL.
+
+For every reel the source ranges of its events, padded by handles, are
+merged where they overlap or touch, so every source frame is pulled once.
+"""
+
+# Import built-in modules
+from collections import namedtuple
+import csv
+import json
+import os
+
+# Import third-party modules
+from timecode import Timecode  # type: ignore
+
+# Import local modules
+from py_edl_editor.tc_tools import source_indexes
+from py_edl_editor.timeline import Timeline
+
+PULL_LIST_TYPES = [".csv", ".json"]
+CSV_HEADER = ["Reel", "Source In", "Source Out", "Frames", "Events"]
+# Lowest frame of a source range, as used by Timecode.frames.
+FIRST_FRAME = 1
+
+PullRange = namedtuple("PullRange", ["reel", "start", "end", "rows"])
+PullRange.__doc__ = """Merged source range of a reel.
+
+Attributes:
+    reel (str): Reel name.
+    start (int): First source frame, as used by Timecode.frames.
+    end (int): Source frame after the range, like an EDL source out.
+    rows (list): Rows of the events using the range.
+
+"""
+
+PullList = namedtuple(
+    "PullList", ["ranges", "handles", "frames", "event_frames"]
+)
+PullList.__doc__ = """Source ranges to pull for an EDL.
+
+Attributes:
+    ranges (list): PullRange tuples sorted by reel and start.
+    handles (int): Frames added before and after every event.
+    frames (int): Number of frames to pull.
+    event_frames (int): Number of frames when every event including
+        handles was pulled on its own.
+
+"""
+
+
+def build_pull_list(edl, handles=0):
+    """Return the merged source ranges of every reel of the EDL.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        handles (int): Frames added before and after every event.
+
+    Returns:
+        PullList: Source ranges to pull.
+
+    """
+    ranges = []
+    event_frames = 0
+    for reel, index in sorted(source_indexes(edl).items()):
+        for start, end, rows in index.merged_ranges(handles, FIRST_FRAME):
+            ranges.append(PullRange(reel, start, end, rows))
+        event_frames += sum(
+            end + handles - max(start - handles, FIRST_FRAME)
+            for start, end in zip(index.starts, index.ends)
+        )
+    frames = sum(pull_range.end - pull_range.start for pull_range in ranges)
+    return PullList(ranges, handles, frames, event_frames)
+
+
+def write_pull_list(pull_list, edl, file_path):
+    """Write the pull list as a .csv or .json file.
+
+    Args:
+        pull_list (PullList): Source ranges to pull.
+        edl (Edl): Edit Decision List the pull list was built from.
+        file_path (str): Destination path, its extension selects the type.
+
+    Raises:
+        ValueError: If the file type is not supported.
+
+    """
+    file_type = os.path.splitext(file_path)[1].lower()
+    if file_type not in PULL_LIST_TYPES:
+        raise ValueError(
+            "Wrong pull list type {0}. Supported types: {1}".format(
+                file_type, ", ".join(PULL_LIST_TYPES)
+            )
+        )
+    smpte = _smpte_converter(edl)
+    rows = [
+        [
+            pull_range.reel,
+            smpte(pull_range.start),
+            smpte(pull_range.end),
+            pull_range.end - pull_range.start,
+            [str(edl.events[row].num) for row in pull_range.rows],
+        ]
+        for pull_range in pull_list.ranges
+    ]
+    with open(file_path, "w", newline="") as pull_list_file:
+        if file_type == ".csv":
+            writer = csv.writer(pull_list_file)
+            writer.writerow(CSV_HEADER)
+            for row in rows:
+                writer.writerow(row[:-1] + [" ".join(row[-1])])
+        else:
+            json.dump(
+                {
+                    "fps": edl.fps,
+                    "handles": pull_list.handles,
+                    "frames": pull_list.frames,
+                    "ranges": [
+                        {
+                            "reel": reel,
+                            "src_in": src_in,
+                            "src_out": src_out,
+                            "frames": frames,
+                            "events": events,
+                        }
+                        for reel, src_in, src_out, frames, events in rows
+                    ],
+                },
+                pull_list_file,
+                indent=2,
+            )
+
+
+def format_pull_list_report(pull_list):
+    """Return the lines describing the given pull list.
+
+    Args:
+        pull_list (PullList): Source ranges to pull.
+
+    Returns:
+        list: Human readable report lines.
+
+    """
+    reels = len(set(pull_range.reel for pull_range in pull_list.ranges))
+    saved = pull_list.event_frames - pull_list.frames
+    return [
+        "{0} frames to pull in {1} ranges of {2} reels "
+        "({3} handles).".format(
+            pull_list.frames, len(pull_list.ranges), reels, pull_list.handles
+        ),
+        "Merging saves {0} of {1} frames pulled per event.".format(
+            saved, pull_list.event_frames
+        ),
+    ]
+
+
+def _smpte_converter(edl):
+    """Return a function converting frames of the EDL to SMPTE strings.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        callable: Function returning the SMPTE string of the given frames.
+
+    """
+    if isinstance(edl, Timeline):
+        return edl.smpte
+    return lambda frames: str(Timecode(edl.fps, frames=frames))
@@ -0,0 +1,179 @@
+"""Reel renames from a mapping file.
+
+A mapping file is a CSV file with an old and a new reel name per row. Rows
+whose old name starts with "re:" are regular expression rules, e.g.
+"re:^(A\\d{3}C\\d{3})_.*$,\\1". Empty rows and rows starting with "#" are
+ignored.
+
+Exact names are looked up in a dict. Reels without an exact name are
+renamed by the first matching rule, every reel is resolved once and the
+result is reused for all its events.
+"""
+
+# Import built-in modules
+from collections import namedtuple
+import csv
+import re
+
+RULE_PREFIX = "re:"
+
+ReelRenameReport = namedtuple(
+    "ReelRenameReport", ["renamed_events", "renamed_reels", "unmapped_reels"]
+)
+ReelRenameReport.__doc__ = """Result of renaming the reels of an EDL.
+
+Attributes:
+    renamed_events (int): Number of events that received a new reel.
+    renamed_reels (int): Number of reels that were renamed.
+    unmapped_reels (list): Sorted reels without a name or matching rule.
+
+"""
+
+
+class ReelRenames:
+    """Old to new reel names and regular expression rules.
+
+    Resolved reels are cached, so names and rules must not be changed after
+    the first rename.
+
+    """
+
+    def __init__(self, names=None, rules=None):
+        """Initialize the ReelRenames instance.
+
+        Args:
+            names (dict): Old reel names mapped to new reel names.
+            rules (list): Tuples of a compiled pattern and its replacement,
+                tried in the given order.
+
+        """
+        self.names = dict(names or {})
+        self.rules = list(rules or [])
+        self._resolved = {}
+
+    def __len__(self):
+        """int: Number of names and rules."""
+        return len(self.names) + len(self.rules)
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Return the renames of the given mapping file.
+
+        Args:
+            file_path (str): Path of the CSV mapping file.
+
+        Returns:
+            ReelRenames: Names and rules of the file.
+
+        Raises:
+            ValueError: If a row has no old and new name, the new name is
+                empty or contains whitespace or a rule is no valid regular
+                expression.
+
+        """
+        names = {}
+        rules = []
+        with open(file_path, newline="") as mapping_file:
+            for line_number, row in enumerate(csv.reader(mapping_file), 1):
+                if not row or row[0].startswith("#"):
+                    continue
+                if len(row) != 2:
+                    raise ValueError(
+                        "{0}:{1}: Expected old and new reel name.".format(
+                            file_path, line_number
+                        )
+                    )
+                old, new = row[0].strip(), row[1].strip()
+                # Reels are a single EDL column, so the name must be one
+                # word.
+                if len(new.split()) != 1:
+                    raise ValueError(
+                        "{0}:{1}: Invalid new reel name '{2}'.".format(
+                            file_path, line_number, new
+                        )
+                    )
+                if not old.startswith(RULE_PREFIX):
+                    names[old] = new
+                    continue
+                try:
+                    pattern = re.compile(old.replace(RULE_PREFIX, "", 1))
+                except re.error as error:
+                    raise ValueError(
+                        "{0}:{1}: {2}".format(file_path, line_number, error)
+                    ) from error
+                rules.append((pattern, new))
+        return cls(names, rules)
+
+    def rename(self, reel):
+        """Return the new name of the reel.
+
+        Args:
+            reel (str): Reel name.
+
+        Returns:
+            str: New reel name or None if the reel is not mapped.
+
+        """
+        try:
+            return self._resolved[reel]
+        except KeyError:
+            pass
+        new_reel = self.names.get(reel)
+        if new_reel is None:
+            for pattern, replacement in self.rules:
+                if pattern.search(reel):
+                    new_reel = pattern.sub(replacement, reel)
+                    break
+        self._resolved[reel] = new_reel
+        return new_reel
+
+
+def rename_reels(edl, renames):
+    """Rename the reels of all EDL events in one pass.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        renames (ReelRenames): Names and rules to apply.
+
+    Returns:
+        ReelRenameReport: Renamed events and reels and unmapped reels.
+
+    """
+    renamed_events = 0
+    renamed_reels = set()
+    unmapped_reels = set()
+    for event in edl.events:
+        new_reel = renames.rename(event.reel)
+        if new_reel is None:
+            unmapped_reels.add(event.reel)
+        elif new_reel != event.reel:
+            renamed_reels.add(event.reel)
+            event.reel = new_reel
+            renamed_events += 1
+    return ReelRenameReport(
+        renamed_events, len(renamed_reels), sorted(unmapped_reels)
+    )
+
+
+def format_reel_rename_report(report):
+    """Return the lines describing the given reel rename report.
+
+    Args:
+        report (ReelRenameReport): Rename report.
+
+    Returns:
+        list: Human readable report lines.
+
+    """
+    lines = [
+        "Renamed {0} reels in {1} events.".format(
+            report.renamed_reels, report.renamed_events
+        )
+    ]
+    if report.unmapped_reels:
+        lines.append(
+            "Reels without mapping: {0}".format(
+                ", ".join(report.unmapped_reels)
+            )
+        )
+    return lines
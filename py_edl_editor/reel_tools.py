@@ -0,0 +1,168 @@
+"""Reel tools.
+
+Batch edits of the reel names of all EDL events. Every tool accepts an
+edl.List or a compact Timeline and returns the edited EDL.
+"""
+
+# Import built-in modules
+import os
+
+# Import local modules
+from py_edl_editor.edl_comments import CLIP_NAME_SLOT
+from py_edl_editor.edl_comments import LOCATOR_SLOT
+from py_edl_editor.edl_comments import update_comment
+
+
+def switch_reel_and_clip_name(edl):
+    """Return EDL with switched reel and clip name values.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        Edl: Edit Decision List with switched reels and clip names.
+
+    """
+    for event in edl.events:
+        reel = event.reel
+        event.reel = event.clip_name.replace(" ", "")
+        event.clip_name = reel
+        fix_event_clip_name_comment(event)
+    return edl
+
+
+def switch_reel_and_locator(edl):
+    """Return EDL with switched reel and Avid Locator name values.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        Edl: Edit Decision List with switched reels and locator names.
+
+    """
+    for event in edl.events:
+        if event.has_locator:
+            reel = event.reel
+            event.reel = event.loc_name.replace(" ", "")
+            event.loc_name = reel
+            fix_event_locator_comment(event)
+    return edl
+
+
+def copy_source_file_to_reel(edl):
+    """Return EDL with the source file names as reels.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        Edl: Edit Decision List with updated reels.
+
+    """
+    for event in edl.events:
+        event.reel = event.source_file
+    return edl
+
+
+def remove_reel_ext(edl):
+    """Return EDL with the extensions removed from all reel names.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        Edl: Edit Decision List with updated reels.
+
+    """
+    for event in edl.events:
+        event.reel = os.path.splitext(event.reel)[0]
+    return edl
+
+
+def prepend_reels(edl, text):
+    """Return EDL with the given string prepended to all reel names.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        text (str): String to be prepended.
+
+    Returns:
+        Edl: Edit Decision List with updated reels.
+
+    """
+    for event in edl.events:
+        event.reel = "{0}{1}".format(text, event.reel)
+    return edl
+
+
+def append_reels(edl, text):
+    """Return EDL with the given string appended to all reel names.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        text (str): String to be appended.
+
+    Returns:
+        Edl: Edit Decision List with updated reels.
+
+    """
+    for event in edl.events:
+        event.reel = "{0}{1}".format(event.reel, text)
+    return edl
+
+
+def replace_reels(edl, old_value, new_value):
+    """Return EDL with a string replaced in all reel names.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        old_value (str): String to be replaced.
+        new_value (str): Replacement string.
+
+    Returns:
+        Edl: Edit Decision List with updated reels.
+
+    """
+    for event in edl.events:
+        event.reel = event.reel.replace(old_value, new_value)
+    return edl
+
+
+def reel_names(edl):
+    """Return the sorted unique reel names of the EDL.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        list: Sorted reel names.
+
+    """
+    return sorted({event.reel for event in edl.events})
+
+
+def fix_event_clip_name_comment(event):
+    """Update EDL Event comment string that contains the Clip Name.
+
+    When updating the clip_name value, the comment is not updated. But
+    since we want to export the EDL, we need to update the comment.
+
+    Args:
+        event (Edl.event):  EDL Event instance.
+
+    """
+    update_comment(event, CLIP_NAME_SLOT)
+
+
+def fix_event_locator_comment(event):
+    """Update EDL Event comment string that contains the Locator.
+
+    When updating the loc_name value, the comment is not updated. But
+    since we want to export the EDL, we need to update the comment.
+
+    Args:
+        event (Edl.event):  EDL Event instance.
+
+    """
+    update_comment(event, LOCATOR_SLOT)
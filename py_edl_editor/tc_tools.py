@@ -1,12 +1,55 @@
-"""Timecode tools."""
+"""Timecode tools.
+
+Every tool accepts an edl.List or a compact Timeline. For a Timeline the
+whole frame columns are updated at once instead of event by event.
+"""
+
+# Import built-in modules
+from array import array
+from collections import namedtuple
 
 # Import third-party modules
 from timecode import Timecode  # type: ignore
 
+# Import local modules
+from py_edl_editor.edl_parser import TC_KEYS
+from py_edl_editor.interval_index import IntervalIndex
+from py_edl_editor.timeline import TC_COLUMNS
+from py_edl_editor.timeline import Timeline
+from py_edl_editor.timeline import TimelineEvent
+
+FRAMERATES = ["23.98", "24", "25", "29.97", "30", "50", "59.94", "60"]
+
+TimelineReport = namedtuple(
+    "TimelineReport",
+    ["gaps", "overlaps", "out_of_order_rows", "source_overlaps"],
+)
+TimelineReport.__doc__ = """Record and source layout of an EDL.
+
+Attributes:
+    gaps (list): Record start and end frames of the gaps between events.
+    overlaps (list): Tuples of two overlapping event rows and the number of
+        overlapping record frames.
+    out_of_order_rows (list): Event rows recorded before a preceding event.
+    source_overlaps (list): Tuples of two event rows of the same reel using
+        the same source frames and the number of those frames.
+
+"""
+
+# Events reported by number per report line.
+REPORT_EVENTS = 20
+
 
 def remove_edl_gaps(edl):
     """Return EDL without gaps between EDL Events.
 
+    The events are laid out back to back in record order, starting at the
+    earliest record start. Every event keeps its record duration, so
+    overlapping events are moved behind each other as well. This includes
+    events with the same record range, e.g. the V, A1 and A2 events of a
+    multi-track EDL, which end up one after the other. Events that are out
+    of order in the EDL keep their place on the record timeline.
+
     Args:
         edl (Edl): Edit Decision List.
 
@@ -14,23 +57,218 @@ def remove_edl_gaps(edl):
         Edl: Edit Decision List without gaps.
 
     """
-    for index in range(len(edl.events) - 1):
-        event_rec_end = edl.events[index].rec_end_tc
-        next_event_rec_start = edl.events[index + 1].rec_start_tc
-        next_event_rec_end = edl.events[index + 1].rec_end_tc
-        diff = next_event_rec_start.frames - event_rec_end.frames
-        if diff > 0:
-            tc_diff = next_event_rec_start - event_rec_end
-            edl.events[index + 1].rec_start_tc = next_event_rec_start - tc_diff
-            edl.events[index + 1].rec_end_tc = next_event_rec_end - tc_diff
-        # Special case: EDL with incorrect order:
-        if diff < 0:
-            tc_diff = event_rec_end - next_event_rec_start
-            edl.events[index + 1].rec_start_tc = next_event_rec_start + tc_diff
-            edl.events[index + 1].rec_end_tc = next_event_rec_end + tc_diff
+    index = record_index(edl)
+    packed_starts = index.packed_starts()
+    if isinstance(edl, Timeline):
+        edl.rec_start[:] = array("q", packed_starts)
+        edl.rec_end[:] = array(
+            "q",
+            [
+                start + end - old_start
+                for start, old_start, end in zip(
+                    packed_starts, index.starts, index.ends
+                )
+            ],
+        )
+        return edl
+    for event, start, old_start in zip(
+        edl.events, packed_starts, index.starts
+    ):
+        offset = start - old_start
+        if offset:
+            event.rec_start_tc = event.rec_start_tc + offset
+            event.rec_end_tc = event.rec_end_tc + offset
     return edl
 
 
+def record_index(edl):
+    """Return the interval index over the record ranges of the EDL events.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        IntervalIndex: Record ranges, one per event row.
+
+    """
+    if isinstance(edl, Timeline):
+        return IntervalIndex(edl.rec_start, edl.rec_end)
+    return event_range_index(edl.events, "rec_start_tc", "rec_end_tc")
+
+
+def event_range_index(events, start_key, end_key):
+    """Return the interval index over a timecode range of the events.
+
+    Args:
+        events (list): EDL Events, one per row.
+        start_key (str): Timecode attribute of the range start, e.g.
+            "src_start_tc".
+        end_key (str): Timecode attribute of the range end.
+
+    Returns:
+        IntervalIndex: Ranges, one per event row.
+
+    """
+    return IntervalIndex(
+        _event_frames(events, start_key), _event_frames(events, end_key)
+    )
+
+
+def _event_frames(events, key):
+    """Return the frames of a timecode attribute of the events.
+
+    Events of a Timeline are read from its frame columns, so no Timecode
+    instances are created.
+
+    Args:
+        events (list): EDL Events.
+        key (str): Timecode attribute, one of TC_KEYS.
+
+    Returns:
+        list: Frames as used by Timecode.frames, one per event.
+
+    """
+    if events and isinstance(events[0], TimelineEvent):
+        column = TC_COLUMNS[TC_KEYS.index(key)]
+        return [
+            getattr(event.timeline, column)[event.index] for event in events
+        ]
+    return [getattr(event, key).frames for event in events]
+
+
+def source_indexes(edl):
+    """Return the interval indexes over the source ranges of every reel.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        dict: Reel names mapped to an IntervalIndex over the source ranges of
+            their events.
+
+    """
+    if isinstance(edl, Timeline):
+        ranges = zip(edl.src_start, edl.src_end)
+    else:
+        ranges = (
+            (event.src_start_tc.frames, event.src_end_tc.frames)
+            for event in edl.events
+        )
+    reel_ranges = {}
+    for row, (event, (start, end)) in enumerate(zip(edl.events, ranges)):
+        starts, ends, rows = reel_ranges.setdefault(event.reel, ([], [], []))
+        starts.append(start)
+        ends.append(end)
+        rows.append(row)
+    return {
+        reel: IntervalIndex(*columns) for reel, columns in reel_ranges.items()
+    }
+
+
+def timeline_report(edl):
+    """Return the gaps, overlaps and out of order events of the EDL.
+
+    Args:
+        edl (Edl): Edit Decision List.
+
+    Returns:
+        TimelineReport: Record and source layout of the EDL.
+
+    """
+    index = record_index(edl)
+    source_overlaps = []
+    for reel_index in source_indexes(edl).values():
+        source_overlaps.extend(reel_index.overlaps())
+    return TimelineReport(
+        index.gaps(),
+        index.overlaps(),
+        index.out_of_order_rows(),
+        sorted(source_overlaps),
+    )
+
+
+def format_timeline_report(report, edl):
+    """Return the lines describing the given timeline report.
+
+    Args:
+        report (TimelineReport): Timeline report of the EDL.
+        edl (Edl): Edit Decision List the report was created for.
+
+    Returns:
+        list: Human readable report lines.
+
+    """
+    gap_frames = sum(end - start for start, end in report.gaps)
+    lines = [
+        "{0} gaps ({1} frames), {2} overlapping events, "
+        "{3} events out of order.".format(
+            len(report.gaps),
+            gap_frames,
+            len(report.overlaps),
+            len(report.out_of_order_rows),
+        )
+    ]
+    if report.gaps:
+        lines.append(
+            "Gaps at: {0}".format(
+                _join_items(
+                    "{0} ({1} frames)".format(
+                        Timecode(edl.fps, frames=start), end - start
+                    )
+                    for start, end in report.gaps
+                )
+            )
+        )
+    if report.overlaps:
+        lines.append(
+            "Overlapping events: {0}".format(
+                _join_overlaps(report.overlaps, edl)
+            )
+        )
+    if report.out_of_order_rows:
+        lines.append(
+            "Events out of order: {0}".format(
+                _join_items(
+                    edl.events[row].num for row in report.out_of_order_rows
+                )
+            )
+        )
+    if report.source_overlaps:
+        lines.append(
+            "Events reusing source frames: {0}".format(
+                _join_overlaps(report.source_overlaps, edl)
+            )
+        )
+    return lines
+
+
+def _join_overlaps(overlaps, edl):
+    """Return the overlapping event numbers as one string."""
+    return _join_items(
+        "{0}/{1} ({2} frames)".format(
+            edl.events[row].num, edl.events[other_row].num, frames
+        )
+        for row, other_row, frames in overlaps
+    )
+
+
+def _join_items(items):
+    """Return the first REPORT_EVENTS items joined and the number of others.
+
+    Args:
+        items (iterable): Items to be joined.
+
+    Returns:
+        str: Comma separated items.
+
+    """
+    items = [str(item) for item in items]
+    text = ", ".join(items[:REPORT_EVENTS])
+    if len(items) > REPORT_EVENTS:
+        text = "{0} and {1} more".format(text, len(items) - REPORT_EVENTS)
+    return text
+
+
 def set_edl_start_tc(edl, start_tc):
     """Return EDL with updated start timecode.
 
@@ -44,15 +282,56 @@ def set_edl_start_tc(edl, start_tc):
     """
     new_start_tc = tc_from_string(edl.fps, start_tc)
     if new_start_tc:
-        first_event_rec_start = edl.events[0].rec_start_tc
-        diff = edl.events[0].rec_start_tc - new_start_tc
+        offset = new_start_tc.frames - edl.events[0].rec_start_tc.frames
+        if isinstance(edl, Timeline):
+            _shift_columns(offset, edl.rec_start, edl.rec_end)
+        elif offset:
+            for event in edl.events:
+                event.rec_start_tc = event.rec_start_tc + offset
+                event.rec_end_tc = event.rec_end_tc + offset
+    return edl
+
+
+def set_edl_framerate(edl, fps):
+    """Return EDL with all timecodes re-interpreted at the given frame rate.
+
+    The SMPTE strings of the events are kept and their frames re-derived,
+    so the result equals parsing the saved EDL with the new frame rate
+    while keeping all unsaved edits. Timecodes unchanged since the last
+    re-rate are derived from the strings of that re-rate, so switching
+    back and forth does not lose frame numbers missing at one rate, e.g.
+    frame 24 at 24fps.
+
+    Args:
+        edl (Edl): Edit Decision List.
+        fps (str): New Frame Rate for EDL calculations.
+
+    Return:
+        Edl: Edit Decision List using the new frame rate.
+
+    """
+    if isinstance(edl, Timeline):
+        edl.set_fps(fps)
+    else:
+        edl.fps = fps
         for event in edl.events:
-            if first_event_rec_start > new_start_tc:
-                event.rec_start_tc = event.rec_start_tc - diff
-                event.rec_end_tc = event.rec_end_tc - diff
-            else:
-                event.rec_start_tc = event.rec_start_tc + diff
-                event.rec_end_tc = event.rec_end_tc + diff
+            sources = getattr(event, "source_timecodes", None) or {}
+            for key in TC_KEYS:
+                setattr(
+                    event,
+                    key,
+                    _rerated(sources, key, getattr(event, key), fps),
+                )
+            event.source_timecodes = sources
+    for event in edl.events:
+        if event.timewarp:
+            timewarp = event.timewarp
+            sources = getattr(timewarp, "source_timecodes", None) or {}
+            timewarp.fps = fps
+            timewarp.timecode = _rerated(
+                sources, "timecode", timewarp.timecode, fps
+            )
+            timewarp.source_timecodes = sources
     return edl
 
 
@@ -95,9 +374,49 @@ def add_handles_to_edl(edl, handles):
     first_event_rec_start = edl.events[0].rec_start_tc
     if (first_event_rec_start.frame_number - handles) < 0:
         edl = set_edl_start_tc(edl, str((first_event_rec_start + handles)))
+    if isinstance(edl, Timeline):
+        _shift_columns(-handles, edl.src_start, edl.rec_start)
+        _shift_columns(handles, edl.src_end, edl.rec_end)
+        return edl
     for event in edl.events:
         event.src_start_tc = event.src_start_tc - handles
         event.src_end_tc = event.src_end_tc + handles
         event.rec_start_tc = event.rec_start_tc - handles
         event.rec_end_tc = event.rec_end_tc + handles
     return edl
+
+
+def _rerated(sources, key, timecode, fps):
+    """Return the timecode re-interpreted at the given frame rate.
+
+    Args:
+        sources (dict): SMPTE string and derived frames of the last re-rate
+            per attribute, updated for the given attribute.
+        key (str): Timecode attribute name.
+        timecode (Timecode): Current timecode.
+        fps (str): New Frame Rate.
+
+    Returns:
+        Timecode: New Timecode instance.
+
+    """
+    smpte, frames = sources.get(key, (None, None))
+    if frames != timecode.frames:
+        # Not re-rated yet or edited since.
+        smpte = str(timecode)
+    new_timecode = Timecode(fps, smpte)
+    sources[key] = (smpte, new_timecode.frames)
+    return new_timecode
+
+
+def _shift_columns(offset, *columns):
+    """Add the offset to all frames of the given timeline columns.
+
+    Args:
+        offset (int): Number of frames to add (negative to subtract).
+        columns (array.array): Frame columns of a Timeline.
+
+    """
+    if offset:
+        for column in columns:
+            column[:] = array("q", [frames + offset for frames in column])
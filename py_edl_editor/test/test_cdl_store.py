@@ -0,0 +1,28 @@
+"""Tests for the interned CDL store."""
+
+# Import third-party modules
+import cdl_convert  # type: ignore
+
+# Import local modules
+from py_edl_editor.cdl_store import CdlStore
+
+
+def test_cdl_store_interns_equal_grades():
+    """Returns the stored CDL for equal values of the same reel."""
+    cdl_convert.ColorCorrection.members = {}
+    cdl_store = CdlStore()
+    sop = (("1", "1", "1"), ("0", "0", "0"), ("1", "1", "1"))
+    cdl = cdl_store.get("A001", *sop, sat="1")
+    assert cdl.id == "A001"
+    sop = (("1.0",) * 3, ("0.0",) * 3, ("1",) * 3)
+    assert cdl_store.get("A001", *sop, sat="1.0") is cdl
+    assert len(cdl_store) == 1
+    imported = cdl_convert.ColorCorrection("A002")
+    imported.slope = cdl.slope
+    imported.offset = cdl.offset
+    imported.power = cdl.power
+    imported.sat = cdl.sat
+    assert cdl_store.intern(imported, "A001") is cdl
+    assert cdl_store.intern(imported) is imported
+    assert cdl_store.get("A001") is not cdl
+    assert len(cdl_store) == 3
@@ -0,0 +1,129 @@
+"""Tests for CDL tools."""
+
+# Import built-in modules
+import os
+
+# Import third-party modules
+import cdl_convert  # type: ignore
+import pytest
+
+# Import local modules
+from py_edl_editor.cdl_tools import add_ccc_to_edl
+from py_edl_editor.cdl_tools import build_reel_index
+from py_edl_editor.cdl_tools import export_cdls
+from py_edl_editor.cdl_tools import iter_ccc
+from py_edl_editor.cdl_tools import load_cdls
+from py_edl_editor.edl_parser import parse_edl
+
+DIRNAME = os.path.dirname(__file__)
+EDL_PATH = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+CCC_PATH = os.path.join(DIRNAME, "files/cdls.ccc")
+CC_TEMPLATE = """<?xml version="1.0" encoding="UTF-8"?>
+<ColorCorrection xmlns="urn:ASC:CDL:v1.01" id="{cc_id}">
+    <SOPNode>
+        <Slope>{slope} 1.0 1.0</Slope>
+        <Offset>0.0 0.0 0.0</Offset>
+        <Power>1.0 1.0 1.0</Power>
+    </SOPNode>
+    <SatNode>
+        <Saturation>1.0</Saturation>
+    </SatNode>
+</ColorCorrection>
+"""
+
+
+def test_add_ccc_to_edl():
+    """Applies the matching CDL and reports unmatched ids and reels."""
+    edl = parse_edl(EDL_PATH, "24")
+    report = add_ccc_to_edl(edl, CCC_PATH)
+    second_event = edl.events[1]
+    assert [str(value) for value in second_event.cdl.slope] == [
+        "1.1",
+        "1.0",
+        "0.9",
+    ]
+    assert second_event.comments[-2:] == [
+        "* ASC_SOP (1.1 1.0 0.9)(0.01 0.0 -0.01)(1.0 1.0 1.0)",
+        "* ASC_SAT 0.9",
+    ]
+    assert report.matched_events == 1
+    assert report.unmatched_cdl_ids == ["Z999C001_210101_R1AB"]
+    assert report.unmatched_reels == ["A001C003_210101_R1AB"]
+
+
+def test_iter_ccc_matches_parse_ccc(tmp_path):
+    """Yields the corrections cdl_convert parses, rejects other files."""
+    cdl_convert.correction.ColorCorrection.members = {}
+    expected = cdl_convert.parse_ccc(CCC_PATH).color_corrections
+    cdl_convert.correction.ColorCorrection.members = {}
+    result = list(iter_ccc(CCC_PATH))
+    assert [cdl.id for cdl in result] == [cdl.id for cdl in expected]
+    for cdl, expected_cdl in zip(result, expected):
+        assert cdl.slope == expected_cdl.slope
+        assert cdl.power == expected_cdl.power
+        assert cdl.sat == expected_cdl.sat
+    cc_path = os.path.join(str(tmp_path), "single.cc")
+    with open(cc_path, "w") as cc_file:
+        cc_file.write(CC_TEMPLATE.format(cc_id="A", slope="1.0"))
+    with pytest.raises(ValueError):
+        list(iter_ccc(cc_path))
+
+
+def test_add_ccc_to_edl_with_reel_index():
+    """Reuses a prebuilt reel index for the import."""
+    edl = parse_edl(EDL_PATH, "24")
+    reel_index = build_reel_index(edl)
+    assert [len(events) for events in reel_index.values()] == [2, 1]
+    report = add_ccc_to_edl(edl, CCC_PATH, reel_index)
+    assert report.matched_events == 1
+    assert add_ccc_to_edl(edl, CCC_PATH, reel_index) == report
+
+
+@pytest.mark.parametrize(
+    "workers,use_processes", [(1, False), (4, False), (2, True)]
+)
+def test_load_cdls(tmp_path, workers, use_processes):
+    """Returns the corrections of all files in file order."""
+    cc_paths = []
+    for index in range(8):
+        cc_path = tmp_path / "shot_{0:03d}.cc".format(index)
+        cc_path.write_text(CC_TEMPLATE.format(cc_id="A001", slope=index))
+        cc_paths.append(str(cc_path))
+    cdls = load_cdls(".cc", cc_paths, workers, use_processes)
+    assert [cdl.id for cdl in cdls] == ["A001"] + [
+        "A001{0:03d}".format(index) for index in range(1, 8)
+    ]
+    assert [float(cdl.slope[0]) for cdl in cdls] == list(range(8))
+    assert cdls[3].file_in == cc_paths[3]
+
+
+@pytest.mark.parametrize("cdl_type", [".cc", ".cdl"])
+def test_export_cdls(tmp_path, cdl_type):
+    """Writes identical corrections once, last differing one wins."""
+    cdl_convert.ColorCorrection.members = {}
+    edl = parse_edl(EDL_PATH, "24")
+    first, _, third = edl.events
+    report = export_cdls(edl, cdl_type, str(tmp_path), "edl", dry_run=True)
+    assert (report.files, report.duplicates) == (2, 0)
+    assert os.listdir(str(tmp_path)) == []
+    third.cdl.slope = first.cdl.slope
+    third.cdl.offset = first.cdl.offset
+    third.cdl.sat = first.cdl.sat
+    report = export_cdls(edl, cdl_type, str(tmp_path), "edl", workers=2)
+    assert (report.files, report.duplicates) == (1, 1)
+    assert report.conflicting_ids == []
+    assert os.listdir(str(tmp_path)) == [
+        "{0}{1}".format(first.cdl.id, cdl_type)
+    ]
+    cdl_path = tmp_path / "{0}{1}".format(first.cdl.id, cdl_type)
+    assert report.size == len(cdl_path.read_bytes())
+    expected_path = tmp_path / "expected"
+    expected_path.mkdir()
+    first.cdl.determine_dest(cdl_type[1:], str(expected_path))
+    if cdl_type == ".cc":
+        cdl_convert.write_cc(first.cdl)
+    else:
+        cdl_convert.write_cdl(first.cdl)
+    assert (
+        cdl_path.read_bytes() == (expected_path / cdl_path.name).read_bytes()
+    )
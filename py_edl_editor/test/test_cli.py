@@ -0,0 +1,131 @@
+"""Tests for the headless process command."""
+
+# Import built-in modules
+import os
+import subprocess
+import sys
+
+# Import local modules
+from py_edl_editor import reel_tools
+from py_edl_editor.__main__ import main
+from py_edl_editor.batch import expand_edl_paths
+from py_edl_editor.batch import process_batch
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.tc_tools import add_handles_to_edl
+from py_edl_editor.tc_tools import remove_edl_gaps
+
+DIRNAME = os.path.dirname(__file__)
+EDL_PATH = os.path.join(DIRNAME, "files/edl_with_gaps.edl")
+LOC_EDL_PATH = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+
+
+def test_process_command_does_not_import_qt():
+    """Runs the process command without importing PySide2."""
+    code = (
+        "import sys; from py_edl_editor.__main__ import main; "
+        "main(['process', '--dry-run', sys.argv[1]]); "
+        "sys.exit('PySide2' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code, EDL_PATH])
+    assert result.returncode == 0
+
+
+def test_process_command_applies_operations_in_order(tmp_path):
+    """Writes the EDL with the operations applied in command line order."""
+    exit_code = main(
+        [
+            "process",
+            "--remove-gaps",
+            "--handles",
+            "8",
+            "--prepend-reels",
+            "X_",
+            "--output-dir",
+            str(tmp_path),
+            "--suffix",
+            "_out",
+            EDL_PATH,
+        ]
+    )
+    expected = parse_edl(EDL_PATH, "24")
+    expected = add_handles_to_edl(remove_edl_gaps(expected), 8)
+    expected = reel_tools.prepend_reels(expected, "X_")
+    result_path = os.path.join(str(tmp_path), "edl_with_gaps_out.edl")
+    with open(result_path) as result_file:
+        result = result_file.read()
+    assert exit_code == 0
+    assert result == "{0}\n".format(expected.to_string())
+
+
+def test_process_command_reports_missing_edl(tmp_path, capsys):
+    """Processes all valid EDLs and returns 1 for a missing EDL."""
+    missing_path = os.path.join(str(tmp_path), "missing.edl")
+    exit_code = main(
+        ["process", "--dry-run", "--remove-gaps", missing_path, EDL_PATH]
+    )
+    assert exit_code == 1
+    assert "Cant find EDL File" in capsys.readouterr().out
+
+
+def test_switch_reel_and_locator():
+    """Switches reel and locator name and updates the locator comment."""
+    edl = reel_tools.switch_reel_and_locator(parse_edl(LOC_EDL_PATH, "24"))
+    first, second = edl.events[:2]
+    assert first.reel == "checkfocus"
+    assert first.loc_name == "A001C003_210101_R1AB"
+    assert "* LOC: 01:00:01:00 RED A001C003_210101_R1AB" in first.comments
+    assert second.reel == "A002C001_210101_R1AB"
+
+
+def test_process_batch_isolates_errors(tmp_path):
+    """Processes all EDLs of a glob in a process pool despite one error."""
+    edl_paths = expand_edl_paths(
+        [os.path.join(DIRNAME, "files/edl_with_gaps*.edl"), "missing.edl"]
+    )
+    output_paths = [
+        os.path.join(str(tmp_path), os.path.basename(edl_path))
+        for edl_path in edl_paths
+    ]
+    report = process_batch(
+        edl_paths, "24", [("remove_gaps", [])], output_paths, workers=2
+    )
+    assert len(edl_paths) == 4
+    assert (report.files, report.failed) == (3, 1)
+    assert report.results[-1].error == "Cant find EDL File: missing.edl"
+    assert report.events == sum(
+        len(parse_edl(edl_path, "24").events) for edl_path in edl_paths[:3]
+    )
+    with open(output_paths[0]) as result_file:
+        result = result_file.read()
+    expected = remove_edl_gaps(parse_edl(edl_paths[0], "24"))
+    assert result == "{0}\n".format(expected.to_string())
+
+
+def test_process_command_dry_run_writes_nothing(tmp_path, capsys):
+    """Only reports the files the exports would write on a dry run."""
+    exit_code = main(
+        [
+            "process",
+            "--dry-run",
+            "--timeline-report",
+            "--export-cdls",
+            ".cc",
+            str(tmp_path),
+            "--export-reels",
+            str(tmp_path),
+            "--export-pull-list",
+            ".csv",
+            "8",
+            str(tmp_path),
+            LOC_EDL_PATH,
+        ]
+    )
+    output = capsys.readouterr().out
+    assert exit_code == 0
+    assert os.listdir(str(tmp_path)) == []
+    assert "Would write 2 CDL files" in output
+    for ext in [".txt", ".csv"]:
+        file_path = os.path.join(
+            str(tmp_path), "edl_with_cdls_and_locators{0}".format(ext)
+        )
+        assert "Would write {0}".format(file_path) in output
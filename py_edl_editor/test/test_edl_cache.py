@@ -0,0 +1,119 @@
+"""Tests for the parsed EDL cache."""
+
+# Import built-in modules
+import os
+import pickle
+import shutil
+import zlib
+
+# Import third-party modules
+import pytest
+from timecode import Timecode  # type: ignore
+
+# Import local modules
+from py_edl_editor.edl_cache import EdlCache
+from py_edl_editor.edl_loader import EdlLoader
+from py_edl_editor.edl_parser import parse_edl
+
+DIRNAME = os.path.dirname(__file__)
+EDL_PATH = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_cache_hit_returns_new_edl(compact):
+    """Returns a fresh EDL equal to the parsed EDL on every hit."""
+    edl_cache = EdlCache()
+    edl_cache.get(EDL_PATH, "24", compact).events[0].reel = "edited"
+    result = edl_cache.get(EDL_PATH, "24", compact)
+    expected = parse_edl(EDL_PATH, "24", compact)
+    assert result.to_string() == expected.to_string()
+    for event, expected_event in zip(result.events, expected.events):
+        assert event.cdl.id == expected_event.cdl.id
+        assert event.cdl.has_sop == expected_event.cdl.has_sop
+        assert event.has_locator == expected_event.has_locator
+        assert event.clip_name == expected_event.clip_name
+    assert result.events[0].cdl.sat == expected.events[0].cdl.sat
+    assert result.events[0].next_event is result.events[1]
+    assert result.events[1].timewarp.warp_fps == 48.0
+
+
+def test_cache_key_changes_with_file_and_fps(tmp_path):
+    """Parses again after the file or the framerate changed."""
+    edl_path = os.path.join(str(tmp_path), "test.edl")
+    shutil.copy(EDL_PATH, edl_path)
+    edl_cache = EdlCache(max_entries=2)
+    assert edl_cache.get(edl_path, "24").title.endswith("Locators")
+    edl_cache.get(edl_path, "25")
+    with open(edl_path) as edl_file:
+        content = edl_file.read()
+    with open(edl_path, "w") as edl_file:
+        edl_file.write(content.replace("Locators", "Changes"))
+    assert edl_cache.get(edl_path, "24").title.endswith("Changes")
+    assert len(edl_cache) == 2
+    missing_path = os.path.join(str(tmp_path), "missing.edl")
+    assert edl_cache.get(missing_path, "24") is None
+
+
+def test_disk_cache(tmp_path):
+    """Returns EDLs stored on disk by another cache instance."""
+    cache_dir = os.path.join(str(tmp_path), "cache")
+    EdlCache(cache_dir=cache_dir).get(EDL_PATH, "24", compact=True)
+    assert len(os.listdir(cache_dir)) == 1
+    edl_cache = EdlCache(cache_dir=cache_dir)
+    result = edl_cache.get(EDL_PATH, "24", compact=True)
+    assert result.to_string() == parse_edl(EDL_PATH, "24").to_string()
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_cache_ignores_edits_of_streamed_events(compact):
+    """Caches the file state although streamed events were edited."""
+    edl_cache = EdlCache()
+    loaded = []
+
+    def edit_events(loader, events):
+        """Edit the streamed events like the GUI could while loading."""
+        for event in events:
+            event.reel = "edited"
+            event.rec_start_tc = Timecode("24", frames=1)
+            event.comments.append("* edited")
+
+    loader = EdlLoader(EDL_PATH, "24", edl_cache, compact)
+    loader.events_parsed.connect(edit_events)
+    loader.loaded.connect(lambda loader, edl: loaded.append(edl))
+    loader.run()
+    assert loaded[0].events[0].reel == "edited"
+    result = edl_cache.get(EDL_PATH, "24", compact)
+    expected = parse_edl(EDL_PATH, "24", compact)
+    assert result.to_string() == expected.to_string()
+    assert result.events[0].comments == expected.events[0].comments
+
+
+class _Payload:
+    """Object running a function when it is unpickled."""
+
+    def __init__(self, path):
+        """Initialize the _Payload instance."""
+        self.path = path
+
+    def __reduce__(self):
+        """Create a folder instead of returning the object."""
+        return os.makedirs, (self.path,)
+
+
+@pytest.mark.parametrize("inner", [False, True])
+def test_disk_cache_refuses_other_classes(inner, tmp_path):
+    """Parses again instead of running code of a tampered disk entry."""
+    cache_dir = os.path.join(str(tmp_path), "cache")
+    marker_path = os.path.join(str(tmp_path), "marker")
+    EdlCache(cache_dir=cache_dir).get(EDL_PATH, "24")
+    entry_path = os.path.join(cache_dir, os.listdir(cache_dir)[0])
+    with open(entry_path, "rb") as entry_file:
+        version, key, _ = pickle.load(entry_file)
+    payload = _Payload(marker_path)
+    if inner:
+        payload = (version, key, zlib.compress(pickle.dumps(payload)))
+    with open(entry_path, "wb") as entry_file:
+        pickle.dump(payload, entry_file)
+    result = EdlCache(cache_dir=cache_dir).get(EDL_PATH, "24")
+    assert not os.path.exists(marker_path)
+    assert result.to_string() == parse_edl(EDL_PATH, "24").to_string()
@@ -0,0 +1,116 @@
+"""Tests for the structured event comments."""
+
+# Import built-in modules
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from py_edl_editor.cdl_tools import add_ccc_to_edl
+from py_edl_editor.edl_comments import CLIP_NAME_SLOT
+from py_edl_editor.edl_comments import LOCATOR_SLOT
+from py_edl_editor.edl_comments import SAT_SLOT
+from py_edl_editor.edl_comments import SOP_SLOT
+from py_edl_editor.edl_comments import SOURCE_FILE_SLOT
+from py_edl_editor.edl_comments import UNKNOWN_SLOT
+from py_edl_editor.edl_comments import comment_slot
+from py_edl_editor.edl_comments import comment_slots
+from py_edl_editor.edl_comments import find_comments
+from py_edl_editor.edl_comments import is_dirty
+from py_edl_editor.edl_comments import mark_dirty
+from py_edl_editor.edl_comments import set_comment
+from py_edl_editor.edl_comments import update_dirty_comments
+from py_edl_editor.edl_parser import parse_edl
+
+DIRNAME = os.path.dirname(__file__)
+EDL_PATH = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+CCC_PATH = os.path.join(DIRNAME, "files/cdls.ccc")
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_parser_indexes_comments(compact):
+    """Classifies every comment once while parsing."""
+    edl = parse_edl(EDL_PATH, "24", compact)
+    first = edl.events[0]
+    cached_slots = first.comment_slots[2]
+    first.comment_slots = None
+    assert comment_slots(first) == cached_slots
+    assert sum(map(len, cached_slots.values())) == len(first.comments)
+    assert first.comments[cached_slots[SOURCE_FILE_SLOT][0]].endswith(
+        "A001C003_210101_R1AB.mov"
+    )
+    locators = [comment for _, comment in find_comments(edl, LOCATOR_SLOT)]
+    assert locators == ["* LOC: 01:00:01:00 RED     check focus"]
+    assert len(list(find_comments(edl, SOP_SLOT))) == 2
+
+
+@pytest.mark.parametrize(
+    "comment, slot",
+    [
+        ("* LOC: 01:00:01:00 RED     check focus", LOCATOR_SLOT),
+        ("*LOC: 01:00:01:00 RED check", LOCATOR_SLOT),
+        ("* FROM CLIP NAME: LOC: A", CLIP_NAME_SLOT),
+        ("* SOURCE FILE: LOC: A.mov", SOURCE_FILE_SLOT),
+        ("* NOTE LOC: A", UNKNOWN_SLOT),
+    ],
+)
+def test_comment_slot(comment, slot):
+    """Puts only comments starting with LOC: into the locator slot."""
+    assert comment_slot(comment) == slot
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_update_dirty_comments(compact):
+    """Regenerates the comments of dirty slots in place."""
+    event = parse_edl(EDL_PATH, "24", compact).events[0]
+    position = comment_slots(event)[CLIP_NAME_SLOT][0]
+    event.clip_name = "renamed"
+    assert not is_dirty(event)
+    mark_dirty(event, "clip_name")
+    assert is_dirty(event)
+    update_dirty_comments(event)
+    assert event.comments[position] == "* FROM CLIP NAME: renamed"
+    assert not is_dirty(event)
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_update_comments_keeps_every_locator(compact):
+    """Regenerates every locator comment instead of dropping extras."""
+    event = parse_edl(EDL_PATH, "24", compact).events[0]
+    event.comments = [
+        "* LOC: 01:00:01:00 RED     check focus",
+        "* A",
+        "* LOC: 01:00:02:00 BLUE    check grain",
+    ]
+    event.loc_tc, event.loc_color = "01:00:01:00", "RED"
+    event.loc_name = "renamed"
+    mark_dirty(event, "loc_name")
+    update_dirty_comments(event)
+    assert event.comments == [
+        "* LOC: 01:00:01:00 RED renamed",
+        "* A",
+        "* LOC: 01:00:01:00 RED renamed",
+    ]
+
+
+def test_set_comment_splits_combined_cdl_comment():
+    """Replaces SOP and SAT kept on one line by separate comments."""
+    event = parse_edl(EDL_PATH, "24").events[1]
+    event.comments = ["* ASC_SOP (1 1 1)(0 0 0)(1 1 1) ASC_SAT 1", "* A"]
+    set_comment(event, SOP_SLOT, "* ASC_SOP (2 2 2)(0 0 0)(1 1 1)")
+    set_comment(event, SAT_SLOT, "* ASC_SAT 0.5")
+    assert event.comments == [
+        "* ASC_SOP (2 2 2)(0 0 0)(1 1 1)",
+        "* A",
+        "* ASC_SAT 0.5",
+    ]
+
+
+def test_cdl_reimport_replaces_comments_in_place():
+    """Keeps the comment order when CDLs are imported again."""
+    edl = parse_edl(EDL_PATH, "24")
+    add_ccc_to_edl(edl, CCC_PATH)
+    comments = [list(event.comments) for event in edl.events]
+    add_ccc_to_edl(edl, CCC_PATH)
+    assert [event.comments for event in edl.events] == comments
@@ -0,0 +1,86 @@
+"""Tests for the search and sort indexes of the EDL table."""
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from py_edl_editor.edl_index import CDL_FIELD
+from py_edl_editor.edl_index import CLIP_NAME_FIELD
+from py_edl_editor.edl_index import EdlIndex
+from py_edl_editor.edl_index import REEL_FIELD
+from py_edl_editor.edl_parser import parse_edl_lines
+
+EVENT_LINE = "{0:03d}  {1}  V  C  01:00:00:00 01:00:01:00 {2} {3}"
+
+
+def _edl_lines(reels):
+    """Return EDL lines with one event per reel, every second graded."""
+    lines = []
+    for index, reel in enumerate(reels):
+        lines.append(
+            EVENT_LINE.format(
+                index + 1,
+                reel,
+                "01:00:{0:02d}:00".format(index),
+                "01:00:{0:02d}:00".format(index + 1),
+            )
+        )
+        lines.append("* FROM CLIP NAME: Shot_{0:03d}".format(index * 10))
+        if index % 2:
+            lines.append("* ASC_SOP (1 1 1)(0 0 0)(1 1 1)")
+            lines.append("* ASC_SAT 1")
+    return lines
+
+
+@pytest.mark.parametrize("scan_ratio", [0.0, 1.0])
+def test_edl_index_search_and_sort(monkeypatch, scan_ratio):
+    """Finds rows by trigrams or scanning and keeps them up to date."""
+    monkeypatch.setattr("py_edl_editor.edl_index.SCAN_RATIO", scan_ratio)
+    reels = ["B001", "A002", "A001", "C003", "A001"]
+    edl = parse_edl_lines(_edl_lines(reels), "24")
+    search_index = EdlIndex()
+    search_index.set_events(edl.events[:3])
+    search_index.append_events(edl.events[3:])
+    while not search_index.build_step(2):
+        pass
+    assert search_index.filter_rows("a00", [REEL_FIELD]) == [1, 2, 4]
+    assert search_index.filter_rows("A001", [REEL_FIELD]) == [2, 4]
+    assert search_index.filter_rows("0") == [0, 1, 2, 3, 4]
+    assert search_index.filter_rows("shot_02") == [2]
+    assert search_index.filter_rows("", has_cdl=True) == [1, 3]
+    assert search_index.filter_rows("a00", has_cdl=False) == [2, 4]
+    assert search_index.filter_rows() is None
+    assert search_index.sorted_rows(REEL_FIELD) == [2, 4, 1, 0, 3]
+    assert search_index.sorted_rows(REEL_FIELD, [0, 2, 4], True) == [0, 2, 4]
+    assert search_index.sorted_rows(CDL_FIELD) == [0, 2, 4, 1, 3]
+    edl.events[2].reel = "D004"
+    edl.events[0].clip_name = "a001 pickup"
+    search_index.update_rows([0, 2], [REEL_FIELD, CLIP_NAME_FIELD])
+    assert search_index.filter_rows("a001", [REEL_FIELD]) == [4]
+    assert search_index.filter_rows("a001") == [0, 4]
+    assert search_index.sorted_rows(REEL_FIELD) == [4, 1, 0, 3, 2]
+    for event in edl.events:
+        event.reel = event.reel.lower()
+    search_index.update_all([REEL_FIELD])
+    assert search_index.filter_rows("d004", [REEL_FIELD]) == [2]
+
+
+def test_edl_index_edits_between_build_steps():
+    """Keeps partly collected keys up to date with edited rows."""
+    reels = ["AAA{0}".format(index) for index in range(20)]
+    edl = parse_edl_lines(_edl_lines(reels), "24")
+    search_index = EdlIndex()
+    search_index.set_events(edl.events)
+    search_index.build_step(5)
+    edl.events[2].reel = "ZZZ"
+    search_index.update_rows([2], [REEL_FIELD])
+    search_index.build_step(5)
+    edl.events[3].reel = "YYY"
+    search_index.update_all([REEL_FIELD])
+    search_index.build_step(5)
+    assert search_index.filter_rows("zzz", [REEL_FIELD]) == [2]
+    assert search_index.filter_rows("aaa2", [REEL_FIELD]) == []
+    while not search_index.build_step(5):
+        pass
+    assert search_index.filter_rows("yyy") == [3]
+    assert search_index.filter_rows("aaa3") == []
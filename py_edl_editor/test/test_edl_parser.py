@@ -0,0 +1,128 @@
+"""Tests for the EDL parser."""
+
+# Import built-in modules
+import os
+
+# Import third-party modules
+from edl import Parser  # type: ignore
+import pytest
+
+# Import local modules
+from py_edl_editor.edl_parser import iter_edl_events
+from py_edl_editor.edl_parser import iter_file_lines
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_parser import parse_edl_lines
+from py_edl_editor.timeline import Timeline
+
+DIRNAME = os.path.dirname(__file__)
+EDL_FILES = [
+    "files/edl_with_gaps.edl",
+    "files/edl_with_gaps_start0.edl",
+    "files/edl_with_gaps_start0_plus_handles.edl",
+    "files/edl_without_gaps.edl",
+    "files/edl_with_cdls_and_locators.edl",
+]
+
+
+@pytest.mark.parametrize("edl_file", EDL_FILES)
+def test_parse_edl_matches_edl_parser(edl_file):
+    """Returns the same events as the edl library parser."""
+    edl_path = os.path.join(DIRNAME, edl_file)
+    with open(edl_path) as edl_input:
+        expected = Parser("24").parse(edl_input)
+    result = parse_edl(edl_path, "24")
+    assert result.title == expected.title
+    assert result.to_string() == expected.to_string()
+    for event, expected_event in zip(result.events, expected.events):
+        assert event.clip_name == expected_event.clip_name
+        assert event.source_file == expected_event.source_file
+        assert event.rec_start_tc == expected_event.rec_start_tc
+        assert event.src_end_tc == expected_event.src_end_tc
+
+
+@pytest.mark.parametrize("edl_file", EDL_FILES)
+def test_parse_edl_compact_matches_default(edl_file):
+    """Returns a compact timeline serializing to the same EDL string."""
+    edl_path = os.path.join(DIRNAME, edl_file)
+    expected = parse_edl(edl_path, "24")
+    result = parse_edl(edl_path, "24", compact=True)
+    assert result.to_string() == expected.to_string()
+    for event, expected_event in zip(result.events, expected.events):
+        assert event.src_start_tc == expected_event.src_start_tc
+        assert event.rec_end_tc.frame_number == (
+            expected_event.rec_end_tc.frame_number
+        )
+        assert event.rec_length() == expected_event.rec_length()
+
+
+def test_parse_edl_reads_cdls_and_locators():
+    """Returns events with CDL, locator and timewarp values from comments."""
+    edl_path = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+    edl = parse_edl(edl_path, "24")
+    first, second, third = edl.events
+    assert first.source_file == "A001C003_210101_R1AB.mov"
+    assert [str(value) for value in first.cdl.slope] == [
+        "1.0912",
+        "1.0",
+        "0.9815",
+    ]
+    assert str(first.cdl.offset[0]) == "-0.0123"
+    assert str(first.cdl.sat) == "0.95"
+    assert first.has_locator
+    assert (first.loc_tc, first.loc_color) == ("01:00:01:00", "RED")
+    assert first.loc_name == "check focus"
+    assert not second.has_locator
+    assert not second.cdl.has_sop
+    assert second.timewarp.warp_fps == 48.0
+    assert third.cdl.has_sop and third.cdl.has_sat
+    assert third.cdl.id != first.cdl.id
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_parse_edl_shares_cdls_of_a_grade(compact):
+    """Events of a reel with the same grade share one CDL instance."""
+    event_line = (
+        "00{0}  {1}  V  C  01:00:00:00 01:00:01:00 01:00:0{0}:00 01:00:0{2}:00"
+    )
+    lines = []
+    for index, (reel, sat) in enumerate(
+        [("A001", "0.9"), ("A001", "0.90"), ("A001", "1"), ("A002", "0.9")]
+    ):
+        lines.append(event_line.format(index, reel, index + 1))
+        lines.append("* ASC_SOP (1 1 1)(0 0 0)(1 1 1)")
+        lines.append("* ASC_SAT {0}".format(sat))
+    lines.append(event_line.format(4, "A001", 5))
+    edl = parse_edl_lines(lines, "24", compact)
+    first, second, third, fourth, ungraded = [
+        event.cdl for event in edl.events
+    ]
+    assert first is second
+    assert third is not first and third.has_sat
+    assert fourth.id == "A002"
+    assert not ungraded.has_sop and ungraded.id.startswith("A001")
+
+
+def test_iter_edl_events_yields_completed_chunks():
+    """Yields every event once, after all of its comments were parsed."""
+    edl_path = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+    expected = parse_edl(edl_path, "24")
+    edl = Timeline("24")
+    chunks = []
+    with open(edl_path) as edl_file:
+        for events in iter_edl_events(edl, edl_file, chunk_size=2):
+            chunks.append([event.comments[:] for event in events])
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert sum(chunks, []) == [event.comments for event in expected.events]
+    assert edl.to_string() == expected.to_string()
+
+
+def test_iter_file_lines_reads_all_line_breaks(tmp_path):
+    """Reads LF, CRLF and CR line breaks like a file opened in text mode."""
+    file_path = os.path.join(str(tmp_path), "line_breaks.edl")
+    with open(file_path, "wb") as edl_file:
+        edl_file.write(b"TITLE: a\r\n\r\n001  b\rc\nd")
+    with open(file_path) as edl_file:
+        assert list(iter_file_lines(file_path)) == list(edl_file)
+    empty_path = os.path.join(str(tmp_path), "empty.edl")
+    open(empty_path, "w").close()
+    assert parse_edl(empty_path, "24").events == []
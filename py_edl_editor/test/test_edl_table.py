@@ -0,0 +1,34 @@
+"""Tests for the EDL table model."""
+
+# Import third-party modules
+from timecode import Timecode  # type: ignore
+
+# Import local modules
+from py_edl_editor.edl_parser import parse_edl_lines
+from py_edl_editor.edl_table import REC_TC
+from py_edl_editor.edl_table import SRC_TC
+from py_edl_editor.edl_table import EdlTable
+
+# The source range of event 001 contains 01:00:05:00, event 002 of another
+# reel starts closer before it.
+EDL_LINES = [
+    "001  A001  V  C  01:00:00:00 01:00:10:00 01:00:00:00 01:00:10:00",
+    "002  B001  V  C  01:00:04:00 01:00:04:12 01:00:10:00 01:00:10:12",
+    "003  C001  V  C  02:00:00:00 02:00:01:00 01:00:10:12 01:00:11:12",
+]
+
+
+def _frames(smpte):
+    """Return the frames of the SMPTE string at 24fps."""
+    return Timecode("24", smpte).frames
+
+
+def test_row_at_timecode():
+    """Finds the event containing a source or record timecode."""
+    edl_table = EdlTable()
+    edl_table.set_events(parse_edl_lines(EDL_LINES, "24").events)
+    assert edl_table.row_at_timecode(_frames("01:00:05:00"), SRC_TC) == 0
+    assert edl_table.row_at_timecode(_frames("01:00:04:06"), SRC_TC) == 0
+    assert edl_table.row_at_timecode(_frames("01:30:00:00"), SRC_TC) == 1
+    assert edl_table.row_at_timecode(_frames("01:00:10:06"), REC_TC) == 1
+    assert edl_table.row_at_timecode(_frames("01:00:12:00")) == 2
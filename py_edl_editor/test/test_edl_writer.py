@@ -0,0 +1,43 @@
+"""Tests for the streaming EDL writer."""
+
+# Import built-in modules
+import os
+import stat
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from py_edl_editor.edl_comments import mark_dirty
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_writer import write_edl
+
+DIRNAME = os.path.dirname(__file__)
+EDL_PATH = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_write_edl_matches_to_string(tmp_path, compact):
+    """Writes the same text as to_string and keeps the file mode."""
+    edl = parse_edl(EDL_PATH, "24", compact)
+    dest_path = os.path.join(str(tmp_path), "out.edl")
+    with open(dest_path, "w") as edl_file:
+        edl_file.write("old")
+    os.chmod(dest_path, 0o640)
+    write_edl(edl, dest_path)
+    with open(dest_path) as edl_file:
+        assert edl_file.read() == "{0}\n".format(edl.to_string())
+    assert stat.S_IMODE(os.stat(dest_path).st_mode) == 0o640
+    assert os.listdir(str(tmp_path)) == ["out.edl"]
+
+
+def test_write_edl_updates_dirty_comments_only(tmp_path):
+    """Updates the clip name comments of dirty events only."""
+    edl = parse_edl(EDL_PATH, "24")
+    first, second = edl.events[:2]
+    first.clip_name = "first"
+    second.clip_name = "second"
+    mark_dirty(second, "clip_name")
+    write_edl(edl, os.path.join(str(tmp_path), "out.edl"))
+    assert "* FROM CLIP NAME: first" not in first.comments
+    assert "* FROM CLIP NAME: second" in second.comments
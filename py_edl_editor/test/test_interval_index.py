@@ -0,0 +1,38 @@
+"""Tests for the interval index over event ranges."""
+
+# Import local modules
+from py_edl_editor.interval_index import IntervalIndex
+
+
+def test_interval_index():
+    """Finds gaps, overlaps, out of order and contained ranges."""
+    index = IntervalIndex([10, 0, 20, 25, 40], [20, 10, 30, 35, 45])
+    assert index.order == [1, 0, 2, 3, 4]
+    assert index.gaps() == [(35, 40)]
+    assert index.overlaps() == [(2, 3, 5)]
+    assert index.out_of_order_rows() == [1]
+    assert index.rows_at(9) == [1]
+    assert index.rows_at(10) == [0]
+    assert index.rows_at(27) == [2, 3]
+    assert index.row_at(37) is None
+    assert index.row_at(-1) is None
+    assert index.packed_starts() == [10, 0, 20, 30, 40]
+
+
+def test_interval_index_nearest_row():
+    """Returns the first row of the last start at or before the frame."""
+    index = IntervalIndex([10, 0, 20, 20, 40], [20, 10, 30, 35, 45])
+    assert index.nearest_row(-5) == 1
+    assert index.nearest_row(0) == 1
+    assert index.nearest_row(19) == 0
+    assert index.nearest_row(36) == 2
+    assert index.nearest_row(100) == 4
+    assert IntervalIndex([], []).nearest_row(0) is None
+
+
+def test_interval_index_rows():
+    """Returns the given rows of the ranges."""
+    index = IntervalIndex([5, 0], [10, 6], rows=[3, 7])
+    assert index.overlaps() == [(7, 3, 1)]
+    assert index.out_of_order_rows() == [7]
+    assert index.rows_at(5) == [3, 7]
@@ -0,0 +1,97 @@
+"""Tests for the undo and redo journal."""
+
+# Import built-in modules
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from py_edl_editor import reel_tools
+from py_edl_editor.cdl_tools import import_cdl_file
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_parser import parse_edl_lines
+from py_edl_editor.journal import CDL_ATTRIBUTES
+from py_edl_editor.journal import Journal
+from py_edl_editor.journal import REEL_ATTRIBUTES
+from py_edl_editor.journal import TC_ATTRIBUTES
+from py_edl_editor.tc_tools import add_handles_to_edl
+from py_edl_editor.tc_tools import set_edl_framerate
+from py_edl_editor.tc_tools import set_edl_start_tc
+
+DIRNAME = os.path.dirname(__file__)
+EDL_PATH = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+GAPS_PATH = os.path.join(DIRNAME, "files/edl_with_gaps.edl")
+CCC_PATH = os.path.join(DIRNAME, "files/cdls.ccc")
+
+
+def test_undo_and_redo_reel_edits():
+    """Reverts and reapplies reel edits, keeping only changed events."""
+    edl = parse_edl(EDL_PATH, "24")
+    original = edl.to_string()
+    journal = Journal()
+    with journal.record(edl, "Replace Reels", REEL_ATTRIBUTES):
+        reel_tools.replace_reels(edl, edl.events[0].reel, "NEW_REEL")
+    edited = edl.to_string()
+    assert len(journal.undo(edl).deltas) < len(edl.events)
+    assert edl.to_string() == original
+    assert journal.redo(edl).name == "Replace Reels"
+    assert edl.to_string() == edited
+    journal.undo(edl)
+    with journal.record(edl, "Title", ["title"]):
+        edl.title = "New Title"
+    assert not journal.can_redo
+    assert journal.redo(edl) is None
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_undo_and_redo_timecode_edits(compact):
+    """Restores timecodes and framerate on both EDL models."""
+    edl = parse_edl(GAPS_PATH, "24", compact)
+    original = edl.to_string()
+    journal = Journal()
+    with journal.record(edl, "Set Start TC", TC_ATTRIBUTES):
+        set_edl_start_tc(edl, "0")
+    with journal.record(edl, "Add Handles", TC_ATTRIBUTES):
+        add_handles_to_edl(edl, 10)
+    with journal.record(edl, "Change framerate", ["fps"]):
+        set_edl_framerate(edl, "25")
+    edited = edl.to_string()
+    while journal.can_undo:
+        journal.undo(edl)
+    assert edl.fps == "24"
+    assert edl.to_string() == original
+    while journal.can_redo:
+        journal.redo(edl)
+    assert edl.to_string() == edited
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_undo_framerate_change(compact):
+    """Restores the exact timecodes when undoing a framerate change."""
+    line = "001  A001  V  C  01:00:10:24 01:00:11:10 01:00:00:00 01:00:00:10"
+    edl = parse_edl_lines([line], "25", compact)
+    original = edl.to_string()
+    journal = Journal()
+    with journal.record(edl, "Change framerate", ["fps"] + TC_ATTRIBUTES):
+        set_edl_framerate(edl, "24")
+    changed = edl.to_string()
+    assert changed != original
+    journal.undo(edl)
+    assert edl.fps == "25"
+    assert edl.to_string() == original
+    journal.redo(edl)
+    assert edl.fps == "24"
+    assert edl.to_string() == changed
+
+
+def test_undo_cdl_import():
+    """Restores the CDLs and comments replaced by a CDL import."""
+    edl = parse_edl(EDL_PATH, "24")
+    original = edl.to_string()
+    journal = Journal()
+    with journal.record(edl, "Import CDLs", CDL_ATTRIBUTES):
+        import_cdl_file(edl, CCC_PATH)
+    assert edl.to_string() != original
+    journal.undo(edl)
+    assert edl.to_string() == original
@@ -0,0 +1,62 @@
+"""Tests for the pull list generation."""
+
+# Import built-in modules
+import csv
+import json
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from py_edl_editor.edl_parser import parse_edl_lines
+from py_edl_editor.pull_list import build_pull_list
+from py_edl_editor.pull_list import format_pull_list_report
+from py_edl_editor.pull_list import write_pull_list
+
+# Event 002 overlaps 001, 003 starts right after 002 ends once handles are
+# added, 004 uses another reel starting at the first frame.
+EDL_LINES = [
+    "001  A001  V  C  01:00:00:00 01:00:02:00 01:00:00:00 01:00:02:00",
+    "002  A001  V  C  01:00:01:00 01:00:03:00 01:00:02:00 01:00:04:00",
+    "003  A001  V  C  01:00:03:16 01:00:04:00 01:00:04:00 01:00:04:08",
+    "004  B001  V  C  00:00:00:00 00:00:01:00 01:00:04:08 01:00:05:08",
+    "005  A001  V  C  01:00:10:00 01:00:11:00 01:00:05:08 01:00:06:08",
+]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_build_pull_list(compact, tmp_path):
+    """Merges overlapping and touching source ranges per reel."""
+    edl = parse_edl_lines(EDL_LINES, "24", compact)
+    pull_list = build_pull_list(edl, 8)
+    assert [
+        (pull_range.reel, pull_range.end - pull_range.start, pull_range.rows)
+        for pull_range in pull_list.ranges
+    ] == [("A001", 112, [0, 1, 2]), ("A001", 40, [4]), ("B001", 32, [3])]
+    assert pull_list.frames == 184
+    assert pull_list.event_frames == 224
+    assert format_pull_list_report(pull_list) == [
+        "184 frames to pull in 3 ranges of 2 reels (8 handles).",
+        "Merging saves 40 of 224 frames pulled per event.",
+    ]
+    csv_path = os.path.join(str(tmp_path), "pulls.csv")
+    write_pull_list(pull_list, edl, csv_path)
+    with open(csv_path, newline="") as csv_file:
+        rows = list(csv.reader(csv_file))
+    assert rows[1] == [
+        "A001",
+        "00:59:59:16",
+        "01:00:04:08",
+        "112",
+        "001 002 003",
+    ]
+    assert rows[3] == ["B001", "00:00:00:00", "00:00:01:08", "32", "004"]
+    json_path = os.path.join(str(tmp_path), "pulls.json")
+    write_pull_list(pull_list, edl, json_path)
+    with open(json_path) as json_file:
+        data = json.load(json_file)
+    assert data["frames"] == 184
+    assert data["ranges"][2]["events"] == ["004"]
+    with pytest.raises(ValueError):
+        write_pull_list(pull_list, edl, os.path.join(str(tmp_path), "a.txt"))
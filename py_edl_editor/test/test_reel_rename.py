@@ -0,0 +1,79 @@
+"""Tests for renaming reels by a mapping file."""
+
+# Import built-in modules
+import os
+
+# Import third-party modules
+import pytest
+
+# Import local modules
+from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.pipeline import apply_operations
+from py_edl_editor.reel_rename import ReelRenames
+from py_edl_editor.reel_rename import format_reel_rename_report
+from py_edl_editor.reel_rename import rename_reels
+
+DIRNAME = os.path.dirname(__file__)
+EDL_PATH = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+MAPPING = """# old,new
+A001C003_210101_R1AB,A001C003
+
+re:^(A\\d{3})C\\d{3}_.*$,\\1_ROLL
+"""
+
+
+def _write_mapping(tmp_path, content):
+    """Write the mapping file and return its path."""
+    mapping_path = os.path.join(str(tmp_path), "reels.csv")
+    with open(mapping_path, "w") as mapping_file:
+        mapping_file.write(content)
+    return mapping_path
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_rename_reels(compact, tmp_path):
+    """Renames by exact names first, then by the first matching rule."""
+    renames = ReelRenames.from_file(_write_mapping(tmp_path, MAPPING))
+    assert len(renames) == 2
+    edl = parse_edl(EDL_PATH, "24", compact)
+    report = rename_reels(edl, renames)
+    assert [event.reel for event in edl.events] == [
+        "A001C003",
+        "A002_ROLL",
+        "A001C003",
+    ]
+    assert report == (3, 2, [])
+    assert format_reel_rename_report(rename_reels(edl, renames)) == [
+        "Renamed 0 reels in 0 events.",
+        "Reels without mapping: A001C003, A002_ROLL",
+    ]
+
+
+def test_rename_reels_operation(tmp_path):
+    """Applies the mapping file as pipeline operation."""
+    mapping_path = _write_mapping(tmp_path, "A002C001_210101_R1AB,B002\n")
+    edl = apply_operations(
+        parse_edl(EDL_PATH, "24", compact=True),
+        [("rename_reels", [mapping_path])],
+    )
+    assert [event.reel for event in edl.events][:2] == [
+        "A001C003_210101_R1AB",
+        "B002",
+    ]
+
+
+@pytest.mark.parametrize("content", ["A001,B001,C001\n", "re:(A,B\n"])
+def test_rename_reels_invalid_mapping(content, tmp_path):
+    """Raises a ValueError for malformed rows and invalid rules."""
+    with pytest.raises(ValueError):
+        ReelRenames.from_file(_write_mapping(tmp_path, content))
+
+
+@pytest.mark.parametrize(
+    "row", ["A002,", "A002, ", "A002,NEW REEL", "re:^(A\\d{3}),\\1 ROLL"]
+)
+def test_rename_reels_invalid_new_reel(row, tmp_path):
+    """Rejects new reel names that do not fit into the reel column."""
+    content = "A001,B001\n{0}\n".format(row)
+    with pytest.raises(ValueError, match=r"reels\.csv:2: Invalid new reel"):
+        ReelRenames.from_file(_write_mapping(tmp_path, content))
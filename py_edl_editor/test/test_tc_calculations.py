@@ -4,32 +4,92 @@
 import os
 
 # Import third-party modules
+import pytest
 from timecode import Timecode  # type: ignore
 
 # Import local modules
 from py_edl_editor.edl_parser import parse_edl
+from py_edl_editor.edl_parser import parse_edl_lines
 from py_edl_editor.tc_tools import add_handles_to_edl
+from py_edl_editor.tc_tools import event_range_index
+from py_edl_editor.tc_tools import format_timeline_report
 from py_edl_editor.tc_tools import remove_edl_gaps
+from py_edl_editor.tc_tools import set_edl_framerate
 from py_edl_editor.tc_tools import set_edl_start_tc
 from py_edl_editor.tc_tools import tc_from_string
+from py_edl_editor.tc_tools import timeline_report
 
 DIRNAME = os.path.dirname(__file__)
 
+# Events 003 and 004 are recorded before 002, 004 overlaps 003 and reuses the
+# source frames of 001.
+OUT_OF_ORDER_LINES = [
+    "001  A001  V  C  01:00:00:00 01:00:02:00 01:00:00:00 01:00:02:00",
+    "002  B001  V  C  01:00:00:00 01:00:01:00 01:00:10:00 01:00:11:00",
+    "003  C001  V  C  01:00:00:00 01:00:02:00 01:00:05:00 01:00:07:00",
+    "004  A001  V  C  01:00:01:00 01:00:03:00 01:00:06:00 01:00:08:00",
+]
 
-def test_remove_tc_gaps():
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_remove_tc_gaps(compact):
     """Returns correctly calculated EDL without gaps."""
     edl_with_gaps_path = os.path.join(DIRNAME, "files/edl_with_gaps.edl")
     edl_without_gaps_path = os.path.join(DIRNAME, "files/edl_without_gaps.edl")
-    gap_edl = parse_edl(edl_with_gaps_path, "24")
+    gap_edl = parse_edl(edl_with_gaps_path, "24", compact)
     no_gap_edl = parse_edl(edl_without_gaps_path, "24")
     assert no_gap_edl.to_string() == remove_edl_gaps(gap_edl).to_string()
 
 
-def test_set_start_tc():
+@pytest.mark.parametrize("compact", [False, True])
+def test_remove_tc_gaps_out_of_order(compact):
+    """Closes gaps in record order and keeps the record order of events."""
+    edl = remove_edl_gaps(parse_edl_lines(OUT_OF_ORDER_LINES, "24", compact))
+    assert [str(event.rec_start_tc) for event in edl.events] == [
+        "01:00:00:00",
+        "01:00:06:00",
+        "01:00:02:00",
+        "01:00:04:00",
+    ]
+    assert str(edl.events[1].rec_end_tc) == "01:00:07:00"
+    assert timeline_report(edl).gaps == []
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_timeline_report(compact):
+    """Reports gaps, overlaps, out of order events and reused sources."""
+    edl = parse_edl_lines(OUT_OF_ORDER_LINES, "24", compact)
+    report = timeline_report(edl)
+    assert report.gaps == [(86449, 86521), (86593, 86641)]
+    assert report.overlaps == [(2, 3, 24)]
+    assert report.out_of_order_rows == [2, 3]
+    assert report.source_overlaps == [(0, 3, 24)]
+    assert format_timeline_report(report, edl) == [
+        "2 gaps (120 frames), 1 overlapping events, 2 events out of order.",
+        "Gaps at: 01:00:02:00 (72 frames), 01:00:08:00 (48 frames)",
+        "Overlapping events: 003/004 (24 frames)",
+        "Events out of order: 003, 004",
+        "Events reusing source frames: 001/004 (24 frames)",
+    ]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_event_range_index(compact):
+    """Indexes the source or record ranges of the events."""
+    edl = parse_edl_lines(OUT_OF_ORDER_LINES, "24", compact)
+    frames = Timecode("24", "01:00:01:12").frames
+    src_index = event_range_index(edl.events, "src_start_tc", "src_end_tc")
+    rec_index = event_range_index(edl.events, "rec_start_tc", "rec_end_tc")
+    assert src_index.rows_at(frames) == [0, 2, 3]
+    assert rec_index.nearest_row(frames) == 0
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_set_start_tc(compact):
     """Returns correctly calculated EDL with updated start tc."""
     edl_with_gaps_path = os.path.join(DIRNAME, "files/edl_with_gaps.edl")
     zero_start_path = os.path.join(DIRNAME, "files/edl_with_gaps_start0.edl")
-    test_edl = parse_edl(edl_with_gaps_path, "24")
+    test_edl = parse_edl(edl_with_gaps_path, "24", compact)
     zero_start_edl = parse_edl(zero_start_path, "24")
     expected = set_edl_start_tc(test_edl, "0").to_string()
     assert zero_start_edl.to_string() == expected
@@ -49,12 +109,51 @@ def test_tc_from_string_with_smpte_input():
     assert tc_from_string("24", input_tc) == expected
 
 
-def test_add_handles_to_edl():
+@pytest.mark.parametrize("compact", [False, True])
+def test_add_handles_to_edl(compact):
     """Returns correctly calculated EDL with added handles."""
     gaps_edl = os.path.join(DIRNAME, "files/edl_with_gaps_start0.edl")
     handles_edl_path = "files/edl_with_gaps_start0_plus_handles.edl"
     handles_edl = os.path.join(DIRNAME, handles_edl_path)
-    test_edl = parse_edl(gaps_edl, "24")
+    test_edl = parse_edl(gaps_edl, "24", compact)
     handles_edl = parse_edl(handles_edl, "24")
     expected = add_handles_to_edl(test_edl, 8).to_string()
     assert handles_edl.to_string() == expected
+
+
+@pytest.mark.parametrize("compact", [False, True])
+@pytest.mark.parametrize("fps", ["25", "29.97", "60"])
+def test_set_edl_framerate(compact, fps):
+    """Returns the same timecodes as parsing with the new framerate."""
+    edl_path = os.path.join(DIRNAME, "files/edl_with_cdls_and_locators.edl")
+    test_edl = parse_edl(edl_path, "24", compact)
+    test_edl.events[0].reel = "edited"
+    expected = parse_edl(edl_path, fps)
+    expected.events[0].reel = "edited"
+    result = set_edl_framerate(test_edl, fps)
+    assert result.fps == fps
+    assert result.to_string() == expected.to_string()
+    for event, expected_event in zip(result.events, expected.events):
+        assert event.rec_end_tc.frames == expected_event.rec_end_tc.frames
+        assert event.src_start_tc.framerate == fps
+    assert result.events[1].timewarp.timecode.framerate == fps
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_set_edl_framerate_round_trip(compact):
+    """Keeps frame numbers that do not exist at an intermediate rate."""
+    lines = [
+        "001  A001  V  C  01:00:10:24 01:00:11:10 01:00:00:00 01:00:00:10",
+        "M2   A001       050.0                01:00:10:24",
+    ]
+    edl = parse_edl_lines(lines, "25", compact)
+    original = edl.to_string()
+    set_edl_framerate(edl, "24")
+    set_edl_framerate(edl, "30")
+    set_edl_framerate(edl, "25")
+    assert str(edl.events[0].src_start_tc) == "01:00:10:24"
+    assert str(edl.events[0].timewarp.timecode) == "01:00:10:24"
+    assert edl.to_string() == original
+    set_edl_start_tc(edl, "01:00:01:00")
+    set_edl_framerate(edl, "24")
+    assert str(edl.events[0].rec_start_tc) == "01:00:01:00"
@@ -0,0 +1,350 @@
+"""Compact EDL timeline storing event timecodes as integer frame columns."""
+
+# Import built-in modules
+from array import array
+
+# Import third-party modules
+from timecode import Timecode  # type: ignore
+
+TC_COLUMNS = ["src_start", "src_end", "rec_start", "rec_end"]
+
+
+class Timeline:
+    """EDL container keeping all event timecodes in integer frame columns.
+
+    Drop-in replacement for edl.List: it has the same title, fps and events
+    attributes and the same to_string output. Instead of four Timecode
+    instances per event, frames are stored in one array per column (using
+    the 1-based frame count of Timecode.frames) and Timecode objects or SMPTE
+    strings are only created when an event attribute is read or the EDL is
+    serialized.
+
+    """
+
+    def __init__(self, fps):
+        """Initialize the Timeline instance.
+
+        Args:
+            fps (str): Frame Rate for EDL calculations.
+
+        """
+        self.title = ""
+        self.events = []
+        self.src_start = array("q")
+        self.src_end = array("q")
+        self.rec_start = array("q")
+        self.rec_end = array("q")
+        # SMPTE strings and the frames derived from them by the last
+        # set_fps call, per column.
+        self._sources = {}
+        self._set_converters(fps)
+
+    def __getitem__(self, index):
+        """Return the event at the given index."""
+        return self.events[index]
+
+    def __len__(self):
+        """Return the number of events."""
+        return len(self.events)
+
+    @property
+    def fps(self):
+        """str: Frame Rate for EDL calculations."""
+        return self._fps
+
+    def set_fps(self, fps):
+        """Re-interpret all event timecodes at the given frame rate.
+
+        The SMPTE strings of the events stay the same and the frame columns
+        are re-derived from them, as if the EDL was parsed with fps. Frames
+        still unchanged since the last call are re-derived from the strings
+        of that call, so a frame number that does not exist at one rate is
+        not lost when switching back.
+
+        Args:
+            fps (str): New Frame Rate for EDL calculations.
+
+        """
+        smpte_columns = [self._source_smpte(column) for column in TC_COLUMNS]
+        self._set_converters(fps)
+        for column, smpte_column in zip(TC_COLUMNS, smpte_columns):
+            frames_column = array("q", map(self.frames, smpte_column))
+            setattr(self, column, frames_column)
+            self._sources[column] = (smpte_column, array("q", frames_column))
+
+    def add_event(self, fields, src_start, src_end, rec_start, rec_end):
+        """Append a new event to the timeline.
+
+        Args:
+            fields (dict): Event line values (num, reel, track, tr_code, aux).
+            src_start (int): Source start frames.
+            src_end (int): Source end frames.
+            rec_start (int): Record start frames.
+            rec_end (int): Record end frames.
+
+        Returns:
+            TimelineEvent: The new event.
+
+        """
+        event = TimelineEvent(self, len(self.events), fields)
+        self.events.append(event)
+        self.src_start.append(src_start)
+        self.src_end.append(src_end)
+        self.rec_start.append(rec_start)
+        self.rec_end.append(rec_end)
+        return event
+
+    def frames(self, smpte):
+        """Return the frames of a SMPTE timecode string.
+
+        Args:
+            smpte (str): SMPTE timecode like "hh:mm:ss:ff".
+
+        Returns:
+            int: Frames as used by Timecode.frames.
+
+        """
+        if self._timecode.drop_frame or "." in smpte:
+            return self._timecode.tc_to_frames(smpte)
+        hours, minutes, seconds, frames = smpte.replace(";", ":").split(":")
+        total_seconds = (int(hours) * 60 + int(minutes)) * 60 + int(seconds)
+        return total_seconds * self._frames_per_second + int(frames) + 1
+
+    def timecode(self, frames):
+        """Return a Timecode instance for the given frames.
+
+        Args:
+            frames (int): Frames as used by Timecode.frames.
+
+        Returns:
+            Timecode: New Timecode instance.
+
+        """
+        return Timecode(self._fps, frames=frames)
+
+    def smpte(self, frames):
+        """Return the SMPTE string for the given frames.
+
+        Args:
+            frames (int): Frames as used by Timecode.frames.
+
+        Returns:
+            str: SMPTE timecode string, identical to str(Timecode).
+
+        """
+        if self._timecode.drop_frame:
+            return self._timecode.tc_to_string(
+                *self._timecode.frames_to_tc(frames)
+            )
+        # Timecode rolls over after 24 hours.
+        frame_number = (frames - 1) % (self._frames_per_second * 86400)
+        seconds, frame = divmod(frame_number, self._frames_per_second)
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        return "{0:02d}:{1:02d}:{2:02d}:{3:02d}".format(
+            hours, minutes, seconds, frame
+        )
+
+    def _source_smpte(self, column):
+        """Return the SMPTE strings the frames of the column stand for.
+
+        Args:
+            column (str): Name of the frame column.
+
+        Returns:
+            list: The string of the last set_fps call for unchanged frames,
+                otherwise the SMPTE string of the frames.
+
+        """
+        smpte_column, source_frames = self._sources.get(column, ([], []))
+        return [
+            (
+                smpte_column[row]
+                if row < len(source_frames) and source_frames[row] == frames
+                else self.smpte(frames)
+            )
+            for row, frames in enumerate(getattr(self, column))
+        ]
+
+    def _set_converters(self, fps):
+        """Set the frame rate and the converters used for SMPTE strings.
+
+        Args:
+            fps (str): Frame Rate for EDL calculations.
+
+        """
+        self._fps = fps
+        self._timecode = Timecode(fps)
+        # Frames per second as used for non-drop-frame SMPTE conversions.
+        self._frames_per_second = (
+            self._timecode.tc_to_frames("00:00:01:00") - 1
+        )
+
+    def get_start(self):
+        """Return the earliest record start as Timecode instance."""
+        return self.timecode(min(self.rec_start)) if self.events else None
+
+    def get_end(self):
+        """Return the latest record end as Timecode instance."""
+        return self.timecode(max(self.rec_end)) if self.events else None
+
+    def get_length(self):
+        """Return the record length in frames."""
+        return max(self.rec_end) - min(self.rec_start)
+
+    def to_string(self):
+        """Return the EDL string, identical to edl.List.to_string.
+
+        Returns:
+            str: EDL file content.
+
+        """
+        output_buffer = ["TITLE: {0}".format(self.title), ""]
+        for event in self.events:
+            output_buffer.append(event.to_string())
+        return "\n".join(output_buffer)
+
+
+def _frame_column_property(column):
+    """Return a Timecode property backed by the given timeline column.
+
+    Args:
+        column (str): Name of the Timeline frame column.
+
+    Returns:
+        property: Property reading and writing the event's column value.
+
+    """
+
+    def getter(event):
+        frames = getattr(event.timeline, column)[event.index]
+        return event.timeline.timecode(frames)
+
+    def setter(event, value):
+        if isinstance(value, Timecode):
+            value = value.frames
+        getattr(event.timeline, column)[event.index] = value
+
+    return property(getter, setter)
+
+
+# pylint: disable=too-many-instance-attributes
+class TimelineEvent:
+    """Lightweight view on one event of a Timeline.
+
+    Provides the attributes of edl.Event. The four timecode attributes read
+    and write the frame columns of the owning Timeline.
+
+    """
+
+    __slots__ = [
+        "timeline",
+        "index",
+        "num",
+        "reel",
+        "track",
+        "tr_code",
+        "aux",
+        "comments",
+        "clip_name",
+        "source_file",
+        "transition",
+        "timewarp",
+        "next_event",
+        "cdl",
+        "has_locator",
+        "loc_tc",
+        "loc_color",
+        "loc_name",
+        "comment_slots",
+        "dirty_slots",
+    ]
+
+    src_start_tc = _frame_column_property("src_start")
+    src_end_tc = _frame_column_property("src_end")
+    rec_start_tc = _frame_column_property("rec_start")
+    rec_end_tc = _frame_column_property("rec_end")
+
+    def __init__(self, timeline, index, fields):
+        """Initialize the TimelineEvent instance.
+
+        Args:
+            timeline (Timeline): Timeline holding the event frames.
+            index (int): Row of the event in the timeline columns.
+            fields (dict): Event line values (num, reel, track, tr_code, aux).
+
+        """
+        self.timeline = timeline
+        self.index = index
+        self.num = fields.get("num")
+        self.reel = fields.get("reel")
+        self.track = fields.get("track")
+        self.tr_code = fields.get("tr_code")
+        self.aux = fields.get("aux")
+        self.comments = []
+        self.clip_name = None
+        self.source_file = None
+        self.transition = None
+        self.timewarp = None
+        self.next_event = None
+        self.cdl = None
+        self.has_locator = False
+        self.comment_slots = None
+        self.dirty_slots = None
+
+    def has_timewarp(self):
+        """Return True if the event has a timewarp."""
+        return self.timewarp is not None
+
+    def rec_length(self):
+        """Return the record length in frames."""
+        return (
+            self.timeline.rec_end[self.index]
+            - self.timeline.rec_start[self.index]
+        )
+
+    def src_length(self):
+        """Return the source length in frames."""
+        return (
+            self.timeline.src_end[self.index]
+            - self.timeline.src_start[self.index]
+        )
+
+    def to_string(self):
+        """Return the event string, identical to edl.Event.to_string.
+
+        Returns:
+            str: Event line followed by effect, comments and timewarp lines.
+
+        """
+        timeline = self.timeline
+        index = self.index
+        effect = ""
+        if self.transition:
+            try:
+                effect = "EFFECTS NAME IS {0}\n".format(self.transition.effect)
+            except AttributeError:
+                pass
+        notes = ""
+        if self.comments:
+            notes = "{0}\n".format("\n".join(self.comments))
+        timewarp = ""
+        if self.timewarp:
+            timewarp = "{0}\n".format(self.timewarp.to_string())
+        return (
+            "{0:<6} {1:<32} {2:<5} {3:<3} {4:<4} {5} {6} {7} {8}\n"
+            "{9}{10}{11}".format(
+                self.num or "",
+                self.reel or "",
+                self.track or "",
+                self.tr_code or "",
+                self.aux or "",
+                timeline.smpte(timeline.src_start[index]),
+                timeline.smpte(timeline.src_end[index]),
+                timeline.smpte(timeline.rec_start[index]),
+                timeline.smpte(timeline.rec_end[index]),
+                effect,
+                notes,
+                timewarp,
+            )
+        )